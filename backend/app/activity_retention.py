@@ -0,0 +1,62 @@
+"""
+Move closed months out of activity_logs and archive expired partitions.
+Run with: python -m app.activity_retention (e.g. daily from cron)
+"""
+
+import argparse
+from pathlib import Path
+
+from app.config import settings
+from app.database import SessionLocal, engine, init_db
+from app.utils.activity_partitions import (
+    archive_partitions,
+    default_archive_dir,
+    roll_partitions,
+)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.activity_retention",
+        description="Partition the activity log by month and archive old months.",
+    )
+    parser.add_argument(
+        "--hot-months",
+        type=int,
+        default=settings.ACTIVITY_HOT_MONTHS,
+        help="Months kept in activity_logs, including the current one",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.ACTIVITY_RETENTION_MONTHS,
+        help="Months kept queryable before a partition is archived",
+    )
+    parser.add_argument("--archive-dir", type=Path, default=default_archive_dir())
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="VACUUM afterwards so SQLite returns the freed pages to the OS",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if args.retention_months < args.hot_months:
+        raise SystemExit("--retention-months must be at least --hot-months")
+
+    init_db()
+    with SessionLocal() as db:
+        for month, count in roll_partitions(db, args.hot_months).items():
+            print(f"  {month}: moved {count:,} rows to its partition")
+        for path in archive_partitions(db, args.retention_months, args.archive_dir):
+            print(f"  archived to {path}")
+
+    if args.vacuum and engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+
+
+if __name__ == "__main__":
+    main()
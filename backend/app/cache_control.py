@@ -0,0 +1,102 @@
+"""Per-route ``Cache-Control`` policies.
+
+Routes declare how shared caches (CDNs) and browsers may keep their responses
+with ``@cache_policy(...)`` under the route decorator::
+
+    @router.get("/{id_or_slug}", response_model=ProductDetailResponse)
+    @cache_policy(CATALOG)
+    def get_product(...): ...
+
+Every other route is ``PRIVATE`` ("private, no-store", varying on
+``Authorization``), so a new endpoint is never public by accident. Error
+responses other than 404 are never stored.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    public: bool = False
+    max_age: int = 0
+    stale_while_revalidate: int = 0
+    no_store: bool = False
+    vary: tuple[str, ...] = ()
+
+    @property
+    def header(self) -> str:
+        directives = ["public" if self.public else "private"]
+        if self.no_store:
+            directives.append("no-store")
+        else:
+            directives.append(f"max-age={self.max_age}")
+            if self.stale_while_revalidate:
+                directives.append(
+                    f"stale-while-revalidate={self.stale_while_revalidate}"
+                )
+        return ", ".join(directives)
+
+
+CATALOG = CachePolicy(
+    public=True,
+    max_age=settings.CACHE_CATALOG_MAX_AGE,
+    stale_while_revalidate=settings.CACHE_CATALOG_STALE_WHILE_REVALIDATE,
+)
+ORDER_STATUS = CachePolicy(public=True, max_age=settings.CACHE_ORDER_STATUS_MAX_AGE)
+PRIVATE = CachePolicy(no_store=True, vary=("Authorization",))
+NO_STORE = CachePolicy(no_store=True)
+
+
+def cache_policy(policy: CachePolicy) -> Callable[[F], F]:
+    """Declare the cache policy of a route's endpoint."""
+
+    def declare(endpoint: F) -> F:
+        endpoint.cache_policy = policy
+        return endpoint
+
+    return declare
+
+
+def policy_for(endpoint: Callable) -> CachePolicy:
+    return getattr(endpoint, "cache_policy", PRIVATE)
+
+
+class CacheControlMiddleware:
+    """ASGI middleware adding the matched route's ``Cache-Control``/``Vary``.
+
+    Requests that matched no route (404s, CORS preflights) are left alone.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_policy(message: Message) -> None:
+            # The router has set scope["endpoint"] by the time a response starts
+            endpoint = scope.get("endpoint")
+            if message["type"] == "http.response.start" and endpoint is not None:
+                headers = MutableHeaders(scope=message)
+                if "cache-control" not in headers:
+                    policy = policy_for(endpoint)
+                    status = message["status"]
+                    if status >= 400 and status != 404:
+                        policy = NO_STORE
+                    headers["Cache-Control"] = policy.header
+                    for name in policy.vary:
+                        headers.add_vary_header(name)
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
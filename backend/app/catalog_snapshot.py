@@ -0,0 +1,53 @@
+"""
+Write the static catalog snapshot (listing pages, categories, product
+details and a manifest) for a CDN or the frontend host to serve.
+Run with: python -m app.catalog_snapshot [--dir DIR] (e.g. in the frontend
+build, with --dir ../frontend/public/catalog)
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.utils.catalog_snapshot import write_catalog_snapshot
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.catalog_snapshot",
+        description="Render the active catalog into versioned static JSON files.",
+    )
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=settings.CATALOG_SNAPSHOT_DIR,
+        required=not settings.CATALOG_SNAPSHOT_DIR,
+        help="Output directory (default: CATALOG_SNAPSHOT_DIR)",
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=settings.CATALOG_SNAPSHOT_KEEP,
+        help="Snapshots to keep, the new one included",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    init_db()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        manifest = write_catalog_snapshot(db, Path(args.dir), keep=args.keep)
+    print(
+        f"  {manifest['snapshot']}: {manifest['pages']:,} listing pages,"
+        f" {len(manifest['categories']):,} categories,"
+        f" {manifest['products']:,} products"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Response compression negotiated on ``Accept-Encoding``.
+
+Responses whose content type starts with one of
+``COMPRESSION_CONTENT_TYPES`` are sent with Brotli (when the ``brotli``
+package is installed) or gzip, whichever the client accepts with the higher
+weight, Brotli on ties. Bodies under ``COMPRESSION_MIN_SIZE`` bytes are sent
+as is; streamed bodies (exports) are compressed chunk by chunk.
+
+Anonymous GETs under ``COMPRESSION_CACHE_PATHS`` are public catalog pages
+that render the same bytes for every visitor, so their compressed bodies are
+kept in an LRU keyed by the body's digest: a hot page is compressed once, not
+on every hit.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """The encoding to answer ``Accept-Encoding`` with, None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def stream_compressor(
+    encoding: str,
+) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """``(compress_chunk, finish)`` for a body sent in several chunks."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type.startswith(tuple(settings.COMPRESSION_CONTENT_TYPES))
+
+
+class CompressedBodyCache:
+    """Compressed bodies by encoding and body digest, bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def compressed(self, body: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        cached = compress(body, encoding)
+        if len(cached) > self.max_bytes:
+            return cached
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = cached
+                self._size += len(cached)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses (see the module docstring)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = None
+        if scope["method"] != "HEAD":  # no body to compress
+            encoding = accepted_encoding(headers.get("accept-encoding", ""))
+        cacheable = (
+            scope["method"] == "GET"
+            and "authorization" not in headers
+            and scope["path"].startswith(tuple(settings.COMPRESSION_CACHE_PATHS))
+        )
+        await self.app(scope, receive, _CompressingSend(send, encoding, cacheable))
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str | None, cacheable: bool):
+        self.send = send
+        self.encoding = encoding
+        self.cacheable = cacheable
+        self.start: Message | None = None
+        self.compress_chunk: Callable[[bytes], bytes] | None = None
+        self.finish: Callable[[], bytes] | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message  # sent with the first body chunk
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._first_chunk(start, message)
+        elif self.compress_chunk is not None:
+            body = self.compress_chunk(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if not more_body:
+                body += self.finish()
+            await self.send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+        else:
+            await self.send(message)
+
+    async def _first_chunk(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        if (
+            start["status"] in (204, 304)
+            or "content-encoding" in headers
+            or not is_compressible(headers.get("content-type", ""))
+        ):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoding is None or (
+            not more_body and len(body) < settings.COMPRESSION_MIN_SIZE
+        ):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        if not more_body:
+            if self.cacheable:
+                body = compressed_bodies.compressed(body, self.encoding)
+            else:
+                body = compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+        else:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            self.compress_chunk, self.finish = stream_compressor(self.encoding)
+            body = self.compress_chunk(body)
+        await self.send(start)
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
@@ -1,6 +1,7 @@
 import os
 import sys
 import warnings
+from typing import Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -39,6 +40,100 @@ class Settings(BaseSettings):
         "http://localhost:3000",
     ]
 
+    # Report implicit relationship lazy loads: off, warn (log + stack), raise
+    LAZY_LOAD_MODE: Literal["off", "warn", "raise"] = "off"
+
+    # Activity log writes: "async" spools events and batch-inserts them from a
+    # background thread, "sync" writes them in the request's transaction
+    ACTIVITY_WRITER_MODE: Literal["sync", "async"] = "async"
+    ACTIVITY_BATCH_SIZE: int = 200
+    ACTIVITY_FLUSH_INTERVAL: float = 1.0  # seconds
+    ACTIVITY_SPOOL_DIR: str | None = None  # default: backend/activity-spool
+
+    # Activity log partitions (app/utils/activity_partitions.py): months older
+    # than ACTIVITY_HOT_MONTHS leave activity_logs for a monthly table; months
+    # older than ACTIVITY_RETENTION_MONTHS are archived to gzip NDJSON
+    ACTIVITY_HOT_MONTHS: int = 1
+    ACTIVITY_RETENTION_MONTHS: int = 12
+    ACTIVITY_ARCHIVE_DIR: str | None = None  # default: backend/activity-archive
+
+    # Related products (app/utils/related_products.py): how many are stored
+    # per product and how many shared customers make two products related
+    RELATED_PRODUCTS_LIMIT: int = 8
+    RELATED_PRODUCTS_MIN_CUSTOMERS: int = 2
+
+    # Product counters (app/utils/product_stats.py): views and sales are
+    # counted in memory and written every PRODUCT_STATS_FLUSH_INTERVAL seconds.
+    # The trending score sums the last TRENDING_WINDOW_HOURS, a sale counting
+    # as TRENDING_SALE_WEIGHT views; python -m app.product_stats --badges
+    # assigns the "bestseller" and "popular" badges from the two thresholds
+    PRODUCT_STATS_FLUSH_INTERVAL: float = 30.0
+    TRENDING_WINDOW_HOURS: int = 72
+    TRENDING_SALE_WEIGHT: float = 10.0
+    BADGE_BESTSELLER_MIN_SALES: int = 50
+    BADGE_POPULAR_MIN_TRENDING: float = 200.0
+
+    # Search suggestions (app/utils/suggest.py): served from an in-memory
+    # index, rebuilt after product writes in this process and, for writes
+    # made elsewhere, when the catalog version checked every
+    # SUGGEST_VERSION_CHECK_INTERVAL seconds has changed
+    SUGGEST_LIMIT: int = 8
+    SUGGEST_VERSION_CHECK_INTERVAL: float = 5.0  # seconds
+    SUGGEST_MIN_SIMILARITY: float = 0.6  # shared trigrams / query trigrams
+
+    # List totals (app/utils/pagination.py): exact counts are cached per
+    # filter until a write in this process or COUNT_CACHE_TTL seconds;
+    # count=estimate reports table statistics for unfiltered tables of at
+    # least COUNT_ESTIMATE_MIN_ROWS rows
+    COUNT_CACHE_TTL: float = 60.0  # seconds
+    COUNT_ESTIMATE_MIN_ROWS: int = 10000
+
+    # Product detail lookup (app/utils/product_lookup.py): seconds an unknown
+    # id or slug is answered with 404 without a query
+    PRODUCT_LOOKUP_NEGATIVE_TTL: float = 30.0
+
+    # Price facet of GET /api/products?facets=true: bucket boundaries in IDR,
+    # ascending (below the first, between each pair, from the last up)
+    FACET_PRICE_EDGES: list[int] = [100000, 250000, 500000, 1000000]
+
+    # Response compression (app/compression.py): gzip, and Brotli when the
+    # brotli package is installed, for bodies of COMPRESSION_MIN_SIZE+ bytes
+    # whose content type starts with one of COMPRESSION_CONTENT_TYPES.
+    # Anonymous GETs under COMPRESSION_CACHE_PATHS reuse compressed bodies
+    # from an LRU of up to COMPRESSION_CACHE_MAX_BYTES
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/",
+    ]
+    COMPRESSION_CACHE_PATHS: list[str] = ["/api/products"]
+    COMPRESSION_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+
+    # Cache-Control of public routes (app/cache_control.py), in seconds:
+    # catalog reads may be served stale for CACHE_CATALOG_STALE_WHILE_REVALIDATE
+    # while a CDN refetches; everything undeclared is "private, no-store"
+    CACHE_CATALOG_MAX_AGE: int = 60
+    CACHE_CATALOG_STALE_WHILE_REVALIDATE: int = 300
+    CACHE_ORDER_STATUS_MAX_AGE: int = 10
+
+    # Static catalog snapshot (app/utils/catalog_snapshot.py): when set, the
+    # app rewrites it under this directory after every catalog change and
+    # keeps the CATALOG_SNAPSHOT_KEEP most recent snapshots
+    CATALOG_SNAPSHOT_DIR: str | None = None
+    CATALOG_SNAPSHOT_KEEP: int = 2
+
+    # Catalog reads (app/utils/stale_reads.py) that hit a locked database, or
+    # wait longer than CATALOG_READ_BUDGET seconds for the same URL's running
+    # render, are answered with the last good response of up to
+    # CATALOG_STALE_MAX_AGE seconds ago
+    CATALOG_READ_BUDGET: float = 0.5
+    CATALOG_STALE_MAX_AGE: float = 600.0
+    CATALOG_STALE_MAX_ENTRIES: int = 2048
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
@@ -4,6 +4,9 @@ from pathlib import Path
 from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.config import settings
+from app.utils.loading import enable_strict_loading
+
 # Database URL selection (local/Vercel)
 DATABASE_DIR = Path(__file__).parent.parent
 DEFAULT_SQLITE_PATH = DATABASE_DIR / "fxsociety.db"
@@ -27,6 +30,7 @@ engine = create_engine(DATABASE_URL, **_engine_kwargs)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+enable_strict_loading(SessionLocal, settings.LAZY_LOAD_MODE)
 
 # Base class for models
 Base = declarative_base()
@@ -63,6 +67,46 @@ def check_and_migrate_db():
                     )
                     conn.commit()
                 print("Migration complete.")
+        if "products" in inspector.get_table_names():
+            columns = [c["name"] for c in inspector.get_columns("products")]
+            if "trending_score" not in columns:
+                print("Migrating: Adding popularity counters to products...")
+                with engine.connect() as conn:
+                    for column, column_type in (
+                        ("view_count", "INTEGER"),
+                        ("sales_count", "INTEGER"),
+                        ("trending_score", "FLOAT"),
+                    ):
+                        conn.execute(
+                            text(
+                                f"ALTER TABLE products ADD COLUMN {column} "
+                                f"{column_type} NOT NULL DEFAULT 0"
+                            )
+                        )
+                    for name, column in (
+                        ("ix_products_active_sales", "sales_count"),
+                        ("ix_products_active_trending", "trending_score"),
+                    ):
+                        conn.execute(
+                            text(
+                                f"CREATE INDEX {name} ON products (is_active, {column})"
+                            )
+                        )
+                    conn.commit()
+                print("Migration complete.")
+        if "activity_logs" in inspector.get_table_names():
+            indexes = [i["name"] for i in inspector.get_indexes("activity_logs")]
+            if "ix_activity_logs_customer_created" not in indexes:
+                print("Migrating: Adding timeline index to activity_logs...")
+                with engine.connect() as conn:
+                    conn.execute(
+                        text(
+                            "CREATE INDEX ix_activity_logs_customer_created "
+                            "ON activity_logs (customer_id, created_at)"
+                        )
+                    )
+                    conn.commit()
+                print("Migration complete.")
     except Exception as e:
         print(f"Migration check failed: {e}")
 
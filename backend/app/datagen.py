@@ -0,0 +1,520 @@
+"""
+Synthetic dataset generator for load testing and benchmarks.
+
+Builds a deterministic, production-sized database (products, users, orders,
+tickets, CRM tags/notes and activity logs) using bulk executemany inserts.
+
+Run with: python -m app.datagen --preset production --snapshot bench.db
+"""
+
+import argparse
+import json
+import random
+import shutil
+import string
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Table, create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.auth import get_password_hash
+from app.database import DATABASE_URL, Base
+from app.models import (
+    ActivityLog,
+    CustomerNote,
+    CustomerTag,
+    Order,
+    Product,
+    Ticket,
+    User,
+)
+
+# Every generated user can log in with this password.
+DEFAULT_PASSWORD = "password123"
+DEFAULT_ANCHOR = "2026-01-01"
+
+CATEGORIES = ["indikator", "robot", "ebook", "merchandise"]
+CATEGORY_WEIGHTS = [35, 25, 30, 10]
+BADGES = ["new", "popular", "bestseller"]
+PRICE_POINTS = [49000, 79000, 99000, 150000, 199000, 249000, 299000, 349000, 499000]
+ORDER_STATUSES = ["pending", "confirmed", "completed", "cancelled"]
+ORDER_STATUS_WEIGHTS = [15, 20, 55, 10]
+TICKET_STATUSES = ["open", "answered", "closed"]
+TICKET_STATUS_WEIGHTS = [25, 30, 45]
+TAGS = ["VIP", "Follow Up", "Reseller", "Komplain", "Prospek", "Loyal", "Baru"]
+ACTIVITY_TYPES = [
+    "order_created",
+    "order_status_updated",
+    "ticket_created",
+    "note_added",
+    "tag_added",
+    "tag_removed",
+]
+ACTIVITY_TYPE_WEIGHTS = [35, 35, 10, 8, 8, 4]
+
+ADJECTIVES = [
+    "Smart",
+    "Auto",
+    "Pro",
+    "Ultimate",
+    "Precision",
+    "Golden",
+    "Swift",
+    "Alpha",
+    "Quantum",
+    "Dynamic",
+]
+NOUNS = {
+    "indikator": ["Trend Indicator", "Signal Pro", "Pivot Finder", "Volume Radar"],
+    "robot": ["Scalper EA", "Grid Bot", "Hedging EA", "Breakout Robot"],
+    "ebook": [
+        "Panduan Trading",
+        "Psikologi Trading",
+        "Strategi Swing",
+        "Money Management",
+    ],
+    "merchandise": ["T-Shirt", "Hoodie", "Mug", "Cap"],
+}
+FIRST_NAMES = [
+    "Andi",
+    "Budi",
+    "Citra",
+    "Dewi",
+    "Eka",
+    "Fajar",
+    "Gita",
+    "Hadi",
+    "Intan",
+    "Joko",
+]
+LAST_NAMES = [
+    "Pratama",
+    "Santoso",
+    "Wijaya",
+    "Saputra",
+    "Lestari",
+    "Hidayat",
+    "Kusuma",
+    "Nugroho",
+]
+PARAGRAPH = (
+    "Produk ini dirancang untuk membantu trader mengambil keputusan dengan lebih "
+    "disiplin. Dilengkapi panduan instalasi, contoh penggunaan, dan dukungan "
+    "pembaruan berkala untuk MT4 dan MT5."
+)
+
+_ORDER_CODE_ALPHABET = string.ascii_uppercase + string.digits
+_ORDER_CODE_SPACE = len(_ORDER_CODE_ALPHABET) ** 6
+# Multiplier coprime with 36**6: spreads sequential indexes over the code space.
+_ORDER_CODE_MULTIPLIER = 1_234_567_891
+
+
+@dataclass(frozen=True)
+class DatasetSizes:
+    products: int
+    users: int
+    orders: int
+    tickets: int
+    tags: int
+    notes: int
+    activities: int
+
+
+PRESETS: dict[str, DatasetSizes] = {
+    "tiny": DatasetSizes(
+        products=50,
+        users=200,
+        orders=1_000,
+        tickets=100,
+        tags=100,
+        notes=100,
+        activities=2_000,
+    ),
+    "small": DatasetSizes(
+        products=1_000,
+        users=5_000,
+        orders=50_000,
+        tickets=2_500,
+        tags=4_000,
+        notes=2_500,
+        activities=100_000,
+    ),
+    "production": DatasetSizes(
+        products=50_000,
+        users=200_000,
+        orders=2_000_000,
+        tickets=100_000,
+        tags=150_000,
+        notes=100_000,
+        activities=5_000_000,
+    ),
+}
+
+
+def order_code_for(index: int) -> str:
+    """Deterministic, unique FXS-XXXXXX code for the n-th generated order."""
+    value = (index * _ORDER_CODE_MULTIPLIER) % _ORDER_CODE_SPACE
+    chars = []
+    for _ in range(6):
+        value, remainder = divmod(value, len(_ORDER_CODE_ALPHABET))
+        chars.append(_ORDER_CODE_ALPHABET[remainder])
+    return "FXS-" + "".join(reversed(chars))
+
+
+class DatasetGenerator:
+    """Generate rows for every table from a single seeded RNG per table."""
+
+    def __init__(
+        self,
+        sizes: DatasetSizes,
+        seed: int = 42,
+        anchor: datetime | None = None,
+        history_days: int = 730,
+    ):
+        self.sizes = sizes
+        self.seed = seed
+        self.anchor = anchor or datetime.fromisoformat(DEFAULT_ANCHOR).replace(
+            tzinfo=UTC
+        )
+        self.history_days = history_days
+        self._history_seconds = max(history_days * 24 * 3600, 1)
+        self.password_hash = get_password_hash(DEFAULT_PASSWORD)
+
+    def _rng(self, table: str) -> random.Random:
+        # Separate streams keep each table stable when other sizes change.
+        return random.Random(f"{self.seed}:{table}")
+
+    def _timestamp(self, rng: random.Random) -> datetime:
+        offset = rng.randrange(self._history_seconds)
+        return self.anchor - timedelta(seconds=offset)
+
+    def _skewed_id(self, rng: random.Random, upper: int) -> int:
+        # Quadratic skew: low ids (older, popular products) get most orders.
+        return int(upper * rng.random() ** 2) + 1
+
+    def products(self) -> Iterator[dict]:
+        rng = self._rng("products")
+        for product_id in range(1, self.sizes.products + 1):
+            category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+            title = (
+                f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS[category])} {product_id}"
+            )
+            yield {
+                "id": product_id,
+                "slug": title.lower().replace(" ", "-"),
+                "title": title,
+                "description_short": f"{title} untuk trader {category}. {PARAGRAPH[:120]}",
+                "description_full": "\n\n".join([PARAGRAPH] * rng.randint(2, 5)),
+                "price_idr": rng.choice(PRICE_POINTS),
+                "category": category,
+                "badges": rng.sample(BADGES, rng.choices([0, 1, 2], [70, 25, 5])[0]),
+                "images": [
+                    f"https://images.example.com/products/{product_id}/{n}.jpg"
+                    for n in range(rng.randint(1, 4))
+                ],
+                "is_active": rng.random() < 0.9,
+                "created_at": self._timestamp(rng),
+            }
+
+    def users(self) -> Iterator[dict]:
+        rng = self._rng("users")
+        for user_id in range(1, self.sizes.users + 1):
+            yield {
+                "id": user_id,
+                "email": f"user{user_id}@example.com",
+                "password_hash": self.password_hash,
+                "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "is_active": rng.random() < 0.98,
+                "created_at": self._timestamp(rng),
+            }
+
+    def orders(self) -> Iterator[dict]:
+        rng = self._rng("orders")
+        for order_id in range(1, self.sizes.orders + 1):
+            user_id = None
+            if self.sizes.users and rng.random() < 0.8:
+                user_id = rng.randint(1, self.sizes.users)
+                email = f"user{user_id}@example.com"
+            else:
+                email = f"guest{order_id}@example.com"
+            created_at = self._timestamp(rng)
+            yield {
+                "id": order_id,
+                "order_code": order_code_for(order_id),
+                "product_id": self._skewed_id(rng, self.sizes.products),
+                "user_id": user_id,
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": email,
+                "whatsapp": "08" + "".join(rng.choices(string.digits, k=10)),
+                "notes": "Mohon diproses cepat" if rng.random() < 0.1 else None,
+                "status": rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0],
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(hours=rng.randint(0, 72)),
+            }
+
+    def tickets(self) -> Iterator[dict]:
+        rng = self._rng("tickets")
+        for ticket_id in range(1, self.sizes.tickets + 1):
+            created_at = self._timestamp(rng)
+            yield {
+                "id": ticket_id,
+                "user_id": rng.randint(1, self.sizes.users),
+                "title": f"Pertanyaan pesanan #{ticket_id}",
+                "message": "Halo admin, saya butuh bantuan terkait pesanan saya.",
+                "status": rng.choices(TICKET_STATUSES, TICKET_STATUS_WEIGHTS)[0],
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(hours=rng.randint(0, 96)),
+            }
+
+    def tags(self) -> Iterator[dict]:
+        rng = self._rng("tags")
+        max_pairs = self.sizes.users * len(TAGS)
+        seen: set[tuple[int, str]] = set()
+        tag_id = 0
+        while tag_id < min(self.sizes.tags, max_pairs):
+            pair = (rng.randint(1, self.sizes.users), rng.choice(TAGS))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            tag_id += 1
+            yield {
+                "id": tag_id,
+                "customer_id": pair[0],
+                "tag": pair[1],
+                "created_at": self._timestamp(rng),
+            }
+
+    def notes(self) -> Iterator[dict]:
+        rng = self._rng("notes")
+        for note_id in range(1, self.sizes.notes + 1):
+            yield {
+                "id": note_id,
+                "customer_id": rng.randint(1, self.sizes.users),
+                "note": "Customer minta dihubungi via WhatsApp setelah jam kerja.",
+                "created_by_admin": "dev_admin",
+                "created_at": self._timestamp(rng),
+            }
+
+    def activities(self) -> Iterator[dict]:
+        rng = self._rng("activities")
+        for activity_id in range(1, self.sizes.activities + 1):
+            activity_type = rng.choices(ACTIVITY_TYPES, ACTIVITY_TYPE_WEIGHTS)[0]
+            reference_id = None
+            metadata = None
+            if activity_type.startswith("order") and self.sizes.orders:
+                reference_id = order_code_for(rng.randint(1, self.sizes.orders))
+                metadata = {"new_status": rng.choice(ORDER_STATUSES)}
+            elif activity_type.startswith("tag"):
+                metadata = {"tag": rng.choice(TAGS)}
+            yield {
+                "id": activity_id,
+                "customer_id": rng.randint(1, self.sizes.users),
+                "type": activity_type,
+                "reference_id": reference_id,
+                "metadata_json": metadata,
+                "created_at": self._timestamp(rng),
+            }
+
+
+def _tables() -> list[tuple[Table, Callable[[DatasetGenerator], Iterator[dict]]]]:
+    # Parents first so foreign keys always resolve.
+    return [
+        (Product.__table__, DatasetGenerator.products),
+        (User.__table__, DatasetGenerator.users),
+        (Order.__table__, DatasetGenerator.orders),
+        (Ticket.__table__, DatasetGenerator.tickets),
+        (CustomerTag.__table__, DatasetGenerator.tags),
+        (CustomerNote.__table__, DatasetGenerator.notes),
+        (ActivityLog.__table__, DatasetGenerator.activities),
+    ]
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _tune_sqlite(conn: Connection) -> None:
+    # Bulk-load settings; safe because a failed build is simply regenerated.
+    conn.exec_driver_sql("PRAGMA journal_mode=OFF")
+    conn.exec_driver_sql("PRAGMA synchronous=OFF")
+    conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+    conn.exec_driver_sql("PRAGMA cache_size=-200000")
+
+
+def generate_dataset(
+    engine: Engine,
+    generator: DatasetGenerator,
+    chunk_size: int = 20_000,
+    reset: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict[str, int]:
+    """Create the schema and bulk-load every table. Returns row counts."""
+    sizes = generator.sizes
+    if sizes.orders and not sizes.products:
+        raise ValueError("Orders need at least one product.")
+    if (sizes.tickets or sizes.tags or sizes.notes or sizes.activities) and not (
+        sizes.users
+    ):
+        raise ValueError("Tickets, tags, notes and activities need users.")
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    counts: dict[str, int] = {}
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            _tune_sqlite(conn)
+
+        for table, _ in _tables():
+            existing = conn.execute(select(func.count()).select_from(table)).scalar()
+            if existing:
+                raise RuntimeError(
+                    f"Table '{table.name}' already has {existing} rows. "
+                    "Use --reset to rebuild the dataset from scratch."
+                )
+        conn.commit()
+
+        for table, rows_for in _tables():
+            started = time.perf_counter()
+            inserted = 0
+            # One large transaction per table; executemany per chunk.
+            with conn.begin():
+                for chunk in _chunks(rows_for(generator), chunk_size):
+                    conn.execute(table.insert(), chunk)
+                    inserted += len(chunk)
+            counts[table.name] = inserted
+            elapsed = time.perf_counter() - started
+            log(f"  {table.name:<16} {inserted:>10,} rows in {elapsed:6.1f}s")
+
+        if engine.dialect.name == "postgresql":
+            # Explicit ids bypass the sequences; move them past the loaded rows.
+            for table, _ in _tables():
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"COALESCE(MAX(id), 1)) FROM {table.name}"
+                    )
+                )
+            conn.commit()
+
+    return counts
+
+
+def write_snapshot(
+    engine: Engine, snapshot_path: Path, manifest: dict[str, object]
+) -> Path:
+    """Write a compacted copy of a SQLite database plus a JSON manifest."""
+    if engine.dialect.name != "sqlite":
+        raise RuntimeError("Snapshots are only supported for SQLite databases.")
+
+    snapshot_path = snapshot_path.resolve()
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    if snapshot_path.exists():
+        snapshot_path.unlink()
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"VACUUM INTO '{snapshot_path}'")
+
+    manifest_path = snapshot_manifest_path(snapshot_path)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest_path
+
+
+def snapshot_manifest_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name + ".json")
+
+
+def load_snapshot(snapshot_path: Path, target_path: Path) -> dict[str, object]:
+    """Copy a snapshot to a scratch location and return its manifest."""
+    shutil.copyfile(snapshot_path, target_path)
+    manifest_path = snapshot_manifest_path(snapshot_path)
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text())
+    return {}
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.datagen",
+        description="Generate a deterministic synthetic dataset for benchmarks.",
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for field in DatasetSizes.__dataclass_fields__:
+        parser.add_argument(
+            f"--{field}", type=int, default=None, help=f"Override {field} count"
+        )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--anchor",
+        default=DEFAULT_ANCHOR,
+        help="Date the generated history ends at (YYYY-MM-DD)",
+    )
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument(
+        "--database-url",
+        default=DATABASE_URL,
+        help="Target database (defaults to the app database)",
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="Drop and recreate all tables first"
+    )
+    parser.add_argument(
+        "--snapshot", type=Path, default=None, help="Write a SQLite snapshot file"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+
+    overrides = {
+        field: getattr(args, field)
+        for field in DatasetSizes.__dataclass_fields__
+        if getattr(args, field) is not None
+    }
+    sizes = replace(PRESETS[args.preset], **overrides)
+    anchor = datetime.fromisoformat(args.anchor).replace(tzinfo=UTC)
+    generator = DatasetGenerator(
+        sizes, seed=args.seed, anchor=anchor, history_days=args.history_days
+    )
+
+    engine_kwargs = {}
+    if args.database_url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+    engine = create_engine(args.database_url, **engine_kwargs)
+
+    print(f"Generating dataset into {engine.url!r} (seed={args.seed})")
+    started = time.perf_counter()
+    counts = generate_dataset(
+        engine, generator, chunk_size=args.chunk_size, reset=args.reset
+    )
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+    if args.snapshot:
+        manifest = {
+            "seed": args.seed,
+            "anchor": args.anchor,
+            "history_days": args.history_days,
+            "sizes": asdict(sizes),
+            "rows": counts,
+            "password": DEFAULT_PASSWORD,
+        }
+        write_snapshot(engine, args.snapshot, manifest)
+        print(f"Snapshot written to {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
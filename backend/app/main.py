@@ -3,22 +3,36 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.cache_control import CacheControlMiddleware
+from app.compression import CompressionMiddleware
 from app.config import settings
 from app.database import init_db
 from app.routers import (
+    analytics_router,
     auth_router,
     crm_router,
     orders_router,
     products_router,
     tickets_router,
 )
+from app.utils.activity import activity_writer
+from app.utils.catalog_snapshot import catalog_snapshots
+from app.utils.product_stats import product_counters
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """Initialize database on startup; flush activity and counters on shutdown."""
     init_db()
+    if settings.ACTIVITY_WRITER_MODE == "async":
+        activity_writer.start()
+    product_counters.start()
+    if settings.CATALOG_SNAPSHOT_DIR:
+        catalog_snapshots.start()
     yield
+    activity_writer.close()
+    product_counters.close()
+    catalog_snapshots.close()
 
 
 app = FastAPI(
@@ -28,6 +42,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Inside CORS, so preflights (answered by CORS) carry no cache policy
+app.add_middleware(CacheControlMiddleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -37,12 +54,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so every response (CORS errors included) can be compressed
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(products_router)
 app.include_router(orders_router)
 app.include_router(auth_router)
 app.include_router(tickets_router)
 app.include_router(crm_router)
+app.include_router(analytics_router)
 
 
 @app.get("/")
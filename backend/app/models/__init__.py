@@ -1,11 +1,27 @@
-from app.models.crm import ActivityLog, CustomerNote, CustomerTag
+from app.models.analytics import SalesDaily, SalesDailyCategory, SalesDailyProduct
+from app.models.catalog import CatalogVersion
+from app.models.crm import (
+    ActivityLog,
+    ActivityPartition,
+    CustomerNote,
+    CustomerScore,
+    CustomerTag,
+)
 from app.models.order import Order
-from app.models.product import Product
+from app.models.product import (
+    Product,
+    ProductStatsHourly,
+    RelatedProduct,
+    RelatedProductsState,
+)
 from app.models.ticket import Ticket, TicketStatus
 from app.models.user import User
 
 __all__ = [
     "Product",
+    "RelatedProduct",
+    "RelatedProductsState",
+    "ProductStatsHourly",
     "Order",
     "User",
     "Ticket",
@@ -13,4 +29,10 @@ __all__ = [
     "CustomerTag",
     "CustomerNote",
     "ActivityLog",
+    "ActivityPartition",
+    "CustomerScore",
+    "CatalogVersion",
+    "SalesDaily",
+    "SalesDailyCategory",
+    "SalesDailyProduct",
 ]
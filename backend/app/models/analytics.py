@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Date, Integer, String
+
+from app.database import Base
+
+# Daily sales rollups, kept in step with ``orders`` by app/utils/sales_rollup.py.
+# Each row counts the orders created on ``day`` that are currently in
+# ``status``, and their revenue at the product price.
+
+
+class SalesDaily(Base):
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue_idr = Column(Integer, nullable=False, default=0)
+
+
+class SalesDailyCategory(Base):
+    __tablename__ = "sales_daily_category"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    category = Column(String(50), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue_idr = Column(Integer, nullable=False, default=0)
+
+
+class SalesDailyProduct(Base):
+    __tablename__ = "sales_daily_product"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    category = Column(String(50), nullable=False)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue_idr = Column(Integer, nullable=False, default=0)
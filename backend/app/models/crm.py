@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -41,3 +41,39 @@ class ActivityLog(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", backref="activities")
+
+    __table_args__ = (
+        # Timeline reads: one customer, newest first
+        Index("ix_activity_logs_customer_created", "customer_id", "created_at"),
+    )
+
+
+class ActivityPartition(Base):
+    """A closed month of activity moved out of ``activity_logs``."""
+
+    __tablename__ = "activity_partitions"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    table_name = Column(String(64), nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+    archive_path = Column(String(500), nullable=True)  # gzip NDJSON once archived
+
+
+class CustomerScore(Base):
+    """RFM scores per customer, rewritten by ``python -m app.rfm_scores``."""
+
+    __tablename__ = "customer_scores"
+
+    customer_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    recency_days = Column(Integer, nullable=True)  # None: no orders yet
+    frequency = Column(Integer, nullable=False)  # non-cancelled orders
+    monetary_idr = Column(Integer, nullable=False)  # their value at list price
+    # Quintiles among customers with orders: 5 is best, 0 means no orders
+    r_score = Column(Integer, nullable=False)
+    f_score = Column(Integer, nullable=False)
+    m_score = Column(Integer, nullable=False)
+    rfm_score = Column(String(3), nullable=False)  # e.g. "545"
+    rfm_total = Column(Integer, nullable=False, index=True)
+    segment = Column(String(20), nullable=False, index=True)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
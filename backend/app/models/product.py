@@ -1,4 +1,15 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -21,5 +32,49 @@ class Product(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Counters written by app/utils/product_stats.py (sort=popular/trending)
+    view_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sales_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Views and sales of the last TRENDING_WINDOW_HOURS, newer ones weighing more
+    trending_score = Column(Float, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_products_active_sales", "is_active", "sales_count"),
+        Index("ix_products_active_trending", "is_active", "trending_score"),
+    )
+
     def __repr__(self):
         return f"<Product {self.slug}>"
+
+
+class RelatedProduct(Base):
+    """Most co-purchased products per product, built by ``app.related_products``."""
+
+    __tablename__ = "related_products"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 is the most related
+    related_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    customers = Column(Integer, nullable=False)  # customers who bought both
+    score = Column(Float, nullable=False)  # cosine similarity of their buyers
+
+
+class RelatedProductsState(Base):
+    """Single row: the last order ``related_products`` has seen."""
+
+    __tablename__ = "related_products_state"
+
+    id = Column(Integer, primary_key=True)
+    last_order_id = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class ProductStatsHourly(Base):
+    """Views and sales per product and hour, for the trending window."""
+
+    __tablename__ = "product_stats_hourly"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    hour = Column(Integer, primary_key=True, index=True)  # hours since the epoch
+    views = Column(Integer, nullable=False, default=0)
+    sales = Column(Integer, nullable=False, default=0)
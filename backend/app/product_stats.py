@@ -0,0 +1,61 @@
+"""
+Rescore trending products, recount sales and optionally assign badges.
+Run with: python -m app.product_stats [--badges] (e.g. hourly from cron)
+"""
+
+import argparse
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.utils.product_stats import (
+    assign_badges,
+    prune_hourly_stats,
+    recount_sales,
+    update_trending_scores,
+)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.product_stats",
+        description="Refresh product popularity counters and trending scores.",
+    )
+    parser.add_argument(
+        "--badges",
+        action="store_true",
+        help='Set the "bestseller" and "popular" badges from the thresholds',
+    )
+    parser.add_argument(
+        "--bestseller-min-sales",
+        type=int,
+        default=settings.BADGE_BESTSELLER_MIN_SALES,
+    )
+    parser.add_argument(
+        "--popular-min-trending",
+        type=float,
+        default=settings.BADGE_POPULAR_MIN_TRENDING,
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    init_db()
+    with SessionLocal() as db:
+        recounted = recount_sales(db)
+        pruned = prune_hourly_stats(db)
+        trending = update_trending_scores(db)
+        db.commit()
+        print(f"  sales recounted for {recounted:,} products")
+        print(f"  {trending:,} trending products, {pruned:,} old buckets dropped")
+
+        if args.badges:
+            changed = assign_badges(
+                db, args.bestseller_min_sales, args.popular_min_trending
+            )
+            db.commit()
+            print(f"  badges changed on {changed:,} products")
+
+
+if __name__ == "__main__":
+    main()
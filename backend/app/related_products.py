@@ -0,0 +1,55 @@
+"""
+Refresh the related-products index from co-purchases in the orders table.
+Run with: python -m app.related_products [--full] (e.g. hourly from cron,
+with --full nightly)
+"""
+
+import argparse
+import time
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.utils.related_products import refresh_related_products
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.related_products",
+        description="Store the most co-purchased products for every product.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every product, not only those ordered since the last run",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=settings.RELATED_PRODUCTS_LIMIT,
+        help="Related products stored per product",
+    )
+    parser.add_argument(
+        "--min-customers",
+        type=int,
+        default=settings.RELATED_PRODUCTS_MIN_CUSTOMERS,
+        help="Customers two products need in common to be related",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    init_db()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = refresh_related_products(
+            db, full=args.full, limit=args.limit, min_customers=args.min_customers
+        )
+    print(
+        f"  {result['products']:,} products refreshed, {result['rows']:,} rows"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Recompute RFM scores for every customer into customer_scores.
+Run with: python -m app.rfm_scores (e.g. nightly from cron)
+"""
+
+import time
+from collections import Counter
+
+from app.database import SessionLocal, init_db
+from app.utils.rfm import load_order_aggregates, score_customers, write_scores
+
+
+def main() -> None:
+    init_db()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        aggregates = load_order_aggregates(db)
+        loaded = time.perf_counter()
+        scores = score_customers(aggregates)
+        scored = time.perf_counter()
+        written = write_scores(db, scores)
+        finished = time.perf_counter()
+
+    print(f"  load   {loaded - started:6.2f}s")
+    print(f"  score  {scored - loaded:6.2f}s")
+    print(f"  write  {finished - scored:6.2f}s  ({written:,} customers)")
+    for segment, count in Counter(scores["segment"].tolist()).most_common():
+        print(f"  {segment:<12} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from app.routers.analytics import router as analytics_router
 from app.routers.auth import router as auth_router
 from app.routers.crm import router as crm_router
 from app.routers.orders import router as orders_router
@@ -10,4 +11,5 @@ __all__ = [
     "auth_router",
     "tickets_router",
     "crm_router",
+    "analytics_router",
 ]
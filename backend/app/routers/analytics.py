@@ -0,0 +1,111 @@
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_admin
+from app.database import get_db
+from app.models import Product, SalesDaily, SalesDailyCategory, SalesDailyProduct
+from app.routers.orders import VALID_ORDER_STATUSES
+from app.schemas.analytics import SalesAnalyticsResponse
+from app.serialization import rows_to_dicts
+
+router = APIRouter(prefix="/api/admin/analytics", tags=["analytics"])
+
+DEFAULT_RANGE_DAYS = 30
+
+
+@router.get("/sales", response_model=SalesAnalyticsResponse)
+def get_sales_analytics(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    group_by: Literal["day", "category", "product"] = "day",
+    status: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    admin: str = Depends(get_current_admin),
+):
+    """Admin: Order count and revenue per day, category or product.
+
+    Answered from the daily sales rollups, so the cost depends on the number
+    of days in the range, not on the number of orders. ``date_from`` and
+    ``date_to`` are inclusive UTC days (default: the last 30 days).
+    ``status`` narrows the totals and ``items``; ``by_status`` always covers
+    every status. Category and product rows are sorted by revenue and capped
+    at ``limit``.
+    """
+    date_to = date_to or datetime.now(UTC).date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=400, detail="date_from must not be after date_to"
+        )
+    if status == "all":
+        status = None
+    if status is not None and status not in VALID_ORDER_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status. Use: {', '.join(VALID_ORDER_STATUSES)}",
+        )
+
+    by_status = [
+        {"status": row.status, "orders": row.orders, "revenue_idr": row.revenue_idr}
+        for row in db.execute(
+            select(
+                SalesDaily.status,
+                func.sum(SalesDaily.orders).label("orders"),
+                func.sum(SalesDaily.revenue_idr).label("revenue_idr"),
+            )
+            .where(SalesDaily.day.between(date_from, date_to))
+            .group_by(SalesDaily.status)
+            .order_by(SalesDaily.status)
+        )
+        if row.orders or row.revenue_idr
+    ]
+    counted = [t for t in by_status if status is None or t["status"] == status]
+
+    rollup = {
+        "day": SalesDaily,
+        "category": SalesDailyCategory,
+        "product": SalesDailyProduct,
+    }[group_by]
+    orders = func.sum(rollup.orders).label("orders")
+    revenue = func.sum(rollup.revenue_idr).label("revenue_idr")
+    if group_by == "day":
+        statement = select(rollup.day, orders, revenue).group_by(rollup.day)
+        statement = statement.order_by(rollup.day)
+    elif group_by == "category":
+        statement = select(rollup.category, orders, revenue).group_by(rollup.category)
+        statement = statement.order_by(revenue.desc(), rollup.category).limit(limit)
+    else:
+        statement = (
+            select(
+                rollup.product_id,
+                Product.title.label("product_title"),
+                Product.slug.label("product_slug"),
+                orders,
+                revenue,
+            )
+            .join(Product, Product.id == rollup.product_id)
+            .group_by(rollup.product_id, Product.title, Product.slug)
+            .order_by(revenue.desc(), rollup.product_id)
+            .limit(limit)
+        )
+    statement = statement.where(rollup.day.between(date_from, date_to)).having(
+        func.sum(rollup.orders) != 0
+    )
+    if status is not None:
+        statement = statement.where(rollup.status == status)
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "status": status,
+        "orders": sum(t["orders"] for t in counted),
+        "revenue_idr": sum(t["revenue_idr"] for t in counted),
+        "by_status": by_status,
+        "items": rows_to_dicts(db.execute(statement)),
+    }
@@ -1,15 +1,27 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, raiseload
 
 from app.auth import get_current_admin
 from app.database import get_db
-from app.models import ActivityLog, CustomerNote, CustomerTag, Order, Ticket, User
+from app.models import (
+    CustomerNote,
+    CustomerScore,
+    CustomerTag,
+    Order,
+    Product,
+    Ticket,
+    User,
+)
+from app.routers.orders import with_order_columns
+from app.routers.tickets import TICKET_COLUMNS
 from app.schemas.crm import (
     ActivityLogResponse,
     CustomerNoteCreate,
     CustomerNoteResponse,
+    CustomerRFM,
     CustomerSummary,
     CustomerTagCreate,
     CustomerTagResponse,
@@ -17,10 +29,36 @@ from app.schemas.crm import (
 )
 from app.schemas.order import OrderWithProductResponse
 from app.schemas.ticket import TicketResponse
+from app.serialization import (
+    FastJSONResponse,
+    Fields,
+    first_image,
+    parse_fields,
+    project,
+    rows_to_dicts,
+    select_fields,
+)
 from app.utils.activity import log_activity
+from app.utils.activity_partitions import customer_timeline, last_activity_at
 
 router = APIRouter(prefix="/api/admin", tags=["crm"])
 
+TAG_COLUMNS = project(CustomerTagResponse, CustomerTag)
+NOTE_COLUMNS = project(CustomerNoteResponse, CustomerNote)
+CUSTOMER_FIELDS = list(CustomerSummary.model_fields)
+# Read with the user; the other summary fields take a query each.
+CUSTOMER_USER_COLUMNS = (User.id, User.email, User.full_name, User.created_at)
+
+# Best first; customers without scores go last.
+CUSTOMER_SORTS = {
+    "rfm": (CustomerScore.rfm_total.desc(), CustomerScore.rfm_score.desc()),
+    "recency": (CustomerScore.recency_days.asc(),),
+    "frequency": (CustomerScore.frequency.desc(),),
+    "monetary": (CustomerScore.monetary_idr.desc(),),
+}
+CUSTOMER_SORTS["orders"] = CUSTOMER_SORTS["frequency"]
+CUSTOMER_SORTS["spend"] = CUSTOMER_SORTS["monetary"]
+
 # --- Dashboard Stats ---
 
 
@@ -55,13 +93,35 @@ def get_dashboard_stats(
 def list_customers(
     search: str = Query(None),
     tag: str = Query(None),
-    sort: str = Query("activity"),  # activity, spend, orders
+    segment: str = Query(None),
+    min_rfm_total: int = Query(None, ge=0, le=15),
+    # activity, newest, rfm, recency, frequency (orders), monetary (spend)
+    sort: str = Query("activity"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    query = db.query(User)
+    """Admin: Page of customers with order totals, tags and RFM scores.
+
+    ``segment``, ``min_rfm_total`` and the score sorts read ``customer_scores``
+    as of the last ``python -m app.rfm_scores`` run, so totals from orders
+    placed since then may not match the order of the list yet.
+
+    With ``fields=``, the queries behind unrequested fields are skipped.
+    """
+    wanted = parse_fields(fields, CUSTOMER_FIELDS)
+    query = db.query(*CUSTOMER_USER_COLUMNS)
+    if (
+        "rfm" in wanted
+        or segment
+        or min_rfm_total is not None
+        or sort in CUSTOMER_SORTS
+    ):
+        query = query.outerjoin(CustomerScore, CustomerScore.customer_id == User.id)
+    if "rfm" in wanted:
+        query = query.add_entity(CustomerScore).options(raiseload("*"))
 
     if search:
         search_term = f"%{search}%"
@@ -72,83 +132,98 @@ def list_customers(
     if tag:
         query = query.join(CustomerTag).filter(CustomerTag.tag == tag)
 
-    if sort == "newest":
-        query = query.order_by(User.created_at.desc())
-    else:
-        query = query.order_by(User.created_at.desc())  # Default
-
-    query.count()
-    users = query.offset((page - 1) * page_size).limit(page_size).all()
+    if segment:
+        query = query.filter(CustomerScore.segment == segment)
+    if min_rfm_total is not None:
+        query = query.filter(CustomerScore.rfm_total >= min_rfm_total)
 
-    results = []
-    for user in users:
-        # Calculate spend properly
-        total_spend = 0
-        user_orders = db.query(Order).filter(Order.user_id == user.id).all()
-        for o in user_orders:
-            if o.product:
-                total_spend += o.product.price_idr
-
-        last_activity = (
-            db.query(ActivityLog)
-            .filter(ActivityLog.customer_id == user.id)
-            .order_by(ActivityLog.created_at.desc())
-            .first()
+    if sort in CUSTOMER_SORTS:
+        query = query.order_by(
+            *(order.nulls_last() for order in CUSTOMER_SORTS[sort]), User.id
         )
+    else:
+        query = query.order_by(User.created_at.desc())  # Default
 
-        tags = [t.tag for t in user.tags]
-
-        results.append(
-            CustomerSummary(
-                id=user.id,
-                email=user.email,
-                full_name=user.full_name,
-                total_orders=len(user_orders),
-                total_spend=total_spend,
-                last_activity=last_activity.created_at
-                if last_activity
-                else user.created_at,
-                tags=tags,
-            )
-        )
+    rows = query.offset((page - 1) * page_size).limit(page_size).all()
 
-    return results
+    return FastJSONResponse(_customer_summaries(db, rows, wanted))
 
 
 @router.get("/customers/{customer_id}", response_model=CustomerSummary)
 def get_customer_summary(
     customer_id: int,
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    user = db.query(User).filter(User.id == customer_id).first()
-    if not user:
+    wanted = parse_fields(fields, CUSTOMER_FIELDS)
+    query = db.query(*CUSTOMER_USER_COLUMNS)
+    if "rfm" in wanted:
+        query = (
+            query.outerjoin(CustomerScore, CustomerScore.customer_id == User.id)
+            .add_entity(CustomerScore)
+            .options(raiseload("*"))
+        )
+    row = query.filter(User.id == customer_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    total_spend = 0
-    user_orders = db.query(Order).filter(Order.user_id == user.id).all()
-    for o in user_orders:
-        if o.product:
-            total_spend += o.product.price_idr
+    return FastJSONResponse(_customer_summaries(db, [row], wanted)[0])
 
-    last_activity = (
-        db.query(ActivityLog)
-        .filter(ActivityLog.customer_id == user.id)
-        .order_by(ActivityLog.created_at.desc())
-        .first()
-    )
 
-    tags = [t.tag for t in user.tags]
+def _customer_summaries(db: Session, rows: list, fields: list[str]) -> list[dict]:
+    """Build summaries for a page of users with a fixed number of queries.
 
-    return CustomerSummary(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        total_orders=len(user_orders),
-        total_spend=total_spend,
-        last_activity=last_activity.created_at if last_activity else user.created_at,
-        tags=tags,
+    ``rows`` carry ``CUSTOMER_USER_COLUMNS``, plus the ``CustomerScore``
+    entity when ``rfm`` is in ``fields``; only ``fields`` are returned.
+    """
+    user_ids = [row.id for row in rows]
+
+    order_stats = {}
+    if "total_orders" in fields or "total_spend" in fields:
+        order_rows = (
+            db.query(Order.user_id, func.count(Order.id), func.sum(Product.price_idr))
+            .outerjoin(Product, Order.product_id == Product.id)
+            .filter(Order.user_id.in_(user_ids))
+            .group_by(Order.user_id)
+        )
+        order_stats = {
+            user_id: (total_orders, total_spend or 0)
+            for user_id, total_orders, total_spend in order_rows
+        }
+    last_activities = (
+        last_activity_at(db, user_ids) if "last_activity" in fields else {}
     )
+    tags: dict[int, list[str]] = {user_id: [] for user_id in user_ids}
+    if "tags" in fields:
+        tag_rows = (
+            db.query(CustomerTag.customer_id, CustomerTag.tag)
+            .filter(CustomerTag.customer_id.in_(user_ids))
+            .order_by(CustomerTag.id)
+        )
+        for customer_id, tag in tag_rows:
+            tags[customer_id].append(tag)
+
+    results = []
+    for row in rows:
+        total_orders, total_spend = order_stats.get(row.id, (0, 0))
+        summary = {
+            "id": row.id,
+            "email": row.email,
+            "full_name": row.full_name,
+            "whatsapp": None,
+            "total_orders": total_orders,
+            "total_spend": total_spend,
+            "last_activity": last_activities.get(row.id) or row.created_at,
+            "tags": tags[row.id],
+        }
+        if "rfm" in fields:
+            score = row.CustomerScore
+            summary["rfm"] = (
+                CustomerRFM.model_validate(score).model_dump() if score else None
+            )
+        results.append({name: summary[name] for name in fields})
+    return results
 
 
 @router.get(
@@ -156,53 +231,29 @@ def get_customer_summary(
 )
 def get_customer_orders(
     customer_id: int,
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    orders = (
-        db.query(Order)
-        .filter(Order.user_id == customer_id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
-
-    items = [
-        OrderWithProductResponse(
-            id=o.id,
-            order_code=o.order_code,
-            product_id=o.product_id,
-            name=o.name,
-            email=o.email,
-            whatsapp=o.whatsapp,
-            notes=o.notes,
-            status=o.status,
-            created_at=o.created_at,
-            updated_at=o.updated_at,
-            product_title=o.product.title,
-            product_price=o.product.price_idr,
-            product_category=o.product.category,
-            product_slug=o.product.slug,
-            product_image=o.product.images[0]
-            if o.product.images and len(o.product.images) > 0
-            else None,
-        )
-        for o in orders
-    ]
-    return items
+    rows = with_order_columns(
+        db.query(Order).filter(Order.user_id == customer_id), fields
+    ).order_by(Order.created_at.desc())
+    return FastJSONResponse(rows_to_dicts(rows, first_image))
 
 
 @router.get("/customers/{customer_id}/tickets", response_model=list[TicketResponse])
 def get_customer_tickets(
     customer_id: int,
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    return (
-        db.query(Ticket)
+    rows = (
+        db.query(*select_fields(TICKET_COLUMNS, fields))
         .filter(Ticket.user_id == customer_id)
         .order_by(Ticket.created_at.desc())
-        .all()
     )
+    return FastJSONResponse(rows_to_dicts(rows))
 
 
 # --- Tags ---
@@ -211,10 +262,14 @@ def get_customer_tickets(
 @router.get("/customers/{customer_id}/tags", response_model=list[CustomerTagResponse])
 def get_customer_tags(
     customer_id: int,
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    return db.query(CustomerTag).filter(CustomerTag.customer_id == customer_id).all()
+    rows = db.query(*select_fields(TAG_COLUMNS, fields)).filter(
+        CustomerTag.customer_id == customer_id
+    )
+    return FastJSONResponse(rows_to_dicts(rows))
 
 
 @router.post("/customers/{customer_id}/tags", response_model=CustomerTagResponse)
@@ -264,15 +319,16 @@ def remove_customer_tag(
 @router.get("/customers/{customer_id}/notes", response_model=list[CustomerNoteResponse])
 def get_customer_notes(
     customer_id: int,
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    return (
-        db.query(CustomerNote)
+    rows = (
+        db.query(*select_fields(NOTE_COLUMNS, fields))
         .filter(CustomerNote.customer_id == customer_id)
         .order_by(CustomerNote.created_at.desc())
-        .all()
     )
+    return FastJSONResponse(rows_to_dicts(rows))
 
 
 @router.post("/customers/{customer_id}/notes", response_model=CustomerNoteResponse)
@@ -301,12 +357,14 @@ def add_customer_note(
 )
 def get_customer_activity(
     customer_id: int,
+    limit: int | None = Query(None, ge=1, le=500),  # default: the whole timeline
+    before: datetime | None = Query(None),  # created_at of the last item seen
+    before_id: int | None = Query(None),  # and its id, for equal timestamps
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    return (
-        db.query(ActivityLog)
-        .filter(ActivityLog.customer_id == customer_id)
-        .order_by(ActivityLog.created_at.desc())
-        .all()
+    # Newest first; older months live in partitions and are only read when
+    # the page reaches back that far.
+    return FastJSONResponse(
+        customer_timeline(db, customer_id, limit, before, before_id)
     )
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Query as SQLQuery
+from sqlalchemy.orm import Session, joinedload, raiseload
 
 from app.auth import get_current_admin, get_current_user
+from app.cache_control import ORDER_STATUS, cache_policy
 from app.database import get_db
-from app.models import Order, Product, User
+from app.models import ActivityLog, Order, Product, User
 from app.schemas import (
     OrderCreate,
     OrderListResponse,
@@ -12,10 +19,58 @@ from app.schemas import (
     OrderStatusPublicResponse,
     OrderWithProductResponse,
 )
+from app.serialization import (
+    FastJSONResponse,
+    Fields,
+    first_image,
+    project,
+    rows_to_dicts,
+    select_fields,
+)
 from app.utils.activity import log_activity
+from app.utils.export import (
+    EXPORT_MEDIA_TYPES,
+    encode_csv,
+    encode_ndjson,
+    stream_chunks,
+)
+from app.utils.pagination import CountMode, count_total, fetch_page
+from app.utils.product_stats import product_counters
+from app.utils.sales_rollup import (
+    apply_sales_deltas,
+    order_created,
+    order_day,
+    status_changed,
+)
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
+VALID_ORDER_STATUSES = ["pending", "confirmed", "completed", "cancelled"]
+
+# Response fields read from the order's product
+ORDER_PRODUCT_SOURCES = {
+    "product_title": Product.title,
+    "product_price": Product.price_idr,
+    "product_category": Product.category,
+    "product_slug": Product.slug,
+    "product_image": Product.images,
+}
+ORDER_WITH_PRODUCT_COLUMNS = project(
+    OrderWithProductResponse, Order, **ORDER_PRODUCT_SOURCES
+)
+
+
+def with_order_columns(query: SQLQuery, fields: str | None = None) -> SQLQuery:
+    """Select the requested order fields from an ``Order`` query.
+
+    The product is only joined when a product field is requested.
+    """
+    columns = select_fields(ORDER_WITH_PRODUCT_COLUMNS, fields)
+    query = query.with_entities(*columns)
+    if any(column.name in ORDER_PRODUCT_SOURCES for column in columns):
+        query = query.join(Order.product)
+    return query
+
 
 # --- Public Endpoints ---
 
@@ -54,10 +109,9 @@ def create_order(
     )
 
     db.add(order)
-    db.commit()
-    db.refresh(order)
 
     if user:
+        db.flush()  # assigns order_code
         log_activity(
             db,
             user.id,
@@ -65,13 +119,17 @@ def create_order(
             reference_id=order.order_code,
             metadata={"product": product.title, "price": product.price_idr},
         )
-        db.commit()  # Commit log
 
+    apply_sales_deltas(db, order_created(order_day(None), "pending", product))
+    db.commit()
+    product_counters.record_sale(product.id)
+    db.refresh(order)
     return OrderResponse.model_validate(order)
 
 
 @router.get("/me", response_model=OrderListResponse)
 def list_my_orders(
+    fields: Fields = None,
     db: Session = Depends(get_db),
     user_email: str = Depends(get_current_user),
 ):
@@ -80,40 +138,16 @@ def list_my_orders(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    orders = (
-        db.query(Order)
-        .filter(Order.user_id == user.id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
-
-    items = [
-        OrderWithProductResponse(
-            id=o.id,
-            order_code=o.order_code,
-            product_id=o.product_id,
-            name=o.name,
-            email=o.email,
-            whatsapp=o.whatsapp,
-            notes=o.notes,
-            status=o.status,
-            created_at=o.created_at,
-            updated_at=o.updated_at,
-            product_title=o.product.title,
-            product_price=o.product.price_idr,
-            product_category=o.product.category,
-            product_slug=o.product.slug,
-            product_image=o.product.images[0]
-            if o.product.images and len(o.product.images) > 0
-            else None,
-        )
-        for o in orders
-    ]
+    rows = with_order_columns(
+        db.query(Order).filter(Order.user_id == user.id), fields
+    ).order_by(Order.created_at.desc())
+    items = rows_to_dicts(rows, first_image)
 
-    return OrderListResponse(items=items, total=len(items))
+    return FastJSONResponse({"items": items, "total": len(items)})
 
 
 @router.get("/{order_code}", response_model=OrderStatusPublicResponse)
+@cache_policy(ORDER_STATUS)
 def get_order_status(
     order_code: str,
     db: Session = Depends(get_db),
@@ -123,7 +157,12 @@ def get_order_status(
     Returns only: order_code, status, product info, created_at.
     For full order details, use /me endpoint with authentication.
     """
-    order = db.query(Order).filter(Order.order_code == order_code.upper()).first()
+    order = (
+        db.query(Order)
+        .options(joinedload(Order.product), raiseload("*"))
+        .filter(Order.order_code == order_code.upper())
+        .first()
+    )
 
     if not order:
         raise HTTPException(status_code=404, detail="Pesanan tidak ditemukan")
@@ -151,54 +190,121 @@ def list_all_orders_admin(
     status: str | None = None,
     page: int = 1,
     page_size: int = 20,
+    count: CountMode = "exact",
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    """Admin: List all orders with pagination and filtering."""
+    """Admin: List all orders with pagination and filtering.
+
+    ``count=estimate`` skips the COUNT(*) over all orders (see
+    app/utils/pagination.py); ``count=none`` skips the total.
+    """
     query = db.query(Order)
 
-    if status and status != "all":
+    filtered = bool(status and status != "all")
+    if filtered:
         query = query.filter(Order.status == status)
 
-    total = query.count()
+    total, exact = count_total(
+        db, query, count, estimate_table=None if filtered else Order.__table__
+    )
+
+    rows, has_more = fetch_page(
+        with_order_columns(query, fields).order_by(Order.created_at.desc()),
+        page,
+        page_size,
+    )
 
-    orders = (
-        query.order_by(Order.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    return FastJSONResponse(
+        {
+            "items": rows_to_dicts(rows, first_image),
+            "total": total,
+            "exact": exact,
+            "has_more": has_more,
+        }
     )
 
-    items = [
-        OrderWithProductResponse(
-            id=o.id,
-            order_code=o.order_code,
-            product_id=o.product_id,
-            name=o.name,
-            email=o.email,
-            whatsapp=o.whatsapp,
-            notes=o.notes,
-            status=o.status,
-            created_at=o.created_at,
-            updated_at=o.updated_at,
-            product_title=o.product.title,
-            product_price=o.product.price_idr,
-            product_category=o.product.category,
-            product_slug=o.product.slug,
-            product_image=o.product.images[0]
-            if o.product.images and len(o.product.images) > 0
-            else None,
+
+@router.get("/admin/export")
+def export_orders_admin(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    status: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    admin: str = Depends(get_current_admin),
+):
+    """Admin: Stream every matching order as CSV or NDJSON.
+
+    ``date_from`` and ``date_to`` are inclusive days on ``created_at``.
+    """
+    statement = (
+        select(*ORDER_WITH_PRODUCT_COLUMNS)
+        .join(Order.product)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+    )
+    if status and status != "all":
+        statement = statement.where(Order.status == status)
+    if date_from:
+        statement = statement.where(
+            Order.created_at >= datetime.combine(date_from, time.min)
+        )
+    if date_to:
+        statement = statement.where(
+            Order.created_at < datetime.combine(date_to + timedelta(days=1), time.min)
         )
-        for o in orders
-    ]
 
-    return OrderListResponse(items=items, total=total)
+    chunks = stream_chunks(db.get_bind(), statement)
+    if export_format == "csv":
+        fieldnames = [column.name for column in ORDER_WITH_PRODUCT_COLUMNS]
+        body = encode_csv(chunks, fieldnames, first_image)
+    else:
+        body = encode_ndjson(chunks, first_image)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="orders.{export_format}"'
+        },
+    )
 
 
 class OrderStatusUpdate(BaseModel):
     status: str
 
 
+class OrderBulkStatusUpdate(BaseModel):
+    status: str
+    order_ids: list[int] = Field(default_factory=list, max_length=1000)
+    order_codes: list[str] = Field(default_factory=list, max_length=1000)
+
+
+class OrderBulkStatusResult(BaseModel):
+    ref: int | str
+    outcome: Literal["updated", "unchanged", "not_found"]
+    order_id: int | None = None
+    order_code: str | None = None
+    old_status: str | None = None
+
+
+class OrderBulkStatusResponse(BaseModel):
+    status: str
+    updated: int
+    unchanged: int
+    not_found: int
+    results: list[OrderBulkStatusResult]
+
+
+def _check_order_status(new_status: str) -> None:
+    if new_status not in VALID_ORDER_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Status tidak valid. Gunakan: {', '.join(VALID_ORDER_STATUSES)}",
+        )
+
+
 @router.patch("/admin/{order_id}/status", response_model=OrderResponse)
 def update_order_status(
     order_id: int,
@@ -207,21 +313,30 @@ def update_order_status(
     admin: str = Depends(get_current_admin),
 ):
     """Admin: Update order status."""
-    valid_statuses = ["pending", "confirmed", "completed", "cancelled"]
-    if update_data.status not in valid_statuses:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Status tidak valid. Gunakan: {', '.join(valid_statuses)}",
-        )
+    _check_order_status(update_data.status)
 
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = (
+        db.query(Order)
+        .options(joinedload(Order.product))
+        .filter(Order.id == order_id)
+        .first()
+    )
     if not order:
         raise HTTPException(status_code=404, detail="Order tidak ditemukan")
 
     old_status = order.status
     order.status = update_data.status
-    db.commit()
-    db.refresh(order)
+    apply_sales_deltas(
+        db,
+        status_changed(
+            order_day(order.created_at),
+            old_status,
+            order.status,
+            order.product_id,
+            order.product.category,
+            order.product.price_idr,
+        ),
+    )
 
     if order.user_id:
         log_activity(
@@ -231,6 +346,113 @@ def update_order_status(
             reference_id=order.order_code,
             metadata={"old_status": old_status, "new_status": update_data.status},
         )
-        db.commit()
 
+    db.commit()
+    db.refresh(order)
     return OrderResponse.model_validate(order)
+
+
+@router.post("/admin/bulk-status", response_model=OrderBulkStatusResponse)
+def bulk_update_order_status(
+    update_data: OrderBulkStatusUpdate,
+    db: Session = Depends(get_db),
+    admin: str = Depends(get_current_admin),
+):
+    """Admin: Move many orders (by id and/or order code) to one status.
+
+    The status update, the ``order_status_updated`` activity rows and the
+    sales rollups are written in a single transaction. Orders already in the target status are
+    reported as ``unchanged`` and get no activity row.
+    """
+    _check_order_status(update_data.status)
+    order_ids = list(dict.fromkeys(update_data.order_ids))
+    order_codes = list(dict.fromkeys(code.upper() for code in update_data.order_codes))
+    if not order_ids and not order_codes:
+        raise HTTPException(
+            status_code=400, detail="Berikan order_ids atau order_codes"
+        )
+
+    rows = db.execute(
+        select(
+            Order.id,
+            Order.order_code,
+            Order.user_id,
+            Order.status,
+            Order.created_at,
+            Order.product_id,
+            Product.category,
+            Product.price_idr,
+        )
+        .join(Order.product)
+        .where(or_(Order.id.in_(order_ids), Order.order_code.in_(order_codes)))
+        .with_for_update(of=Order)
+    ).all()
+    by_id = {row.id: row for row in rows}
+    by_code = {row.order_code: row for row in rows}
+
+    changed = [row for row in rows if row.status != update_data.status]
+    if changed:
+        db.execute(
+            update(Order)
+            .where(Order.id.in_([row.id for row in changed]))
+            .values(status=update_data.status),
+            execution_options={"synchronize_session": False},
+        )
+        activity = [
+            {
+                "customer_id": row.user_id,
+                "type": "order_status_updated",
+                "reference_id": row.order_code,
+                "metadata_json": {
+                    "old_status": row.status,
+                    "new_status": update_data.status,
+                },
+            }
+            for row in changed
+            if row.user_id
+        ]
+        if activity:
+            db.execute(insert(ActivityLog), activity)
+        apply_sales_deltas(
+            db,
+            (
+                delta
+                for row in changed
+                for delta in status_changed(
+                    order_day(row.created_at),
+                    row.status,
+                    update_data.status,
+                    row.product_id,
+                    row.category,
+                    row.price_idr,
+                )
+            ),
+        )
+        db.commit()
+
+    results = []
+    counts = {"updated": 0, "unchanged": 0, "not_found": 0}
+    reported: set[int] = set()
+    for ref, row in [(i, by_id.get(i)) for i in order_ids] + [
+        (code, by_code.get(code)) for code in order_codes
+    ]:
+        if row is not None and row.id in reported:
+            continue  # same order given by both id and code
+        if row is None:
+            outcome = "not_found"
+            results.append({"ref": ref, "outcome": outcome})
+        else:
+            outcome = "unchanged" if row.status == update_data.status else "updated"
+            results.append(
+                {
+                    "ref": ref,
+                    "outcome": outcome,
+                    "order_id": row.id,
+                    "order_code": row.order_code,
+                    "old_status": row.status,
+                }
+            )
+            reported.add(row.id)
+        counts[outcome] += 1
+
+    return {"status": update_data.status, **counts, "results": results}
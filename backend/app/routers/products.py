@@ -1,114 +1,200 @@
 from math import ceil
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_admin
+from app.cache_control import CATALOG, cache_policy
+from app.config import settings
 from app.database import get_db
-from app.models import Product
+from app.models import Product, RelatedProduct
 from app.schemas import (
     ProductCreate,
+    ProductDetailResponse,
+    ProductImportResponse,
     ProductListResponse,
     ProductResponse,
+    ProductSuggestion,
     ProductUpdate,
+    RelatedProductResponse,
 )
+from app.serialization import (
+    CARD_COLUMNS,
+    RELATED_COLUMNS,
+    FastJSONResponse,
+    Fields,
+    card_images,
+    dumps,
+    project,
+    rows_to_dicts,
+    select_fields,
+)
+from app.utils.catalog import bump_catalog_version
+from app.utils.facets import product_facets
+from app.utils.pagination import CountMode, count_total, fetch_page
+from app.utils.product_import import ImportFileError, import_products
+from app.utils.product_lookup import product_resolver
+from app.utils.product_stats import product_counters
+from app.utils.stale_reads import catalog_reads, json_response
+from app.utils.suggest import product_suggestions
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
+PRODUCT_COLUMNS = project(ProductResponse, Product)
+
+IMPORT_EXTENSIONS = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl"}
+
+
+def _pages(total: int | None, page_size: int) -> int | None:
+    if total is None:
+        return None
+    return ceil(total / page_size) if total > 0 else 1
+
 
 # --- Public Endpoints ---
 
 
 @router.get("", response_model=ProductListResponse)
+@cache_policy(CATALOG)
 def list_products(
+    request: Request,
     category: str | None = Query(None, description="Filter by category"),
     search: str | None = Query(None, description="Search in title and description"),
     sort: str | None = Query(
-        "newest", description="Sort: newest, price_asc, price_desc, name"
+        "newest",
+        description="Sort: newest, price_asc, price_desc, name, popular, trending",
     ),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(12, ge=1, le=100, description="Items per page"),
+    facets: bool = Query(False, description="Include category/badge/price counts"),
+    count: CountMode = Query("exact", description="Total: exact, estimate or none"),
+    view: Literal["card", "full"] = Query(
+        "card", description="card: no description_full, first image only"
+    ),
+    fields: Fields = None,
     db: Session = Depends(get_db),
 ):
-    """List all active products with filtering, search, and pagination."""
-    query = db.query(Product).filter(Product.is_active)
-
-    # Filter by category
-    if category:
-        query = query.filter(Product.category == category)
-
-    # Search
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Product.title.ilike(search_term),
-                Product.description_short.ilike(search_term),
+    """List all active products with filtering, search, and pagination.
+
+    Items are product cards unless ``view=full`` asks for every field.
+    With ``facets=true`` the response also counts the matching products per
+    category, badge and price bucket (one grouped query).
+    When the database is slow or locked, the last good page is served
+    (see app/utils/stale_reads.py).
+    """
+
+    def render(db: Session) -> bytes:
+        filters = [Product.is_active]
+
+        # Search
+        if search:
+            search_term = f"%{search}%"
+            filters.append(
+                or_(
+                    Product.title.ilike(search_term),
+                    Product.description_short.ilike(search_term),
+                )
             )
+
+        columns = select_fields(
+            PRODUCT_COLUMNS if view == "full" else CARD_COLUMNS, fields
+        )
+        query = db.query(*columns).filter(*filters)
+
+        # Filter by category
+        if category:
+            query = query.filter(Product.category == category)
+
+        # Sort
+        if sort == "price_asc":
+            query = query.order_by(Product.price_idr.asc())
+        elif sort == "price_desc":
+            query = query.order_by(Product.price_idr.desc())
+        elif sort == "name":
+            query = query.order_by(Product.title.asc())
+        elif sort == "popular":
+            query = query.order_by(Product.sales_count.desc(), Product.id.desc())
+        elif sort == "trending":
+            query = query.order_by(Product.trending_score.desc(), Product.id.desc())
+        else:  # newest (default)
+            query = query.order_by(Product.created_at.desc())
+
+        # Count total (cached per filter, see app/utils/pagination.py)
+        total, exact = count_total(db, query, count)
+
+        # Paginate
+        rows, has_more = fetch_page(query, page, page_size)
+
+        return dumps(
+            {
+                "items": rows_to_dicts(rows, None if view == "full" else card_images),
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "pages": _pages(total, page_size),
+                "exact": exact,
+                "has_more": has_more,
+                "facets": product_facets(db, filters, category) if facets else None,
+            }
         )
 
-    # Sort
-    if sort == "price_asc":
-        query = query.order_by(Product.price_idr.asc())
-    elif sort == "price_desc":
-        query = query.order_by(Product.price_idr.desc())
-    elif sort == "name":
-        query = query.order_by(Product.title.asc())
-    else:  # newest (default)
-        query = query.order_by(Product.created_at.desc())
-
-    # Count total
-    total = query.count()
-    pages = ceil(total / page_size) if total > 0 else 1
-
-    # Paginate
-    offset = (page - 1) * page_size
-    products = query.offset(offset).limit(page_size).all()
-
-    return ProductListResponse(
-        items=[ProductResponse.model_validate(p) for p in products],
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=pages,
-    )
+    return catalog_reads.response(request, db, render)
+
+
+@router.get("/suggest", response_model=list[ProductSuggestion])
+@cache_policy(CATALOG)
+def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed text"),
+    limit: int = Query(settings.SUGGEST_LIMIT, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    """Typeahead: active products whose words start with the typed words.
+
+    Served from an in-memory index (see app/utils/suggest.py); falls back to
+    trigram matching so small typos still find the product.
+    """
+    index = product_suggestions.index(db)
+    return FastJSONResponse(index.suggest(q, limit))
 
 
-@router.get("/{id_or_slug}", response_model=ProductResponse)
+@router.get("/{id_or_slug}", response_model=ProductDetailResponse)
+@cache_policy(CATALOG)
 def get_product(
     id_or_slug: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
-    """Get a single product by ID or slug."""
-    # Try as ID first
-    if id_or_slug.isdigit():
-        product = (
-            db.query(Product)
-            .filter(
-                Product.id == int(id_or_slug),
-                Product.is_active,
-            )
-            .first()
+    """Get a single product by ID or slug, with its related products.
+
+    The product is read in one query (see app/utils/product_lookup.py).
+    ``related`` comes from the index built by ``python -m app.related_products``
+    (one indexed query, however many orders there are). When the database is
+    slow or locked, the last good response is served
+    (see app/utils/stale_reads.py).
+    """
+
+    def render(db: Session) -> tuple[bytes, int]:
+        # One query for ids and slugs; unknown keys are cached as misses
+        product = product_resolver.resolve(db, id_or_slug)
+
+        if not product:
+            raise HTTPException(status_code=404, detail="Produk tidak ditemukan")
+
+        related = (
+            db.query(*RELATED_COLUMNS)
+            .join(RelatedProduct, RelatedProduct.related_id == Product.id)
+            .filter(RelatedProduct.product_id == product.id, Product.is_active)
+            .order_by(RelatedProduct.rank)
         )
-    else:
-        product = None
+        detail = ProductDetailResponse.model_validate(product)
+        detail.related = [RelatedProductResponse.model_validate(row) for row in related]
+        return detail.model_dump_json().encode(), product.id
 
-    # Try as slug if not found by ID
-    if not product:
-        product = (
-            db.query(Product)
-            .filter(
-                Product.slug == id_or_slug,
-                Product.is_active,
-            )
-            .first()
-        )
-
-    if not product:
-        raise HTTPException(status_code=404, detail="Produk tidak ditemukan")
-
-    return ProductResponse.model_validate(product)
+    (body, product_id), age = catalog_reads.read(request, db, render)
+    product_counters.record_view(product_id)
+    return json_response(body, age)
 
 
 # --- Admin Endpoints ---
@@ -119,11 +205,13 @@ def list_all_products_admin(
     search: str | None = Query(None, description="Search products"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    count: CountMode = Query("exact", description="Total: exact, estimate or none"),
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
     """Admin: List all products (including inactive)."""
-    query = db.query(Product)
+    query = db.query(*select_fields(PRODUCT_COLUMNS, fields))
 
     if search:
         search_term = f"%{search}%"
@@ -131,17 +219,22 @@ def list_all_products_admin(
 
     query = query.order_by(Product.created_at.desc())
 
-    total = query.count()
-    pages = ceil(total / page_size) if total > 0 else 1
-    offset = (page - 1) * page_size
-    products = query.offset(offset).limit(page_size).all()
-
-    return ProductListResponse(
-        items=[ProductResponse.model_validate(p) for p in products],
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=pages,
+    total, exact = count_total(
+        db, query, count, estimate_table=None if search else Product.__table__
+    )
+    rows, has_more = fetch_page(query, page, page_size)
+
+    return FastJSONResponse(
+        {
+            "items": rows_to_dicts(rows),
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": _pages(total, page_size),
+            "exact": exact,
+            "has_more": has_more,
+            "facets": None,
+        }
     )
 
 
@@ -157,6 +250,7 @@ def create_product(
 
     product = Product(**product_in.model_dump())
     db.add(product)
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
     return ProductResponse.model_validate(product)
@@ -184,6 +278,7 @@ def update_product(
     for field, value in update_data.items():
         setattr(product, field, value)
 
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
     return ProductResponse.model_validate(product)
@@ -201,6 +296,38 @@ def toggle_product_active(
         raise HTTPException(status_code=404, detail="Product not found")
 
     product.is_active = not product.is_active
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
     return ProductResponse.model_validate(product)
+
+
+@router.post("/admin/import", response_model=ProductImportResponse)
+def import_products_admin(
+    file: UploadFile = File(..., description="CSV (with header) or JSONL"),
+    import_format: Literal["csv", "jsonl"] | None = Query(
+        None, alias="format", description="File format; defaults to the extension"
+    ),
+    db: Session = Depends(get_db),
+    admin: str = Depends(get_current_admin),
+):
+    """Admin: Create or update products in bulk, matched by slug.
+
+    Each row is validated like POST /admin (new slug) or PATCH /admin/{id}
+    (existing slug). Invalid rows are skipped and listed in ``errors``.
+    """
+    if import_format is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        import_format = IMPORT_EXTENSIONS.get(extension)
+    if import_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown file format; use a .csv or .jsonl file or ?format=",
+        )
+
+    try:
+        report = import_products(db, file.file, import_format)
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return FastJSONResponse(report)
@@ -5,9 +5,19 @@ from app.auth import get_current_admin, get_current_user
 from app.database import get_db
 from app.models import Ticket, TicketStatus, User
 from app.schemas.ticket import TicketCreate, TicketListResponse, TicketResponse
+from app.serialization import (
+    FastJSONResponse,
+    Fields,
+    project,
+    rows_to_dicts,
+    select_fields,
+)
+from app.utils.pagination import CountMode, count_total, fetch_page
 
 router = APIRouter(prefix="/api/tickets", tags=["tickets"])
 
+TICKET_COLUMNS = project(TicketResponse, Ticket)
+
 
 @router.get("", response_model=TicketListResponse)
 def list_my_tickets(
@@ -15,21 +25,28 @@ def list_my_tickets(
     user_email: str = Depends(get_current_user),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    count: CountMode = Query("exact", description="Total: exact, estimate or none"),
+    fields: Fields = None,
 ):
     user = db.query(User).filter(User.email == user_email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     query = (
-        db.query(Ticket)
+        db.query(*select_fields(TICKET_COLUMNS, fields))
         .filter(Ticket.user_id == user.id)
         .order_by(Ticket.updated_at.desc())
     )
-    total = query.count()
-    tickets = query.offset((page - 1) * page_size).limit(page_size).all()
+    total, exact = count_total(db, query, count)
+    rows, has_more = fetch_page(query, page, page_size)
 
-    return TicketListResponse(
-        items=[TicketResponse.model_validate(t) for t in tickets], total=total
+    return FastJSONResponse(
+        {
+            "items": rows_to_dicts(rows),
+            "total": total,
+            "exact": exact,
+            "has_more": has_more,
+        }
     )
 
 
@@ -60,17 +77,27 @@ def list_all_tickets_admin(
     status: str | None = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    count: CountMode = Query("exact", description="Total: exact, estimate or none"),
+    fields: Fields = None,
     db: Session = Depends(get_db),
     admin: str = Depends(get_current_admin),
 ):
-    query = db.query(Ticket)
-    if status and status != "all":
+    query = db.query(*select_fields(TICKET_COLUMNS, fields))
+    filtered = bool(status and status != "all")
+    if filtered:
         query = query.filter(Ticket.status == status)
 
     query = query.order_by(Ticket.updated_at.desc())
-    total = query.count()
-    tickets = query.offset((page - 1) * page_size).limit(page_size).all()
+    total, exact = count_total(
+        db, query, count, estimate_table=None if filtered else Ticket.__table__
+    )
+    rows, has_more = fetch_page(query, page, page_size)
 
-    return TicketListResponse(
-        items=[TicketResponse.model_validate(t) for t in tickets], total=total
+    return FastJSONResponse(
+        {
+            "items": rows_to_dicts(rows),
+            "total": total,
+            "exact": exact,
+            "has_more": has_more,
+        }
     )
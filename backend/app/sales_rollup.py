@@ -0,0 +1,23 @@
+"""
+Rebuild the daily sales rollups from the orders table.
+Run with: python -m app.sales_rollup
+"""
+
+import time
+
+from app.database import SessionLocal, init_db
+from app.utils.sales_rollup import rebuild_sales_rollups
+
+
+def main() -> None:
+    init_db()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = rebuild_sales_rollups(db)
+    for table, rows in counts.items():
+        print(f"  {table:<22} {rows:>10,} rows")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
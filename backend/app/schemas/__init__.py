@@ -7,10 +7,17 @@ from app.schemas.order import (
 )
 from app.schemas.product import (
     ProductBase,
+    ProductCardResponse,
     ProductCreate,
+    ProductDetailResponse,
+    ProductFacets,
+    ProductImportResponse,
+    ProductImportRowError,
     ProductListResponse,
     ProductResponse,
+    ProductSuggestion,
     ProductUpdate,
+    RelatedProductResponse,
 )
 
 __all__ = [
@@ -18,7 +25,14 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "ProductResponse",
+    "ProductCardResponse",
+    "ProductDetailResponse",
+    "RelatedProductResponse",
+    "ProductSuggestion",
     "ProductListResponse",
+    "ProductFacets",
+    "ProductImportRowError",
+    "ProductImportResponse",
     "OrderCreate",
     "OrderResponse",
     "OrderWithProductResponse",
@@ -0,0 +1,30 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class SalesStatusTotal(BaseModel):
+    status: str
+    orders: int
+    revenue_idr: int
+
+
+class SalesBreakdownRow(BaseModel):
+    day: date | None = None
+    category: str | None = None
+    product_id: int | None = None
+    product_title: str | None = None
+    product_slug: str | None = None
+    orders: int
+    revenue_idr: int
+
+
+class SalesAnalyticsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: str
+    status: str | None = None
+    orders: int
+    revenue_idr: int
+    by_status: list[SalesStatusTotal]
+    items: list[SalesBreakdownRow]
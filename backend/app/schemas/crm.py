@@ -45,6 +45,22 @@ class ActivityLogResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# RFM scores (see app/utils/rfm.py)
+class CustomerRFM(BaseModel):
+    recency_days: int | None = None
+    frequency: int
+    monetary_idr: int
+    r_score: int
+    f_score: int
+    m_score: int
+    rfm_score: str
+    rfm_total: int
+    segment: str
+    computed_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 # Customer Summary (for list)
 class CustomerSummary(BaseModel):
     id: int
@@ -57,6 +73,7 @@ class CustomerSummary(BaseModel):
     total_spend: int
     last_activity: datetime | None = None
     tags: list[str] = []
+    rfm: CustomerRFM | None = None  # None until the scoring job has run
 
     model_config = {"from_attributes": True}
 
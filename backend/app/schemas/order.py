@@ -58,7 +58,9 @@ class OrderWithProductResponse(OrderResponse):
 
 class OrderListResponse(BaseModel):
     items: list[OrderWithProductResponse]
-    total: int
+    total: int | None  # None with count=none
+    exact: bool = True  # False when total is an estimate (count=estimate)
+    has_more: bool = False
 
 
 class OrderStatusPublicResponse(BaseModel):
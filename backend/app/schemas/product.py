@@ -38,9 +38,84 @@ class ProductResponse(ProductBase):
     model_config = {"from_attributes": True}
 
 
+class ProductCardResponse(BaseModel):
+    """Listing item: ``ProductResponse`` without ``description_full``."""
+
+    title: str
+    slug: str
+    description_short: str
+    price_idr: int
+    category: str
+    badges: list[str] | None = None
+    images: list[str] | None = None  # first image only
+    is_active: bool = True
+    id: int
+    created_at: datetime
+
+
+class RelatedProductResponse(BaseModel):
+    id: int
+    slug: str
+    title: str
+    price_idr: int
+    category: str
+    badges: list[str] | None = None
+    images: list[str] | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class ProductDetailResponse(ProductResponse):
+    related: list[RelatedProductResponse] = []  # most related first
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    slug: str
+    title: str
+    category: str
+    price_idr: int
+    image: str | None = None  # first image
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class PriceBucketCount(BaseModel):
+    min: int | None = None  # inclusive; None: no lower bound
+    max: int | None = None  # exclusive; None: no upper bound
+    count: int
+
+
+class ProductFacets(BaseModel):
+    category: list[FacetCount]  # ignores the category filter
+    badge: list[FacetCount]
+    price: list[PriceBucketCount]
+
+
 class ProductListResponse(BaseModel):
-    items: list[ProductResponse]
-    total: int
+    items: list[ProductCardResponse | ProductResponse]  # full with view=full
+    total: int | None  # None with count=none
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    exact: bool = True  # False when total is an estimate (count=estimate)
+    has_more: bool = False
+    facets: ProductFacets | None = None  # with facets=true
+
+
+class ProductImportRowError(BaseModel):
+    row: int
+    slug: str | None = None
+    errors: list[dict]
+
+
+class ProductImportResponse(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: list[ProductImportRowError]
+    catalog_version: int
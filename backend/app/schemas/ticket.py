@@ -22,4 +22,6 @@ class TicketResponse(BaseModel):
 
 class TicketListResponse(BaseModel):
     items: list[TicketResponse]
-    total: int
+    total: int | None  # None with count=none
+    exact: bool = True  # False when total is an estimate (count=estimate)
+    has_more: bool = False
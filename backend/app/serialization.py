@@ -0,0 +1,107 @@
+"""Fast path for serializing list responses.
+
+Routes keep their ``response_model`` so the OpenAPI schema is unchanged, but
+instead of building Pydantic models per row (which FastAPI then validates and
+serializes a second time) they select exactly the response fields from the
+database and return the rows as JSON bytes in a single ``orjson`` pass.
+
+The same routes take ``fields=`` (sparse fieldsets): a comma-separated list
+of response fields. Only those columns are selected, and joins that only
+serve other fields are left out.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Annotated, Any
+
+import orjson
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+
+from app.models import Product
+from app.schemas import ProductCardResponse, RelatedProductResponse
+
+Columns = dict[str, Any]
+
+Fields = Annotated[
+    str | None,
+    Query(description="Comma-separated response fields to return (default: all)"),
+]
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes via orjson; datetimes match Pydantic's format."""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson; datetimes match Pydantic's format."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def project(schema: type[BaseModel], model: Any, **sources: Any) -> list[Any]:
+    """
+    Select the columns of ``schema`` from ``model``, labelled by field name.
+    Fields that do not map to a column of ``model`` are given in ``sources``.
+    """
+    return [
+        (sources[name] if name in sources else getattr(model, name)).label(name)
+        for name in schema.model_fields
+    ]
+
+
+def parse_fields(fields: str | None, available: Iterable[str]) -> list[str]:
+    """Names requested by ``fields=``, in ``available`` order; all when empty."""
+    available = list(available)
+    wanted = {name.strip() for name in (fields or "").split(",")} - {""}
+    if not wanted:
+        return available
+    unknown = wanted.difference(available)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return [name for name in available if name in wanted]
+
+
+def select_fields(columns: list[Any], fields: str | None) -> list[Any]:
+    """The projected ``columns`` requested by ``fields=``."""
+    names = set(parse_fields(fields, (column.name for column in columns)))
+    return [column for column in columns if column.name in names]
+
+
+def rows_to_dicts(
+    rows: Iterable[Row], transform: Callable[[dict], None] | None = None
+) -> list[dict]:
+    """Turn projected rows into response dicts, optionally fixing each one up."""
+    items = [row._asdict() for row in rows]
+    if transform is not None:
+        for item in items:
+            transform(item)
+    return items
+
+
+def first_image(item: dict, key: str = "product_image") -> None:
+    """Reduce a selected ``images`` list to its first entry."""
+    if key in item:  # not with fields= leaving it out
+        images = item[key]
+        item[key] = images[0] if images else None
+
+
+def card_images(item: dict) -> None:
+    """Wrap a card's single selected image (``CARD_COLUMNS``) back in a list."""
+    if "images" in item:
+        image = item["images"]
+        item["images"] = [image] if image is not None else None
+
+
+# Listing cards: no description_full, and only the first image leaves the DB.
+# Shared by the product routes and the catalog snapshot (app/utils/catalog_snapshot.py).
+CARD_COLUMNS = project(ProductCardResponse, Product, images=Product.images[0])
+RELATED_COLUMNS = project(RelatedProductResponse, Product)
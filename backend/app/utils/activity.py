@@ -1,7 +1,301 @@
+"""Customer activity log writer.
+
+``log_activity`` records an event on the caller's session and is committed
+(or rolled back) with the caller's transaction:
+
+- ``sync`` mode (tests): the event is an ``ActivityLog`` row in that
+  transaction.
+- ``async`` mode: the event is held on the session until it commits, then
+  handed to ``activity_writer``. The writer appends it to a local spool file
+  and a background thread inserts queued events in multi-row batches once
+  ``ACTIVITY_BATCH_SIZE`` events are queued or ``ACTIVITY_FLUSH_INTERVAL``
+  seconds have passed.
+
+Each process spools to its own files in ``ACTIVITY_SPOOL_DIR``, guarded by a
+lock file held for the life of the process. Spool files left by a process
+that died before flushing are replayed when the next writer starts, so
+delivery is at-least-once. Files are kept in a subdirectory per database
+URL, so they are only ever replayed into the database they were logged for.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Any
+
+from sqlalchemy import URL, event, insert
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import DATABASE_DIR, SessionLocal
 from app.models.crm import ActivityLog
 
+try:
+    import fcntl
+except ImportError:  # Windows: one process per spool directory is assumed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_activity"
+INSERT_CHUNK_SIZE = 500
+
+
+def _default_spool_dir() -> Path:
+    if settings.ACTIVITY_SPOOL_DIR:
+        return Path(settings.ACTIVITY_SPOOL_DIR)
+    if os.getenv("VERCEL"):
+        return Path("/tmp/fxsociety-activity")
+    return DATABASE_DIR / "activity-spool"
+
+
+def _database_dir(url: URL) -> str:
+    """Spool subdirectory of the database at ``url`` (password left out)."""
+    name = url.render_as_string(hide_password=True)
+    digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+    return f"{url.get_backend_name()}-{digest}"
+
+
+def _encode(activity: dict[str, Any]) -> str:
+    return json.dumps({**activity, "created_at": activity["created_at"].isoformat()})
+
+
+def _decode(line: str) -> dict[str, Any]:
+    activity = json.loads(line)
+    activity["created_at"] = datetime.fromisoformat(activity["created_at"])
+    return activity
+
+
+def _read_spool(path: Path) -> list[dict[str, Any]]:
+    """Events in a spool file; lines torn by a crash mid-write are skipped."""
+    activities = []
+    with open(path, encoding="utf-8", errors="replace") as spool:
+        for number, line in enumerate(spool, 1):
+            if not line.strip():
+                continue
+            try:
+                activities.append(_decode(line))
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping unreadable activity event %s:%d", path, number)
+    return activities
+
+
+class ActivityWriter:
+    """Spool activity events locally and insert them in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        spool_dir: Path,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        with session_factory() as db:
+            self.spool_dir = spool_dir / _database_dir(db.get_bind().url)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._token = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._rotations = itertools.count(1)
+        self._queue: list[dict[str, Any]] = []
+        self._spool: IO[str] | None = None
+        self._lock_file: IO[str] | None = None
+        self._wakeup = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+
+    # --- producer side ---
+
+    def enqueue(self, activities: list[dict[str, Any]]) -> None:
+        """Spool ``activities`` and queue them for the next batch insert."""
+        if not activities:
+            return
+        self.start()
+        with self._wakeup:
+            spool = self._current_spool()
+            spool.write("".join(_encode(a) + "\n" for a in activities))
+            spool.flush()
+            self._queue.extend(activities)
+            if len(self._queue) >= self.batch_size:
+                self._wakeup.notify()
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        """Replay orphaned spool files and start the flush thread (idempotent)."""
+        if self._thread is not None:
+            return
+        with self._wakeup:
+            if self._thread is not None:
+                return
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            # Lock before the file becomes visible under its final name, so
+            # recovery never mistakes a starting writer for a dead one.
+            staging = self.spool_dir / f"{self._token}.lock.tmp"
+            self._lock_file = open(staging, "w")  # noqa: SIM115
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            staging.rename(self.spool_dir / f"{self._token}.lock")
+            self._closing = False
+            self._thread = threading.Thread(
+                target=self._run, name="activity-writer", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the flush thread after a final flush."""
+        with self._wakeup:
+            thread, self._closing = self._thread, True
+            self._wakeup.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+        with self._wakeup:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                (self.spool_dir / f"{self._token}.lock").unlink(missing_ok=True)
+                self._lock_file = None
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            self.recover()
+        except Exception:
+            logger.exception("Failed to recover spooled activity events")
+        while True:
+            with self._wakeup:
+                if not self._closing and len(self._queue) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                closing = self._closing
+            if closing:
+                return
+            try:
+                self.flush()
+            except Exception:
+                # Spooled events stay on disk for the next flush.
+                logger.exception("Failed to flush activity events")
+
+    # --- consumer side ---
+
+    def flush(self) -> int:
+        """Insert everything queued so far and return the number of events."""
+        with self._flush_lock:
+            with self._wakeup:
+                batch, self._queue = self._queue, []
+                rotated = self._rotate_spool() if batch else None
+            flushed = self._insert_file(rotated, batch) if rotated else 0
+            # Retry batches whose insert failed earlier.
+            for path in sorted(self.spool_dir.glob(f"{self._token}.*.flushing")):
+                if path != rotated:
+                    flushed += self._insert_file(path)
+            return flushed
+
+    def recover(self) -> int:
+        """Insert events spooled by writers whose process is gone."""
+        recovered = 0
+        with self._flush_lock, self._recovery_lock():
+            spooled = [
+                *self.spool_dir.glob("*.spool"),
+                *self.spool_dir.glob("*.flushing"),
+            ]
+            for token in sorted({path.name.split(".", 1)[0] for path in spooled}):
+                if token == self._token or self._owner_is_alive(token):
+                    continue
+                for path in sorted(self.spool_dir.glob(f"{token}.*")):
+                    if path.suffix in (".spool", ".flushing"):
+                        recovered += self._insert_file(path)
+                (self.spool_dir / f"{token}.lock").unlink(missing_ok=True)
+        if recovered:
+            logger.warning("Recovered %d spooled activity events", recovered)
+        return recovered
+
+    @contextmanager
+    def _recovery_lock(self) -> Iterator[None]:
+        with open(self.spool_dir / "recovery.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _owner_is_alive(self, token: str) -> bool:
+        lock_path = self.spool_dir / f"{token}.lock"
+        if fcntl is None or not lock_path.exists():
+            return False
+        with open(lock_path) as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            return False
+
+    def _current_spool(self) -> IO[str]:
+        if self._spool is None:
+            path = self.spool_dir / f"{self._token}.spool"
+            self._spool = open(path, "a", encoding="utf-8")  # noqa: SIM115
+        return self._spool
+
+    def _rotate_spool(self) -> Path | None:
+        if self._spool is None:
+            return None
+        self._spool.close()
+        self._spool = None
+        current = self.spool_dir / f"{self._token}.spool"
+        rotated = current.with_name(
+            f"{self._token}.{next(self._rotations):06d}.flushing"
+        )
+        current.rename(rotated)
+        return rotated
+
+    def _insert_file(
+        self, path: Path, activities: list[dict[str, Any]] | None = None
+    ) -> int:
+        try:
+            if activities is None:
+                activities = _read_spool(path)
+            with self.session_factory() as db:
+                for start in range(0, len(activities), INSERT_CHUNK_SIZE):
+                    chunk = activities[start : start + INSERT_CHUNK_SIZE]
+                    db.execute(insert(ActivityLog).values(chunk))
+                db.commit()
+        except Exception:
+            # Keep the file; the next flush retries it.
+            logger.exception("Failed to insert the activity events in %s", path)
+            return 0
+        path.unlink()
+        return len(activities)
+
+
+activity_writer = ActivityWriter(
+    SessionLocal,
+    _default_spool_dir(),
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed_activity(db: Session) -> None:
+    pending = db.info.pop(PENDING_KEY, None)
+    if pending:
+        activity_writer.enqueue(pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted_activity(db: Session, transaction) -> None:
+    # After a commit the events were already handed over; anything left when
+    # the outermost transaction ends was rolled back.
+    if transaction.parent is None:
+        db.info.pop(PENDING_KEY, None)
+
 
 def log_activity(
     db: Session,
@@ -11,14 +305,17 @@ def log_activity(
     metadata: dict = None,
 ):
     """
-    Log an activity for a customer.
+    Log an activity for a customer; it is written when ``db`` commits.
     type: order_created, order_status_updated, ticket_created, ticket_updated, note_added, tag_added, tag_removed
     """
-    log = ActivityLog(
-        customer_id=customer_id,
-        type=type,
-        reference_id=reference_id,
-        metadata_json=metadata,
-    )
-    db.add(log)
-    # We assume db.commit() is called by the caller transaction
+    activity = {
+        "customer_id": customer_id,
+        "type": type,
+        "reference_id": reference_id,
+        "metadata_json": metadata,
+        "created_at": datetime.now(UTC),
+    }
+    if settings.ACTIVITY_WRITER_MODE == "sync":
+        db.add(ActivityLog(**activity))
+    else:
+        db.info.setdefault(PENDING_KEY, []).append(activity)
@@ -0,0 +1,324 @@
+"""Monthly partitions of the activity log.
+
+``activity_logs`` is the hot partition: every writer inserts there. Once a
+month falls outside ``ACTIVITY_HOT_MONTHS`` its rows are moved into their own
+table, ``activity_logs_YYYYMM``, registered in ``activity_partitions``. Once
+it falls outside ``ACTIVITY_RETENTION_MONTHS`` the partition is written to
+``<ACTIVITY_ARCHIVE_DIR>/activity_logs_YYYYMM.ndjson.gz`` and dropped.
+
+Readers go through ``customer_timeline`` and ``last_activity_at``, which
+query the hot table first and then partitions newest first, stopping as soon
+as older partitions cannot change the answer. Archived months are no longer
+queryable.
+"""
+
+import gzip
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import DATABASE_DIR
+from app.models.crm import ActivityLog, ActivityPartition
+from app.utils.export import encode_ndjson, stream_chunks
+
+ACTIVITY_COLUMNS = (
+    "id",
+    "customer_id",
+    "type",
+    "reference_id",
+    "metadata_json",
+    "created_at",
+)
+
+# Partition tables are created on demand, so they live outside Base.metadata.
+partition_metadata = MetaData()
+
+
+def default_archive_dir() -> Path:
+    if settings.ACTIVITY_ARCHIVE_DIR:
+        return Path(settings.ACTIVITY_ARCHIVE_DIR)
+    if os.getenv("VERCEL"):
+        return Path("/tmp/fxsociety-activity-archive")
+    return DATABASE_DIR / "activity-archive"
+
+
+# --- months ---
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored as UTC. Aware values
+    # are converted, not relabelled: SQLite binds the wall clock and drops the
+    # offset, so a +07:00 cursor would otherwise be read seven hours late.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def month_key(value: datetime) -> str:
+    """``YYYY-MM`` of a timestamp, in UTC."""
+    return _as_utc(value).strftime("%Y-%m")
+
+
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    """Start (inclusive) and end (exclusive) of a ``YYYY-MM`` month, in UTC."""
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=UTC)
+    return start, shift_month(start, 1)
+
+
+def shift_month(start: datetime, months: int) -> datetime:
+    """First day of the month ``months`` away from ``start``'s month."""
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _month_start(value: datetime) -> datetime:
+    value = _as_utc(value)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+# --- tables ---
+
+
+def partition_table_name(month: str) -> str:
+    return "activity_logs_" + month.replace("-", "")
+
+
+def partition_table(month: str) -> Table:
+    """Table object for a month's partition (not necessarily created yet)."""
+    name = partition_table_name(month)
+    if name in partition_metadata.tables:
+        return partition_metadata.tables[name]
+    return Table(
+        name,
+        partition_metadata,
+        Column("id", Integer, primary_key=True),
+        Column("customer_id", Integer, nullable=False),
+        Column("type", String(50), nullable=False),
+        Column("reference_id", String(50), nullable=True),
+        Column("metadata_json", JSON, nullable=True),
+        Column("created_at", DateTime(timezone=True)),
+        Index(f"ix_{name}_customer_created", "customer_id", "created_at"),
+    )
+
+
+def _labelled_columns(table: Table) -> list[Any]:
+    # Plain ``str`` keys in the row dicts; orjson rejects ``quoted_name``.
+    return [table.c[name].label(name) for name in ACTIVITY_COLUMNS]
+
+
+def _live_partitions(db: Session) -> list[ActivityPartition]:
+    """Partitions that still have a table, newest first."""
+    return (
+        db.query(ActivityPartition)
+        .filter(ActivityPartition.archived_at.is_(None))
+        .order_by(ActivityPartition.month.desc())
+        .all()
+    )
+
+
+# --- maintenance ---
+
+
+def roll_partitions(
+    db: Session, hot_months: int | None = None, now: datetime | None = None
+) -> dict[str, int]:
+    """
+    Move every month older than the last ``hot_months`` months out of
+    ``activity_logs`` into its partition. One transaction per month; returns
+    the number of rows moved per month.
+    """
+    hot_months = settings.ACTIVITY_HOT_MONTHS if hot_months is None else hot_months
+    cutoff = shift_month(_month_start(now or datetime.now(UTC)), 1 - hot_months)
+    hot = ActivityLog.__table__
+    columns = [hot.c[name] for name in ACTIVITY_COLUMNS]
+
+    moved: dict[str, int] = {}
+    oldest = db.execute(
+        select(func.min(hot.c.created_at)).where(hot.c.created_at < cutoff)
+    ).scalar()
+    if oldest is None:
+        return moved
+
+    start = _month_start(oldest)
+    while start < cutoff:
+        end = shift_month(start, 1)
+        month = month_key(start)
+        in_month = (hot.c.created_at >= start) & (hot.c.created_at < end)
+        count = db.execute(select(func.count()).where(in_month)).scalar()
+        if count:
+            table = partition_table(month)
+            table.create(db.connection(), checkfirst=True)
+            db.execute(
+                insert(table).from_select(
+                    list(ACTIVITY_COLUMNS), select(*columns).where(in_month)
+                )
+            )
+            db.execute(delete(hot).where(in_month))
+            partition = db.get(ActivityPartition, month)
+            if partition is None:
+                partition = ActivityPartition(
+                    month=month, table_name=table.name, row_count=0
+                )
+                db.add(partition)
+            elif partition.archived_at is not None:
+                # Late events for an archived month (e.g. a replayed spool):
+                # keep them in a partition again; the next archive run
+                # appends them to the same archive file.
+                partition.archived_at = None
+            partition.row_count += count
+            db.commit()
+            moved[month] = count
+        start = end
+    return moved
+
+
+def archive_partition(
+    db: Session, partition: ActivityPartition, archive_dir: Path
+) -> Path:
+    """Append a partition's rows to its gzip NDJSON archive, then drop it."""
+    table = partition_table(partition.month)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{table.name}.ndjson.gz"
+
+    statement = select(*_labelled_columns(table)).order_by(table.c.id)
+    # Appending adds a gzip member; readers see one continuous stream.
+    with gzip.open(path, "ab") as archive:
+        for block in encode_ndjson(stream_chunks(db.get_bind(), statement)):
+            archive.write(block)
+
+    table.drop(db.connection(), checkfirst=True)
+    partition.archived_at = datetime.now(UTC)
+    partition.archive_path = str(path)
+    db.commit()
+    return path
+
+
+def archive_partitions(
+    db: Session,
+    retention_months: int | None = None,
+    archive_dir: Path | None = None,
+    now: datetime | None = None,
+) -> list[Path]:
+    """Archive and drop every partition older than ``retention_months``."""
+    if retention_months is None:
+        retention_months = settings.ACTIVITY_RETENTION_MONTHS
+    archive_dir = archive_dir or default_archive_dir()
+    cutoff = month_key(
+        shift_month(_month_start(now or datetime.now(UTC)), 1 - retention_months)
+    )
+    db.commit()  # archives stream on their own connection
+    return [
+        archive_partition(db, partition, archive_dir)
+        for partition in reversed(_live_partitions(db))
+        if partition.month < cutoff
+    ]
+
+
+# --- reads ---
+
+
+def customer_timeline(
+    db: Session,
+    customer_id: int,
+    limit: int | None = None,
+    before: datetime | None = None,
+    before_id: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    The customer's newest ``limit`` events (all of them by default), newest
+    first. ``before``/``before_id`` are the ``created_at`` and ``id`` of the
+    last event already seen: only events after it in that order are returned,
+    so events sharing a timestamp are never skipped between pages. Partitions
+    are read newest first and only while they can still contribute to the
+    page.
+    """
+    before = _as_utc(before) if before else None
+    hot = ActivityLog.__table__
+    items = _timeline_rows(db, hot, customer_id, limit, before, before_id)
+    for partition in _live_partitions(db):
+        start, end = month_bounds(partition.month)
+        if before is not None and start > before:
+            continue
+        if limit is not None and len(items) >= limit:
+            items.sort(key=_newest_first)
+            if _as_utc(items[limit - 1]["created_at"]) >= end:
+                break
+        table = partition_table(partition.month)
+        items += _timeline_rows(db, table, customer_id, limit, before, before_id)
+    items.sort(key=_newest_first)
+    return items[:limit]
+
+
+def _timeline_rows(
+    db: Session,
+    table: Table,
+    customer_id: int,
+    limit: int | None,
+    before: datetime | None,
+    before_id: int | None,
+) -> list[dict[str, Any]]:
+    statement = (
+        select(*_labelled_columns(table))
+        .where(table.c.customer_id == customer_id)
+        .order_by(table.c.created_at.desc(), table.c.id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        older = table.c.created_at < before
+        if before_id is not None:
+            older = or_(
+                older, and_(table.c.created_at == before, table.c.id < before_id)
+            )
+        statement = statement.where(older)
+    return [row._asdict() for row in db.execute(statement)]
+
+
+def _newest_first(item: dict[str, Any]) -> tuple[float, int]:
+    created_at = item["created_at"]
+    timestamp = _as_utc(created_at).timestamp() if created_at else float("-inf")
+    return -timestamp, -item["id"]
+
+
+def last_activity_at(db: Session, customer_ids: list[int]) -> dict[int, datetime]:
+    """Latest activity per customer, reading partitions only for the misses."""
+    hot = ActivityLog.__table__
+    latest = _latest_per_customer(db, hot, customer_ids)
+    missing = [cid for cid in customer_ids if cid not in latest]
+    for partition in _live_partitions(db) if missing else []:
+        table = partition_table(partition.month)
+        latest.update(_latest_per_customer(db, table, missing))
+        missing = [cid for cid in missing if cid not in latest]
+        if not missing:
+            break
+    return latest
+
+
+def _latest_per_customer(
+    db: Session, table: Table, customer_ids: list[int]
+) -> dict[int, datetime]:
+    rows = db.execute(
+        select(table.c.customer_id, func.max(table.c.created_at))
+        .where(table.c.customer_id.in_(customer_ids))
+        .group_by(table.c.customer_id)
+    )
+    return {customer_id: created_at for customer_id, created_at in rows if created_at}
@@ -0,0 +1,83 @@
+"""Bulk reads and writes for batch jobs.
+
+At hundreds of thousands of rows SQLAlchemy's per-row processing (result
+rows, parameter binding) costs more than the query itself, so these helpers
+compile the statement once and work with the driver's plain tuples.
+"""
+
+import itertools
+from collections.abc import Sequence
+from operator import itemgetter
+
+import numpy as np
+from sqlalchemy import Select, Table, insert
+from sqlalchemy.orm import Session
+
+INSERT_CHUNK_SIZE = 50_000
+
+
+def select_columns(db: Session, statement: Select) -> list[list]:
+    """Run ``statement`` and return its result as one list per column.
+
+    Values are what the driver returns, without SQLAlchemy's result
+    processing (SQLite datetimes stay strings), so select numbers and text.
+    """
+    connection = db.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    if compiled.positiontup is not None:
+        params = [compiled.params[key] for key in compiled.positiontup]
+    else:
+        params = compiled.params
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(compiled.string, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return [
+        list(map(itemgetter(index), rows))
+        for index in range(len(statement.selected_columns))
+    ]
+
+
+def insert_columns(
+    db: Session,
+    table: Table,
+    columns: dict[str, Sequence | np.ndarray],
+    constants: dict | None = None,
+    chunk_size: int = INSERT_CHUNK_SIZE,
+) -> int:
+    """Insert equal-length ``columns`` into ``table``; the caller commits.
+
+    Column values go to the driver as they are (``None``, ``int``, ``float``
+    or ``str``); ``constants`` are the same for every row and go through the
+    column type's bind processing once, so they may be e.g. datetimes.
+    """
+    constants = constants or {}
+    connection = db.connection()
+    dialect = connection.dialect
+    statement = insert(table).compile(
+        dialect=dialect, column_keys=[*columns, *constants]
+    )
+    for name, value in constants.items():
+        process = table.c[name].type.bind_processor(dialect)
+        constants[name] = process(value) if process else value
+    keys = statement.positiontup or list(statement.params)
+    total = len(next(iter(columns.values())))
+
+    for start in range(0, total, chunk_size):
+        chunk = [
+            itertools.repeat(constants[key])
+            if key in constants
+            else _tolist(columns[key][start : start + chunk_size])
+            for key in keys
+        ]
+        rows = zip(*chunk, strict=False)  # ``repeat`` is endless
+        if not statement.positiontup:
+            rows = (dict(zip(keys, row, strict=True)) for row in rows)
+        connection.exec_driver_sql(statement.string, list(rows))
+    return total
+
+
+def _tolist(values: Sequence | np.ndarray) -> list:
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
@@ -0,0 +1,71 @@
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.models.catalog import CatalogVersion
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_ID = 1
+
+# Session.info key holding the version bumped in the open transaction
+_PENDING_VERSION = "catalog_version_bumped"
+
+_change_listeners: list[Callable[[int], None]] = []
+
+
+def get_catalog_version(db: Session) -> int:
+    """Current catalog version (0 before the first product write)."""
+    version = db.execute(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    ).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session) -> int:
+    """
+    Increment the catalog version and return the new value.
+    Call it inside the transaction that writes products; the caller commits.
+    """
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CatalogVersion(id=CATALOG_VERSION_ID, version=1))
+        db.flush()
+        version = 1
+    else:
+        version = get_catalog_version(db)
+    db.info[_PENDING_VERSION] = version
+    return version
+
+
+def on_catalog_change(listener: Callable[[int], None]) -> Callable[[int], None]:
+    """
+    Call ``listener(version)`` after a transaction that bumped the catalog
+    version commits in this process. Other processes see the new version
+    with get_catalog_version.
+    """
+    _change_listeners.append(listener)
+    return listener
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_catalog_change(db: Session) -> None:
+    version = db.info.pop(_PENDING_VERSION, None)
+    if version is None:
+        return
+    for listener in _change_listeners:
+        try:
+            listener(version)
+        except Exception:
+            logger.exception("Catalog change listener %r failed", listener)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_change(db: Session) -> None:
+    db.info.pop(_PENDING_VERSION, None)
@@ -0,0 +1,232 @@
+"""Static JSON snapshots of the public catalog, for serving without Python.
+
+``write_catalog_snapshot`` renders what anonymous visitors read into files
+that a CDN or the frontend host can serve as they are::
+
+    <dir>/manifest.json                             the snapshot to read
+    <dir>/<snapshot>/products/page-<n>.json         GET /api/products?page=<n>
+    <dir>/<snapshot>/categories/<category>/page-<n>.json
+                                                    ... &category=<category>
+    <dir>/<snapshot>/products/<slug>.json           GET /api/products/<slug>
+
+Every file holds the same JSON as the API response (default sort and page
+size, card items). A snapshot is written to a directory of its own, named
+after the catalog version, and only then published by replacing
+``manifest.json``, so readers never see half a catalog; older snapshots are
+removed once ``CATALOG_SNAPSHOT_KEEP`` newer ones exist. Slugs and categories
+that are not safe file names are left to the API.
+
+Run it with ``python -m app.catalog_snapshot``. When ``CATALOG_SNAPSHOT_DIR``
+is set, the app also regenerates it in a background thread after each
+catalog change (``on_catalog_change``); changes made while a snapshot is
+being written are picked up by one more run.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from math import ceil
+from pathlib import Path
+from typing import Any
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Product, RelatedProduct
+from app.schemas import ProductDetailResponse, RelatedProductResponse
+from app.serialization import (
+    CARD_COLUMNS,
+    RELATED_COLUMNS,
+    card_images,
+    rows_to_dicts,
+)
+from app.utils.catalog import get_catalog_version, on_catalog_change
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+PAGE_SIZE = 12  # the listing's default page_size
+
+_SAFE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+def _dump(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_UTC_Z))
+
+
+def _write_pages(directory: Path, items: list[dict]) -> int:
+    """Write ``items`` as listing pages; returns the number of pages."""
+    total = len(items)
+    pages = ceil(total / PAGE_SIZE) if total > 0 else 1
+    for page in range(1, pages + 1):
+        _dump(
+            directory / f"page-{page}.json",
+            {
+                "items": items[(page - 1) * PAGE_SIZE : page * PAGE_SIZE],
+                "total": total,
+                "page": page,
+                "page_size": PAGE_SIZE,
+                "pages": pages,
+                "exact": True,
+                "has_more": page < pages,
+                "facets": None,
+            },
+        )
+    return pages
+
+
+def write_catalog_snapshot(
+    db: Session, directory: Path, keep: int | None = None
+) -> dict:
+    """Render the active catalog under ``directory`` and publish it.
+
+    Returns the manifest.
+    """
+    keep = settings.CATALOG_SNAPSHOT_KEEP if keep is None else keep
+    version = get_catalog_version(db)
+    generated_at = datetime.now(UTC)
+    name = f"v{version}-{generated_at:%Y%m%d%H%M%S%f}"
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = directory / f".{name}.tmp"
+
+    try:
+        listing = (
+            db.query(*CARD_COLUMNS)
+            .filter(Product.is_active)
+            .order_by(Product.created_at.desc())
+        )
+        cards = rows_to_dicts(listing, card_images)
+        pages = _write_pages(staging / "products", cards)
+
+        by_category: defaultdict[str, list[dict]] = defaultdict(list)
+        for card in cards:
+            by_category[card["category"]].append(card)
+        categories = {
+            category: _write_pages(staging / "categories" / category, items)
+            for category, items in sorted(by_category.items())
+            if _SAFE_NAME.fullmatch(category)
+        }
+
+        related: defaultdict[int, list[RelatedProductResponse]] = defaultdict(list)
+        rows = (
+            db.query(RelatedProduct.product_id, *RELATED_COLUMNS)
+            .join(RelatedProduct, RelatedProduct.related_id == Product.id)
+            .filter(Product.is_active)
+            .order_by(RelatedProduct.product_id, RelatedProduct.rank)
+        )
+        for values in rows_to_dicts(rows):
+            product_id = values.pop("product_id")
+            related[product_id].append(RelatedProductResponse.model_validate(values))
+
+        products = 0
+        for product in db.query(Product).filter(Product.is_active):
+            if not _SAFE_NAME.fullmatch(product.slug):
+                continue
+            detail = ProductDetailResponse.model_validate(product)
+            detail.related = related.get(product.id, [])
+            path = staging / "products" / f"{product.slug}.json"
+            path.write_bytes(detail.model_dump_json().encode())
+            products += 1
+
+        staging.rename(directory / name)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    manifest = {
+        "version": version,
+        "snapshot": name,
+        "generated_at": generated_at.isoformat().replace("+00:00", "Z"),
+        "page_size": PAGE_SIZE,
+        "pages": pages,
+        "categories": categories,
+        "products": products,
+    }
+    published = directory / f".{MANIFEST}.tmp"
+    _dump(published, manifest)
+    os.replace(published, directory / MANIFEST)
+
+    snapshots = sorted(
+        (path for path in directory.glob("v*") if path.is_dir()),
+        key=lambda path: path.stat().st_mtime,
+    )
+    for old in snapshots[: max(len(snapshots) - keep, 0)]:
+        if old.name != name:
+            shutil.rmtree(old, ignore_errors=True)
+    return manifest
+
+
+class CatalogSnapshotWriter:
+    """Regenerate the snapshot in a background thread after catalog changes."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._pending = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def request(self, version: int | None = None) -> None:
+        """Ask for a new snapshot; several requests coalesce into one run."""
+        self._pending.set()
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="catalog-snapshot", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the writer thread; a snapshot being written is finished."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        self._pending.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            self._pending.wait()
+            if self._stop.is_set():
+                return
+            self._pending.clear()
+            self.write()
+
+    def write(self) -> dict | None:
+        """Write a snapshot to ``CATALOG_SNAPSHOT_DIR`` now (None when unset)."""
+        if not settings.CATALOG_SNAPSHOT_DIR:
+            return None
+        started = time.perf_counter()
+        try:
+            with self.session_factory() as db:
+                manifest = write_catalog_snapshot(
+                    db, Path(settings.CATALOG_SNAPSHOT_DIR)
+                )
+        except Exception:
+            logger.exception("Failed to write the catalog snapshot")
+            return None
+        logger.info(
+            "Catalog snapshot %s written in %.1fs",
+            manifest["snapshot"],
+            time.perf_counter() - started,
+        )
+        return manifest
+
+
+catalog_snapshots = CatalogSnapshotWriter(SessionLocal)
+on_catalog_change(catalog_snapshots.request)
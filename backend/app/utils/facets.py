@@ -0,0 +1,77 @@
+"""Facet counts for the product listing, in one grouped query.
+
+The query groups the listed products by (category, badges, price bucket);
+the handful of groups is then summed per facet in Python. Like the usual
+storefront filters, the category facet ignores the selected category so the
+other chips keep their counts, while badge and price counts are for the
+products actually listed.
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+
+import orjson
+from sqlalchemy import String, case, cast, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from app.config import settings
+from app.models import Product
+
+
+def price_bucket(edges: Sequence[int]) -> ColumnElement[int]:
+    """Index of the ``edges`` interval holding the price (0 below the first)."""
+    return case(
+        *((Product.price_idr < edge, index) for index, edge in enumerate(edges)),
+        else_=len(edges),
+    )
+
+
+def product_facets(
+    db: Session, filters: Sequence[ColumnElement[bool]], category: str | None = None
+) -> dict[str, list[dict]]:
+    """Category, badge and price counts of the products matching ``filters``.
+
+    ``category`` is the selected category, applied to every facet but the
+    category facet itself.
+    """
+    edges = sorted(settings.FACET_PRICE_EDGES)
+    bucket = price_bucket(edges).label("bucket")
+    badges = cast(Product.badges, String).label("badges")
+    groups = db.execute(
+        select(Product.category, badges, bucket, func.count())
+        .where(*filters)
+        .group_by(Product.category, badges, bucket)
+    )
+
+    categories: Counter[str] = Counter()
+    badge_counts: Counter[str] = Counter()
+    price_counts = [0] * (len(edges) + 1)
+    for group_category, group_badges, group_bucket, count in groups:
+        categories[group_category] += count
+        if category and group_category != category:
+            continue
+        price_counts[group_bucket] += count
+        if group_badges:
+            for badge in set(orjson.loads(group_badges) or ()):
+                badge_counts[badge] += count
+
+    bounds = [None, *edges, None]
+    return {
+        "category": _counts(categories),
+        "badge": _counts(badge_counts),
+        "price": [
+            {"min": bounds[index], "max": bounds[index + 1], "count": count}
+            for index, count in enumerate(price_counts)
+        ],
+    }
+
+
+def _counts(counter: Counter[str]) -> list[dict]:
+    """Most frequent first, then alphabetically."""
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(
+            counter.items(), key=lambda item: (-item[1], item[0])
+        )
+    ]
@@ -0,0 +1,50 @@
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState
+
+logger = logging.getLogger(__name__)
+
+LAZY_LOAD_MODES = ("off", "warn", "raise")
+
+
+class LazyLoadError(RuntimeError):
+    """An implicit relationship lazy load happened while strict mode is on."""
+
+
+def enable_strict_loading(target, mode: str) -> None:
+    """
+    Report implicit relationship lazy loads on a Session, sessionmaker or Session class.
+    mode: off (no-op), warn (log with stack trace), raise (LazyLoadError)
+    Routers should declare what they load with joinedload/selectinload instead.
+    """
+    if mode not in LAZY_LOAD_MODES:
+        raise ValueError(f"LAZY_LOAD_MODE must be one of {', '.join(LAZY_LOAD_MODES)}")
+
+    for listener in (_warn_on_lazy_load, _raise_on_lazy_load):
+        if event.contains(target, "do_orm_execute", listener):
+            event.remove(target, "do_orm_execute", listener)
+
+    if mode == "warn":
+        event.listen(target, "do_orm_execute", _warn_on_lazy_load)
+    elif mode == "raise":
+        event.listen(target, "do_orm_execute", _raise_on_lazy_load)
+
+
+def _lazy_load_message(state: ORMExecuteState) -> str | None:
+    if not state.is_select or state.lazy_loaded_from is None:
+        return None
+    relationship = state.loader_strategy_path[-1]
+    return f"Implicit lazy load of {relationship}; declare a loader option instead"
+
+
+def _warn_on_lazy_load(state: ORMExecuteState) -> None:
+    message = _lazy_load_message(state)
+    if message:
+        logger.warning(message, stack_info=True)
+
+
+def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+    message = _lazy_load_message(state)
+    if message:
+        raise LazyLoadError(message)
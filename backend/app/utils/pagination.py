@@ -0,0 +1,177 @@
+"""Totals and pages for paginated listings.
+
+List endpoints take ``count=``:
+
+- ``exact`` (default): the exact total. It is cached per filter signature
+  (the query's FROM and WHERE clauses and their parameters, whatever the
+  sort order or selected columns) until a write to one of the queried tables
+  commits in this process, or for ``COUNT_CACHE_TTL`` seconds, which bounds
+  staleness for writes made by other processes.
+- ``estimate``: like ``exact``, except that a cold cache on a large
+  unfiltered table (``COUNT_ESTIMATE_MIN_ROWS``) is answered from table
+  statistics and flagged ``exact: false``.
+- ``none``: no count at all (``total: null``), for infinite scroll.
+
+Every page is read with one extra row, so ``has_more`` is exact whatever
+the count mode.
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Hashable
+from typing import Any, Literal
+
+from sqlalchemy import Table, event, func, literal_column, select, text
+from sqlalchemy.orm import ORMExecuteState, Query, Session
+from sqlalchemy.sql.util import find_tables
+
+from app.config import settings
+
+CountMode = Literal["exact", "estimate", "none"]
+
+# Session.info key collecting the tables written in the open transaction
+_WRITTEN_TABLES = "count_cache_written_tables"
+
+
+class CountCache:
+    """Exact counts per filter signature, dropped when their tables change."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, {table: generation}, count)
+        self._entries: OrderedDict[Hashable, tuple[float, dict[str, int], int]] = (
+            OrderedDict()
+        )
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def snapshot(self, tables: set[str]) -> dict[str, int]:
+        """Generations to pass to ``put`` for a count about to be run."""
+        with self._lock:
+            return {table: self._generations[table] for table in tables}
+
+    def get(self, key: Hashable) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, generations, count = entry
+            if expires_at < time.monotonic() or any(
+                self._generations[table] != generation
+                for table, generation in generations.items()
+            ):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count
+
+    def put(self, key: Hashable, generations: dict[str, int], count: int) -> None:
+        """Store ``count`` unless a table changed since ``snapshot``."""
+        with self._lock:
+            if any(
+                self._generations[table] != generation
+                for table, generation in generations.items()
+            ):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, generations, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tables: set[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
+
+
+def estimate_rows(db: Session, table: Table) -> int | None:
+    """Row count of ``table`` from statistics, without scanning it.
+
+    PostgreSQL's planner estimate (None before the first ANALYZE); elsewhere
+    the highest primary key, which over-counts deleted rows.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table.name},
+        ).scalar()
+        return int(estimate) if estimate is not None and estimate >= 0 else None
+    (primary_key,) = table.primary_key.columns
+    return db.execute(select(func.max(primary_key))).scalar() or 0
+
+
+def count_total(
+    db: Session,
+    query: Query,
+    mode: CountMode = "exact",
+    estimate_table: Table | None = None,
+) -> tuple[int | None, bool]:
+    """``(total, exact)`` of ``query`` for the given count mode.
+
+    Pass ``estimate_table`` when ``query`` lists a whole table, unfiltered.
+    """
+    if mode == "none":
+        return None, True
+
+    statement = query.statement
+    # Sort order and columns (sort=, view=, fields=) do not change the count
+    signature = statement.order_by(None).with_only_columns(
+        literal_column("1"), maintain_column_froms=True
+    )
+    compiled = signature.compile(dialect=db.get_bind().dialect)
+    key = (compiled.string, tuple(sorted(compiled.params.items())))
+    total = count_cache.get(key)
+    if total is not None:
+        return total, True
+
+    if mode == "estimate" and estimate_table is not None:
+        estimate = estimate_rows(db, estimate_table)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+            return estimate, False
+
+    tables = {table.name for table in find_tables(statement, include_joins=True)}
+    generations = count_cache.snapshot(tables)
+    total = query.count()
+    count_cache.put(key, generations, total)
+    return total, True
+
+
+def fetch_page(query: Query, page: int, page_size: int) -> tuple[list[Any], bool]:
+    """Rows of ``page`` and whether another page follows."""
+    rows = query.offset((page - 1) * page_size).limit(page_size + 1).all()
+    return rows[:page_size], len(rows) > page_size
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(db: Session, flush_context) -> None:
+    written = db.info.setdefault(_WRITTEN_TABLES, set())
+    for instance in (*db.new, *db.dirty, *db.deleted):
+        written.add(instance.__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement_tables(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        written = state.session.info.setdefault(_WRITTEN_TABLES, set())
+        written.add(state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(db: Session) -> None:
+    written = db.info.pop(_WRITTEN_TABLES, None)
+    if written:
+        count_cache.invalidate(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tables(db: Session) -> None:
+    db.info.pop(_WRITTEN_TABLES, None)
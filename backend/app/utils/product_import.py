@@ -0,0 +1,224 @@
+"""Bulk product import from CSV or JSONL.
+
+Rows are upserted by slug: a slug that already exists is validated with
+``ProductUpdate`` (only the columns present in the row are changed), a new
+slug with ``ProductCreate``. Rows are written in chunked transactions with one
+slug lookup, one bulk INSERT and one bulk UPDATE per chunk, and the catalog
+version is bumped once after all chunks. Invalid rows are skipped and reported
+with their 1-based row number; they never abort the rest of the import.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO, Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Product
+from app.schemas import ProductCreate, ProductUpdate
+from app.utils.catalog import bump_catalog_version, get_catalog_version
+
+ImportFormat = Literal["csv", "jsonl"]
+
+IMPORT_CHUNK_SIZE = 500
+
+LIST_FIELDS = ("badges", "images")
+
+
+class ImportFileError(ValueError):
+    """The upload cannot be read at all (as opposed to a bad row)."""
+
+
+def _csv_list(value: str) -> Any:
+    """List cells are a JSON array or ``|``-separated values."""
+    value = value.strip()
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return [part.strip() for part in value.split("|") if part.strip()]
+
+
+def _csv_reader(stream: IO[bytes]) -> csv.DictReader:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError("CSV header is not readable UTF-8 text") from e
+    if not fieldnames or "slug" not in fieldnames:
+        raise ImportFileError("CSV header must include a 'slug' column")
+    return reader
+
+
+def _read_csv(reader: csv.DictReader) -> Iterator[dict[str, Any] | str]:
+    for record in reader:
+        row: dict[str, Any] = {}
+        for key, value in record.items():
+            # Empty cells mean "not provided"; extra cells have a None key.
+            if key is None or value is None or value == "":
+                continue
+            row[key] = _csv_list(value) if key in LIST_FIELDS else value
+        yield row
+
+
+def _read_jsonl(stream: IO[bytes]) -> Iterator[dict[str, Any] | str]:
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            yield f"Invalid JSON: {e}"
+            continue
+        yield row if isinstance(row, dict) else "Each line must be a JSON object"
+
+
+def read_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[dict[str, Any] | str]:
+    """
+    Yield one dict per row, or an error message for an unreadable row.
+    A CSV without a usable header raises ``ImportFileError`` before anything is
+    read; a file that breaks mid-way ends with an error row, and the rows
+    before it are still imported.
+    """
+    rows = _read_csv(_csv_reader(stream)) if fmt == "csv" else _read_jsonl(stream)
+    return _stop_on_read_error(rows)
+
+
+def _stop_on_read_error(
+    rows: Iterator[dict[str, Any] | str],
+) -> Iterator[dict[str, Any] | str]:
+    try:
+        yield from rows
+    except UnicodeDecodeError:
+        yield "File must be UTF-8 encoded; import stopped at this row"
+    except csv.Error as e:
+        yield f"Invalid CSV ({e}); import stopped at this row"
+
+
+def _validation_errors(e: ValidationError) -> list[dict]:
+    return e.errors(include_url=False, include_context=False, include_input=False)
+
+
+def _row_error(row: int, slug: Any, errors: list[dict] | str) -> dict:
+    if isinstance(errors, str):
+        errors = [{"type": "value_error", "loc": [], "msg": errors}]
+    return {
+        "row": row,
+        "slug": slug if isinstance(slug, str) else None,
+        "errors": errors,
+    }
+
+
+def _import_chunk(
+    db: Session,
+    chunk: list[tuple[int, dict[str, Any] | str]],
+    report: dict,
+    seen: dict[str, int],
+) -> None:
+    slugs = {
+        row["slug"]
+        for _, row in chunk
+        if isinstance(row, dict) and isinstance(row.get("slug"), str)
+    }
+    existing = dict(
+        db.execute(select(Product.slug, Product.id).where(Product.slug.in_(slugs)))
+        .tuples()
+        .all()
+    )
+
+    creates: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    accepted: list[tuple[int, str]] = []
+    # Slugs of this chunk join ``seen`` only once it is written: rows of a
+    # rolled-back chunk may be retried later in the file
+    chunk_seen: dict[str, int] = {}
+    for number, row in chunk:
+        if isinstance(row, str):
+            report["errors"].append(_row_error(number, None, row))
+            continue
+        slug = row.get("slug")
+        first = seen.get(slug, chunk_seen.get(slug)) if isinstance(slug, str) else None
+        if first is not None:
+            message = f"Duplicate slug in file (row {first})"
+            report["errors"].append(_row_error(number, slug, message))
+            continue
+        try:
+            if isinstance(slug, str) and slug in existing:
+                data = ProductUpdate.model_validate(row).model_dump(exclude_unset=True)
+                data.pop("slug", None)
+                if data:
+                    updates.append({"id": existing[slug], **data})
+            else:
+                creates.append(ProductCreate.model_validate(row).model_dump())
+        except ValidationError as e:
+            report["errors"].append(_row_error(number, slug, _validation_errors(e)))
+            continue
+        chunk_seen[slug] = number
+        accepted.append((number, slug))
+
+    if not creates and not updates:
+        seen.update(chunk_seen)
+        report["unchanged"] += len(accepted)
+        return
+
+    try:
+        if creates:
+            db.execute(insert(Product), creates)
+        if updates:
+            db.execute(update(Product), updates)
+        db.commit()
+    except (DataError, IntegrityError) as e:
+        # A concurrent writer took one of the new slugs, or a value does not
+        # fit its column (e.g. a slug longer than 100 characters).
+        db.rollback()
+        message = f"Chunk rolled back: {e.orig}"
+        report["errors"].extend(_row_error(n, slug, message) for n, slug in accepted)
+        return
+
+    seen.update(chunk_seen)
+    report["created"] += len(creates)
+    report["updated"] += len(updates)
+    report["unchanged"] += len(accepted) - len(creates) - len(updates)
+
+
+def _chunks(
+    rows: Iterable[dict[str, Any] | str], size: int
+) -> Iterator[list[tuple[int, dict[str, Any] | str]]]:
+    numbered = enumerate(rows, start=1)
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+
+def import_products(
+    db: Session,
+    stream: IO[bytes],
+    fmt: ImportFormat,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """Upsert products from ``stream`` and return the import report."""
+    report: dict[str, Any] = {
+        "created": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "errors": [],
+    }
+    seen: dict[str, int] = {}
+    for chunk in _chunks(read_rows(stream, fmt), chunk_size):
+        _import_chunk(db, chunk, report, seen)
+
+    if report["created"] or report["updated"]:
+        report["catalog_version"] = bump_catalog_version(db)
+        db.commit()
+    else:
+        report["catalog_version"] = get_catalog_version(db)
+
+    report["failed"] = len(report["errors"])
+    return report
@@ -0,0 +1,263 @@
+"""Product view and sales counters, trending scores and automatic badges.
+
+Routes call ``product_counters.record_view`` / ``record_sale``; counts are
+summed in memory and a background thread writes them every
+``PRODUCT_STATS_FLUSH_INTERVAL`` seconds, one upsert per table however many
+requests were counted. The totals and the trending score are columns of
+``products``, indexed with ``is_active`` so ``sort=popular`` and
+``sort=trending`` read pages straight off an index;
+``product_stats_hourly`` holds one bucket per product and hour.
+
+The trending score is a sliding window over the hourly buckets: activity in
+the current hour counts in full and fades linearly to nothing after
+``TRENDING_WINDOW_HOURS``. A flush rescores the products it touched;
+``python -m app.product_stats`` rescores everything (scores also fade when
+nothing happens), drops buckets that left the window, recounts sales from
+``orders`` (cancellations, counts lost with a killed process) and, with
+``--badges``, sets the "bestseller" and "popular" badges.
+
+Counts still in memory when a process dies are lost; views are approximate.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, Product, ProductStatsHourly
+from app.utils.catalog import bump_catalog_version
+
+logger = logging.getLogger(__name__)
+
+BESTSELLER_BADGE = "bestseller"
+POPULAR_BADGE = "popular"
+
+
+def current_hour(now: datetime | None = None) -> int:
+    """Hours since the Unix epoch, the ``product_stats_hourly`` bucket key."""
+    return int((now or datetime.now(UTC)).timestamp() // 3600)
+
+
+class ProductCounters:
+    """Count product views and sales in memory and write them in batches."""
+
+    def __init__(
+        self, session_factory: Callable[[], Session], flush_interval: float = 30.0
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+
+        # (product_id, hour) -> [views, sales]
+        self._counts: defaultdict[tuple[int, int], list[int]] = defaultdict(
+            lambda: [0, 0]
+        )
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record_view(self, product_id: int) -> None:
+        with self._lock:
+            self._counts[product_id, current_hour()][0] += 1
+
+    def record_sale(self, product_id: int) -> None:
+        with self._lock:
+            self._counts[product_id, current_hour()][1] += 1
+
+    def start(self) -> None:
+        """Start the flush thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="product-counters", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the flush thread after a final flush."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything counted so far; returns the number of buckets."""
+        with self._flush_lock:
+            with self._lock:
+                counts = self._counts
+                self._counts = defaultdict(lambda: [0, 0])
+            if not counts:
+                return 0
+            try:
+                with self.session_factory() as db:
+                    apply_counts(db, counts)
+                    db.commit()
+            except Exception:
+                # Keep the counts for the next flush.
+                logger.exception("Failed to write %d product counters", len(counts))
+                with self._lock:
+                    for key, (views, sales) in counts.items():
+                        self._counts[key][0] += views
+                        self._counts[key][1] += sales
+                return 0
+            return len(counts)
+
+
+def apply_counts(
+    db: Session, counts: dict[tuple[int, int], list[int]], now: datetime | None = None
+) -> None:
+    """Add ``(product_id, hour) -> [views, sales]`` counts; the caller commits."""
+    totals: defaultdict[int, list[int]] = defaultdict(lambda: [0, 0])
+    for (product_id, _), (views, sales) in counts.items():
+        totals[product_id][0] += views
+        totals[product_id][1] += sales
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    hourly = dialect.insert(ProductStatsHourly)
+    hourly = hourly.on_conflict_do_update(
+        index_elements=["product_id", "hour"],
+        set_={
+            "views": ProductStatsHourly.views + hourly.excluded.views,
+            "sales": ProductStatsHourly.sales + hourly.excluded.sales,
+        },
+    )
+    db.execute(
+        hourly,
+        [
+            {"product_id": product_id, "hour": hour, "views": views, "sales": sales}
+            for (product_id, hour), (views, sales) in counts.items()
+        ],
+    )
+
+    products = Product.__table__
+    db.execute(
+        products.update()
+        .where(products.c.id == bindparam("product_id"))
+        .values(
+            view_count=products.c.view_count + bindparam("views"),
+            sales_count=products.c.sales_count + bindparam("sales"),
+        ),
+        [
+            {"product_id": product_id, "views": views, "sales": sales}
+            for product_id, (views, sales) in totals.items()
+        ],
+    )
+    update_trending_scores(db, list(totals), now)
+
+
+def update_trending_scores(
+    db: Session,
+    product_ids: Iterable[int] | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Recompute trending scores of ``product_ids`` (default: all products).
+
+    The caller commits. Returns the number of products with a score.
+    """
+    window = settings.TRENDING_WINDOW_HOURS
+    hour = current_hour(now)
+    hourly = ProductStatsHourly
+    # 1.0 in the current hour down to 1/window in the oldest one
+    weight = (window - (hour - hourly.hour)) * (1.0 / window)
+    activity = hourly.views + hourly.sales * settings.TRENDING_SALE_WEIGHT
+    scores = select(hourly.product_id, func.sum(activity * weight)).where(
+        hourly.hour > hour - window
+    )
+    reset = update(Product).where(Product.trending_score != 0)
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        scores = scores.where(hourly.product_id.in_(product_ids))
+        reset = reset.where(Product.id.in_(product_ids))
+
+    rows = [
+        {"id": product_id, "trending_score": score}
+        for product_id, score in db.execute(scores.group_by(hourly.product_id))
+    ]
+    db.execute(reset.values(trending_score=0))
+    if rows:
+        db.execute(update(Product), rows)
+    return len(rows)
+
+
+def prune_hourly_stats(db: Session, now: datetime | None = None) -> int:
+    """Delete buckets that left the trending window; the caller commits."""
+    cutoff = current_hour(now) - settings.TRENDING_WINDOW_HOURS
+    result = db.execute(
+        delete(ProductStatsHourly).where(ProductStatsHourly.hour <= cutoff)
+    )
+    return result.rowcount
+
+
+def recount_sales(db: Session) -> int:
+    """Set sales counts to each product's non-cancelled orders.
+
+    The caller commits. Returns the number of products whose count changed.
+    """
+    sales = dict(
+        db.execute(
+            select(Order.product_id, func.count(Order.id))
+            .where(Order.status != "cancelled")
+            .group_by(Order.product_id)
+        ).all()
+    )
+    rows = [
+        {"id": product_id, "sales_count": sales.get(product_id, 0)}
+        for product_id, current in db.execute(select(Product.id, Product.sales_count))
+        if current != sales.get(product_id, 0)
+    ]
+    if rows:
+        db.execute(update(Product), rows)
+    return len(rows)
+
+
+def assign_badges(
+    db: Session,
+    min_sales: int | None = None,
+    min_trending: float | None = None,
+) -> int:
+    """Set "bestseller" and "popular" from the thresholds; other badges stay.
+
+    Bumps the catalog version when a badge changes; the caller commits.
+    Returns the number of products changed.
+    """
+    min_sales = settings.BADGE_BESTSELLER_MIN_SALES if min_sales is None else min_sales
+    if min_trending is None:
+        min_trending = settings.BADGE_POPULAR_MIN_TRENDING
+    rows = db.execute(
+        select(Product.id, Product.badges, Product.sales_count, Product.trending_score)
+    )
+    changes = []
+    for product_id, badges, sales, trending in rows:
+        current = list(badges or [])
+        wanted = [b for b in current if b not in (BESTSELLER_BADGE, POPULAR_BADGE)]
+        if sales >= min_sales:
+            wanted.append(BESTSELLER_BADGE)
+        if trending >= min_trending:
+            wanted.append(POPULAR_BADGE)
+        if sorted(wanted) != sorted(current):
+            changes.append({"id": product_id, "badges": wanted or None})
+
+    if changes:
+        db.execute(update(Product), changes)
+        bump_catalog_version(db)
+    return len(changes)
+
+
+product_counters = ProductCounters(
+    SessionLocal, flush_interval=settings.PRODUCT_STATS_FLUSH_INTERVAL
+)
@@ -0,0 +1,167 @@
+"""Daily sales rollups.
+
+``sales_daily``, ``sales_daily_category`` and ``sales_daily_product`` count
+orders by the UTC day they were created and their current status, with
+revenue at the product price. Order writes call ``apply_sales_deltas`` in
+their own transaction: a new order adds one to its day's ``pending`` row, a
+status change moves it from the old status to the new one. Every change is
+one upsert per table, however many orders it touches.
+
+Revenue is taken at the product's price when the change is recorded, so
+after repricing (or after loading orders outside the API, e.g. with
+``app.datagen``) run ``python -m app.sales_rollup`` to rebuild the rollups
+from ``orders``.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Order,
+    Product,
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+)
+
+
+class SalesDelta(NamedTuple):
+    day: date
+    status: str
+    product_id: int
+    category: str
+    price_idr: int
+    orders: int  # +1 or -1
+
+
+def order_day(created_at: datetime | None) -> date:
+    """UTC day an order counts towards (today while it is being created)."""
+    if created_at is None:
+        return datetime.now(UTC).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC)
+    return created_at.date()
+
+
+def order_created(day: date, status: str, product: Product) -> list[SalesDelta]:
+    return [SalesDelta(day, status, product.id, product.category, product.price_idr, 1)]
+
+
+def status_changed(
+    day: date,
+    old_status: str,
+    new_status: str,
+    product_id: int,
+    category: str,
+    price_idr: int,
+) -> list[SalesDelta]:
+    if old_status == new_status:
+        return []
+    return [
+        SalesDelta(day, old_status, product_id, category, price_idr, -1),
+        SalesDelta(day, new_status, product_id, category, price_idr, 1),
+    ]
+
+
+def apply_sales_deltas(db: Session, deltas: Iterable[SalesDelta]) -> None:
+    """Add ``deltas`` to the rollups; the caller commits."""
+    daily: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    by_category: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    by_product: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    categories: dict[int, str] = {}
+    for delta in deltas:
+        revenue = delta.orders * delta.price_idr
+        for totals in (
+            daily[delta.day, delta.status],
+            by_category[delta.day, delta.status, delta.category],
+            by_product[delta.day, delta.status, delta.product_id],
+        ):
+            totals[0] += delta.orders
+            totals[1] += revenue
+        categories[delta.product_id] = delta.category
+
+    _upsert(db, SalesDaily, _rows(("day", "status"), daily))
+    _upsert(db, SalesDailyCategory, _rows(("day", "status", "category"), by_category))
+    product_rows = _rows(("day", "status", "product_id"), by_product)
+    for row in product_rows:
+        row["category"] = categories[row["product_id"]]
+    _upsert(db, SalesDailyProduct, product_rows)
+
+
+def _rows(keys: tuple[str, ...], totals: dict[tuple, list[int]]) -> list[dict]:
+    # One row per primary key: PostgreSQL rejects a multi-row upsert that
+    # touches the same row twice.
+    return [
+        {**dict(zip(keys, key, strict=True)), "orders": orders, "revenue_idr": revenue}
+        for key, (orders, revenue) in totals.items()
+        if orders or revenue
+    ]
+
+
+def _upsert(db: Session, model: type, rows: list[dict]) -> None:
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key],
+        set_={
+            "orders": model.orders + statement.excluded.orders,
+            "revenue_idr": model.revenue_idr + statement.excluded.revenue_idr,
+        },
+    )
+    db.execute(statement, rows)
+
+
+def rebuild_sales_rollups(db: Session) -> dict[str, int]:
+    """Recompute every rollup from ``orders`` in one transaction."""
+    for model in (SalesDaily, SalesDailyCategory, SalesDailyProduct):
+        db.execute(delete(model))
+
+    day = func.date(Order.created_at)
+    db.execute(
+        insert(SalesDailyProduct).from_select(
+            ["day", "status", "product_id", "category", "orders", "revenue_idr"],
+            select(
+                day,
+                Order.status,
+                Order.product_id,
+                Product.category,
+                func.count(Order.id),
+                func.sum(Product.price_idr),
+            )
+            .join(Product, Order.product_id == Product.id)
+            .where(Order.created_at.is_not(None))
+            .group_by(day, Order.status, Order.product_id, Product.category),
+        )
+    )
+    # The coarser rollups are sums of the product rollup.
+    for model, keys in (
+        (SalesDailyCategory, ("day", "status", "category")),
+        (SalesDaily, ("day", "status")),
+    ):
+        columns = [getattr(SalesDailyProduct, key) for key in keys]
+        db.execute(
+            insert(model).from_select(
+                [*keys, "orders", "revenue_idr"],
+                select(
+                    *columns,
+                    func.sum(SalesDailyProduct.orders),
+                    func.sum(SalesDailyProduct.revenue_idr),
+                ).group_by(*columns),
+            )
+        )
+    db.commit()
+
+    return {
+        model.__tablename__: db.execute(
+            select(func.count()).select_from(model)
+        ).scalar()
+        for model in (SalesDaily, SalesDailyCategory, SalesDailyProduct)
+    }
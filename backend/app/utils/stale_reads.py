@@ -0,0 +1,144 @@
+"""Serve the last good catalog response while the database is slow or locked.
+
+Catalog reads render their JSON body with a session of their own and keep
+the result per URL (path and sorted query string). When no render of the URL
+is running, the request renders it on its own thread, like an uncached
+read; if that render fails because the database is locked, the request is
+answered with the last good body for its URL instead, marked with ``Age``
+and ``Warning: 110 - "Response is Stale"``. Other errors are raised.
+
+There is one render per URL at a time: requests arriving while it runs wait
+for it up to ``CATALOG_READ_BUDGET`` seconds and are then answered with the
+last good body, instead of queueing more queries behind the lock. Renders of
+different URLs never wait on each other. Bodies older than
+``CATALOG_STALE_MAX_AGE`` seconds are not served.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, TypeVar
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STALE_WARNING = '110 - "Response is Stale"'
+
+T = TypeVar("T")
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """SQLite "database is locked"/"busy", or a Postgres lock timeout."""
+    if not isinstance(exc, OperationalError):
+        return False
+    message = str(exc.orig).lower()
+    return "locked" in message or "busy" in message or "lock timeout" in message
+
+
+def json_response(body: bytes, age: float | None) -> Response:
+    """JSON response for a body from ``StaleWhileRevalidate.read``."""
+    response = Response(body, media_type="application/json")
+    if age is not None:
+        response.headers["Age"] = str(int(age))
+        response.headers["Warning"] = STALE_WARNING
+    return response
+
+
+class StaleWhileRevalidate:
+    """Last good values per key, refreshed by at most one render per key."""
+
+    def __init__(
+        self, budget: float = 0.5, max_age: float = 600.0, max_entries: int = 2048
+    ):
+        self.budget = budget
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # key -> (value, monotonic time it was rendered)
+        self._values: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._renders: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, render: Callable[[], T]) -> tuple[T, float | None]:
+        """``(value, age)``: age is None for a fresh value, else its seconds."""
+        with self._lock:
+            stored = self._values.get(key)
+            if stored is not None and time.monotonic() - stored[1] > self.max_age:
+                stored = None
+            future = self._renders.get(key)
+            started = future is None
+            if started:
+                future = Future()
+                self._renders[key] = future
+
+        if started:  # no render running: render on this thread
+            self._render(key, render, future)
+        try:
+            timeout = None if started or stored is None else self.budget
+            return future.result(timeout=timeout), None
+        except FutureTimeout:
+            pass
+        except Exception as exc:
+            if stored is None or not is_lock_error(exc):
+                raise
+        value, rendered_at = stored
+        return value, time.monotonic() - rendered_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _render(self, key: str, render: Callable[[], T], future: Future) -> None:
+        try:
+            value = render()
+        except BaseException as exc:
+            with self._lock:
+                self._renders.pop(key, None)
+            future.set_exception(exc)
+            return
+        with self._lock:
+            self._values[key] = (value, time.monotonic())
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+            self._renders.pop(key, None)
+        future.set_result(value)
+
+    def read(
+        self, request: Request, db: Session, render: Callable[[Session], T]
+    ) -> tuple[T, float | None]:
+        """``(value, age)`` of ``request``, rendered with a session on ``db``'s bind."""
+        query = urlencode(sorted(request.query_params.multi_items()))
+        key = f"{request.url.path}?{query}"
+        bind = db.get_bind()
+
+        def render_value() -> T:
+            with Session(bind=bind) as session:
+                return render(session)
+
+        value, age = self.get(key, render_value)
+        if age is not None:
+            logger.warning("Serving %s from %.0fs ago", key, age)
+        return value, age
+
+    def response(
+        self, request: Request, db: Session, render: Callable[[Session], bytes]
+    ) -> Response:
+        """JSON response for ``request`` whose ``render`` returns the body."""
+        return json_response(*self.read(request, db, render))
+
+
+catalog_reads = StaleWhileRevalidate(
+    budget=settings.CATALOG_READ_BUDGET,
+    max_age=settings.CATALOG_STALE_MAX_AGE,
+    max_entries=settings.CATALOG_STALE_MAX_ENTRIES,
+)
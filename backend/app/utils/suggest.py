@@ -0,0 +1,218 @@
+"""Typeahead suggestions from an in-memory index of active products.
+
+The index is built from the titles and slugs of active products and answers
+``GET /api/products/suggest`` without a database query:
+
+- Every word of a product is indexed under each of its prefixes, so a query
+  whose words each start a word of the product ("gold sca" for "Gold
+  Scalper EA") is one dict lookup plus a check of a few candidates.
+- When the prefixes match fewer than ``limit`` products, words are compared
+  by trigrams instead, which tolerates typos ("scalpr", "gld scalper").
+
+Prefix matches come first, best sellers first; trigram matches follow by
+similarity. The index is replaced when the catalog changes: at once after a
+product write in this process (``on_catalog_change``), otherwise when the
+catalog version, checked at most every ``SUGGEST_VERSION_CHECK_INTERVAL``
+seconds, has moved.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from math import ceil
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Product
+from app.utils.catalog import get_catalog_version, on_catalog_change
+
+# Longer query words are looked up by this prefix, then checked in full.
+MAX_PREFIX_LENGTH = 12
+
+# Shorter query words must match by prefix; one typo leaves them no signal.
+MIN_FUZZY_LENGTH = 3
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercase ASCII words of ``text``, accents removed."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return _WORD.findall(text.encode("ascii", "ignore").decode())
+
+
+def trigrams(word: str, partial: bool = False) -> set[str]:
+    """Padded trigrams of a word; ``partial`` words have no end marker."""
+    padded = f"  {word}" if partial else f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestIndex:
+    """Immutable prefix and trigram index over a list of products."""
+
+    def __init__(self, products: list[dict], version: int = 0):
+        """``products`` are response items with ``title`` and ``slug``, best first."""
+        self.version = version
+        self.items = products
+        self.words: list[frozenset[str]] = []
+        self.word_trigrams: list[frozenset[str]] = []
+        self.prefixes: defaultdict[str, list[int]] = defaultdict(list)
+        self.trigrams: defaultdict[str, list[int]] = defaultdict(list)
+
+        for position, product in enumerate(products):
+            words = frozenset(
+                normalize_words(product["title"])
+                + normalize_words(product["slug"].replace("-", " "))
+            )
+            self.words.append(words)
+            prefixes = {
+                word[:length]
+                for word in words
+                for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1)
+            }
+            for prefix in prefixes:
+                self.prefixes[prefix].append(position)
+            product_trigrams = frozenset().union(*map(trigrams, words))
+            self.word_trigrams.append(product_trigrams)
+            for trigram in product_trigrams:
+                self.trigrams[trigram].append(position)
+
+    def suggest(self, query: str, limit: int) -> list[dict]:
+        """Up to ``limit`` products matching ``query``, best first."""
+        terms = normalize_words(query)
+        if not terms:
+            return []
+        matches = self._prefix_matches(terms, limit)
+        if len(matches) < limit:
+            matches += self._fuzzy_matches(terms, limit - len(matches), set(matches))
+        return [self.items[position] for position in matches]
+
+    def _prefix_matches(self, terms: list[str], limit: int) -> list[int]:
+        postings = []
+        for term in terms:
+            posting = self.prefixes.get(term[:MAX_PREFIX_LENGTH])
+            if posting is None:
+                return []
+            postings.append(posting)
+
+        # Walk the shortest posting list in rank order and check the other
+        # terms against the candidate's own words.
+        shortest = min(range(len(terms)), key=lambda index: len(postings[index]))
+        others = [term for index, term in enumerate(terms) if index != shortest]
+        long_term = len(terms[shortest]) > MAX_PREFIX_LENGTH
+        matches = []
+        for position in postings[shortest]:
+            words = self.words[position]
+            if long_term and not _has_prefix(words, terms[shortest]):
+                continue
+            if all(_has_prefix(words, term) for term in others):
+                matches.append(position)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def _fuzzy_matches(
+        self, terms: list[str], limit: int, exclude: set[int]
+    ) -> list[int]:
+        wanted: set[str] = set()
+        short = []
+        for index, term in enumerate(terms):
+            if len(term) >= MIN_FUZZY_LENGTH:
+                wanted |= trigrams(term, partial=index == len(terms) - 1)
+            else:
+                short.append(term)
+        if not wanted:
+            return []
+
+        # A product sharing ``needed`` of the wanted trigrams has at least one
+        # of the ``len(wanted) - needed + 1`` rarest, so only their postings
+        # are read; common trigrams like "  s" never are.
+        needed = ceil(len(wanted) * settings.SUGGEST_MIN_SIMILARITY)
+        rarest = sorted(wanted, key=lambda trigram: len(self.trigrams.get(trigram, ())))
+        candidates = set().union(
+            *(
+                self.trigrams.get(trigram, ())
+                for trigram in rarest[: len(wanted) - needed + 1]
+            )
+        )
+        scored = []
+        for position in candidates - exclude:
+            count = len(wanted & self.word_trigrams[position])
+            if count >= needed and all(
+                _has_prefix(self.words[position], term) for term in short
+            ):
+                scored.append((-count, position))
+        scored.sort()
+        return [position for _, position in scored[:limit]]
+
+
+def _has_prefix(words: frozenset[str], term: str) -> bool:
+    return any(word.startswith(term) for word in words)
+
+
+def build_suggest_index(db: Session) -> SuggestIndex:
+    """Index the active products, best sellers first."""
+    # Read the version first: a write committed meanwhile bumps it again.
+    version = get_catalog_version(db)
+    rows = db.execute(
+        select(
+            Product.id,
+            Product.slug,
+            Product.title,
+            Product.category,
+            Product.price_idr,
+            Product.images,
+        )
+        .where(Product.is_active)
+        .order_by(Product.sales_count.desc(), Product.id.desc())
+    )
+    products = []
+    for row in rows:
+        product = row._asdict()
+        images = product.pop("images")
+        product["image"] = images[0] if images else None
+        products.append(product)
+    return SuggestIndex(products, version)
+
+
+class ProductSuggestions:
+    """The current SuggestIndex, rebuilt when the catalog version moves."""
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._index: SuggestIndex | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def invalidate(self, version: int | None = None) -> None:
+        """Check the catalog version on the next request."""
+        self._checked_at = float("-inf")
+
+    def index(self, db: Session) -> SuggestIndex:
+        """The index, refreshed first if a version check is due.
+
+        While one request rebuilds, others keep using the previous index.
+        """
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._index
+        if not self._lock.acquire(blocking=self._index is None):
+            return self._index
+        try:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                index = self._index
+                if index is None or index.version != get_catalog_version(db):
+                    self._index = build_suggest_index(db)
+                self._checked_at = time.monotonic()
+            return self._index
+        finally:
+            self._lock.release()
+
+
+product_suggestions = ProductSuggestions(
+    check_interval=settings.SUGGEST_VERSION_CHECK_INTERVAL
+)
+on_catalog_change(product_suggestions.invalidate)
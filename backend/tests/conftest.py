@@ -10,9 +10,12 @@ from sqlalchemy.pool import StaticPool
 
 # Set environment to development for tests (allows insecure defaults)
 os.environ["ENVIRONMENT"] = "development"
+# Write activity rows in the request transaction so tests can read them back
+os.environ["ACTIVITY_WRITER_MODE"] = "sync"
 
 from app.database import Base, get_db
 from app.main import app
+from app.utils.loading import enable_strict_loading
 
 # Create in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -24,6 +27,9 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Fail tests on implicit relationship lazy loads (N+1 queries)
+enable_strict_loading(TestingSessionLocal, "raise")
+
 
 def override_get_db():
     """Override database dependency with test database."""
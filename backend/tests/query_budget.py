@@ -0,0 +1,75 @@
+"""Query-count budget helpers for tests.
+
+``assert_max_queries`` fails when a block issues more SQL statements than its
+budget. ``assert_queries_constant`` runs a request at several row counts and
+fails when the query count grows with N, which is how an N+1 shows up.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_SCALE = (1, 10, 100)
+
+
+class QueryCounter:
+    """Record every SQL statement executed on an engine while active."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"{i}. {sql}" for i, sql in enumerate(self.statements, 1))
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, limit: int) -> Iterator[QueryCounter]:
+    """Fail if the block executes more than ``limit`` SQL statements."""
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(
+            f"{counter.count} queries executed, budget is {limit}:\n" + counter.report()
+        )
+
+
+def assert_queries_constant(
+    engine: Engine,
+    make_request: Callable[[int], Callable[[], object]],
+    limit: int,
+    scale: Iterable[int] = DEFAULT_SCALE,
+) -> dict[int, int]:
+    """Check that an endpoint's query count does not grow with its row count.
+
+    ``make_request(n)`` seeds ``n`` rows and returns a zero-argument callable
+    that performs the request. Only the request itself is counted.
+    """
+    counts = {}
+    for n in scale:
+        request = make_request(n)
+        with QueryCounter(engine) as counter:
+            request()
+        counts[n] = counter.count
+    over_budget = {n: c for n, c in counts.items() if c > limit}
+    if over_budget:
+        raise AssertionError(f"query budget of {limit} exceeded: {over_budget}")
+    if len(set(counts.values())) > 1:
+        raise AssertionError(f"query count grows with row count: {counts}")
+    return counts
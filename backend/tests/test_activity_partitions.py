@@ -0,0 +1,175 @@
+"""Tests for the month-partitioned activity log."""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import inspect, select
+
+from app.models import ActivityLog, ActivityPartition, User
+from app.utils.activity_partitions import (
+    archive_partitions,
+    customer_timeline,
+    partition_table,
+    roll_partitions,
+)
+from tests.conftest import TestingSessionLocal, engine
+from tests.query_budget import assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def drop_partitions():
+    """Keep partitions from leaking into other tests' timelines."""
+    yield
+    with TestingSessionLocal() as db:
+        for partition in db.query(ActivityPartition):
+            partition_table(partition.month).drop(db.connection(), checkfirst=True)
+            db.delete(partition)
+        db.commit()
+
+
+def _customer(db, marker: str, timestamps: list[datetime]) -> User:
+    user = User(email=f"{marker}@example.com", password_hash="not-used")
+    db.add(user)
+    db.flush()
+    db.add_all(
+        ActivityLog(
+            customer_id=user.id,
+            type="note_added",
+            reference_id=f"{marker}-{index}",
+            created_at=created_at,
+        )
+        for index, created_at in enumerate(timestamps)
+    )
+    db.commit()
+    return user
+
+
+def _at(year: int, month: int, day: int) -> datetime:
+    return datetime(year, month, day, 12, tzinfo=UTC)
+
+
+def test_roll_moves_closed_months_into_partitions(client, auth_headers, db_session):
+    """Test that closed months leave activity_logs but stay in the timeline."""
+    user = _customer(
+        db_session,
+        "partition-roll",
+        [_at(2021, 1, 5), _at(2021, 1, 20), _at(2021, 2, 3), _at(2021, 3, 10)],
+    )
+
+    moved = roll_partitions(db_session, hot_months=1, now=_at(2021, 3, 15))
+    assert moved == {"2021-01": 2, "2021-02": 1}
+    assert inspect(engine).has_table("activity_logs_202101")
+    hot = db_session.query(ActivityLog).filter_by(customer_id=user.id).all()
+    assert [log.reference_id for log in hot] == ["partition-roll-3"]
+    assert db_session.get(ActivityPartition, "2021-01").row_count == 2
+
+    response = client.get(
+        f"/api/admin/customers/{user.id}/activity", headers=auth_headers
+    )
+    assert [item["reference_id"] for item in response.json()] == [
+        "partition-roll-3",
+        "partition-roll-2",
+        "partition-roll-1",
+        "partition-roll-0",
+    ]
+
+    # Pages continue from the last item's created_at and id.
+    third = db_session.execute(select(partition_table("2021-02").c.id)).scalar_one()
+    response = client.get(
+        f"/api/admin/customers/{user.id}/activity",
+        headers=auth_headers,
+        params={"limit": 2, "before": "2021-02-03T12:00:00Z", "before_id": third},
+    )
+    assert [item["reference_id"] for item in response.json()] == [
+        "partition-roll-1",
+        "partition-roll-0",
+    ]
+
+    summary = client.get(f"/api/admin/customers/{user.id}", headers=auth_headers)
+    assert summary.json()["last_activity"].startswith("2021-03-10")
+
+
+def test_timeline_pages_through_equal_timestamps(db_session):
+    """Test that events sharing a created_at are split across pages, not lost."""
+    same = _at(2024, 5, 1)
+    user = _customer(db_session, "partition-ties", [same, same, same, same])
+    roll_partitions(db_session, hot_months=1, now=_at(2024, 6, 15))
+
+    first = customer_timeline(db_session, user.id, limit=3)
+    last = first[-1]
+    rest = customer_timeline(
+        db_session, user.id, limit=3, before=last["created_at"], before_id=last["id"]
+    )
+    seen = [item["reference_id"] for item in first + rest]
+    assert sorted(seen) == [f"partition-ties-{index}" for index in range(4)]
+    assert customer_timeline(db_session, user.id) == first + rest
+
+
+def test_timeline_cursor_with_utc_offset(db_session):
+    """Test that a +07:00 cursor pages by instant, in the hot table and partitions."""
+    hours = [_at(2024, 5, 1) + timedelta(hours=offset) for offset in range(3)]
+    user = _customer(db_session, "partition-offset", [*hours, _at(2024, 6, 1)])
+    roll_partitions(db_session, hot_months=1, now=_at(2024, 6, 15))
+    items = customer_timeline(db_session, user.id)
+    cursor = items[2]  # 2024-05-01 13:00 UTC
+    assert cursor["reference_id"] == "partition-offset-1"
+
+    jakarta = timezone(timedelta(hours=7))
+    older = customer_timeline(
+        db_session,
+        user.id,
+        before=hours[1].astimezone(jakarta),
+        before_id=cursor["id"],
+    )
+    assert [item["reference_id"] for item in older] == ["partition-offset-0"]
+
+    newer_first = customer_timeline(
+        db_session, user.id, limit=1, before=_at(2024, 6, 2).astimezone(jakarta)
+    )
+    assert [item["reference_id"] for item in newer_first] == ["partition-offset-3"]
+
+
+def test_timeline_skips_partitions_it_does_not_need(db_session):
+    """Test that a page filled by newer months does not read older partitions."""
+    user = _customer(
+        db_session,
+        "partition-skip",
+        [_at(2022, 1, 5), _at(2022, 2, 5), _at(2022, 2, 6), _at(2022, 3, 5)],
+    )
+    customer_id = user.id
+    roll_partitions(db_session, hot_months=1, now=_at(2022, 3, 15))
+
+    # Hot table, partition registry, then only the 2022-02 partition.
+    with assert_max_queries(engine, 3):
+        items = customer_timeline(db_session, customer_id, limit=3)
+    assert [item["reference_id"] for item in items] == [
+        "partition-skip-3",
+        "partition-skip-2",
+        "partition-skip-1",
+    ]
+
+
+def test_archive_writes_gzip_ndjson_and_drops_partition(db_session, tmp_path):
+    """Test that expired partitions are archived, dropped and left out of reads."""
+    user = _customer(
+        db_session, "partition-archive", [_at(2023, 1, 5), _at(2023, 2, 5)]
+    )
+    roll_partitions(db_session, hot_months=1, now=_at(2023, 3, 1))
+
+    paths = archive_partitions(
+        db_session, retention_months=2, archive_dir=tmp_path, now=_at(2023, 3, 1)
+    )
+    archive_path = tmp_path / "activity_logs_202301.ndjson.gz"
+    assert archive_path in paths
+    assert tmp_path / "activity_logs_202302.ndjson.gz" not in paths
+    assert not inspect(engine).has_table("activity_logs_202301")
+    with gzip.open(archive_path, "rt") as archive:
+        archived = [json.loads(line) for line in archive]
+    assert [row["reference_id"] for row in archived] == ["partition-archive-0"]
+
+    partition = db_session.get(ActivityPartition, "2023-01")
+    assert partition.archived_at is not None
+    items = customer_timeline(db_session, user.id, limit=10)
+    assert [item["reference_id"] for item in items] == ["partition-archive-1"]
@@ -0,0 +1,168 @@
+"""Tests for the batched activity log writer."""
+
+import time
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import ActivityLog
+from app.utils import activity
+from app.utils.activity import ActivityWriter, log_activity
+from tests.conftest import TestingSessionLocal
+
+
+def _event(kind: str, index: int = 0) -> dict:
+    return {
+        "customer_id": 1,
+        "type": kind,
+        "reference_id": f"REF-{index}",
+        "metadata_json": {"index": index},
+        "created_at": datetime.now(UTC),
+    }
+
+
+def _count(kind: str) -> int:
+    with TestingSessionLocal() as db:
+        return db.query(ActivityLog).filter(ActivityLog.type == kind).count()
+
+
+def _wait_for(kind: str, expected: int, timeout: float = 2.0) -> int:
+    deadline = time.monotonic() + timeout
+    while (count := _count(kind)) < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return count
+
+
+def _crash(writer: ActivityWriter) -> None:
+    """Stop a writer like a killed process would: no flush, lock released."""
+    with writer._wakeup:
+        writer._closing = True
+        writer._wakeup.notify()
+    writer._thread.join()
+    writer._spool.close()
+    writer._lock_file.close()
+
+
+@pytest.fixture
+def make_writer(tmp_path):
+    writers = []
+
+    def make(**options) -> ActivityWriter:
+        options = {"batch_size": 100, "flush_interval": 60.0, **options}
+        writer = ActivityWriter(TestingSessionLocal, tmp_path, **options)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        if writer._lock_file is not None and not writer._lock_file.closed:
+            writer.close()
+
+
+def test_flushes_when_batch_is_full(make_writer):
+    """Test that reaching the batch size triggers a multi-row insert."""
+    writer = make_writer(batch_size=3)
+    writer.enqueue([_event("writer_size", i) for i in range(2)])
+    time.sleep(0.05)
+    assert _count("writer_size") == 0
+
+    writer.enqueue([_event("writer_size", 2)])
+    assert _wait_for("writer_size", 3) == 3
+
+
+def test_flushes_after_interval(make_writer):
+    """Test that a partial batch is written once the interval passes."""
+    writer = make_writer(flush_interval=0.05)
+    writer.enqueue([_event("writer_interval")])
+    assert _wait_for("writer_interval", 1) == 1
+
+
+def test_close_flushes_and_cleans_spool(make_writer):
+    """Test that closing the writer inserts queued events and removes its files."""
+    writer = make_writer()
+    writer.enqueue([_event("writer_close", i) for i in range(5)])
+    writer.close()
+    assert _count("writer_close") == 5
+    spool_dir = writer.spool_dir
+    assert not any(spool_dir.glob("*.spool")) and not any(spool_dir.glob("*.flushing"))
+
+
+def test_spooled_events_survive_a_crash(make_writer):
+    """Test that a new writer replays events a dead writer never flushed."""
+    crashed = make_writer()
+    crashed.enqueue([_event("writer_crash", i) for i in range(4)])
+    _crash(crashed)
+    assert _count("writer_crash") == 0
+
+    survivor = make_writer()
+    assert survivor.recover() == 4
+    assert _count("writer_crash") == 4
+    assert not any(survivor.spool_dir.glob(f"{crashed._token}.*"))
+
+
+def test_spool_is_only_replayed_into_its_database(make_writer, tmp_path):
+    """Test that a writer for another database leaves the spool alone."""
+    crashed = make_writer()
+    crashed.enqueue([_event("writer_other_db", i) for i in range(2)])
+    _crash(crashed)
+
+    other_engine = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    other = ActivityWriter(sessionmaker(bind=other_engine), tmp_path)
+    assert other.spool_dir != crashed.spool_dir
+    other.start()
+    assert other.recover() == 0
+    other.close()
+    other_engine.dispose()
+    assert _count("writer_other_db") == 0
+
+    assert make_writer().recover() == 2
+    assert _count("writer_other_db") == 2
+
+
+def test_torn_spool_lines_are_skipped(make_writer):
+    """Test that a line cut short by a crash does not stop the writer."""
+    writer = make_writer(flush_interval=0.05)
+    writer.spool_dir.mkdir(parents=True)
+    good = activity._encode(_event("writer_torn"))
+    (writer.spool_dir / "1-dead.spool").write_text(good + "\n" + good[:25])
+
+    assert writer.recover() == 1
+    assert not any(writer.spool_dir.glob("1-dead.*"))
+    writer.enqueue([_event("writer_torn", 1)])
+    assert _wait_for("writer_torn", 2) == 2
+
+
+def test_recovery_skips_live_writers(make_writer):
+    """Test that another running writer's spool is left alone."""
+    running = make_writer()
+    running.enqueue([_event("writer_live")])
+
+    other = make_writer()
+    other.start()
+    assert other.recover() == 0
+    running.close()
+    assert _count("writer_live") == 1
+
+
+def test_async_log_activity_waits_for_commit(make_writer, monkeypatch):
+    """Test that async events are queued on commit and dropped on rollback."""
+    writer = make_writer()
+    monkeypatch.setattr(settings, "ACTIVITY_WRITER_MODE", "async")
+    monkeypatch.setattr(activity, "activity_writer", writer)
+
+    with TestingSessionLocal() as db:
+        db.query(ActivityLog).count()  # the request's transaction is open
+        log_activity(db, 1, "writer_rollback")
+        db.rollback()
+        db.query(ActivityLog).count()
+        log_activity(db, 1, "writer_commit", reference_id="FXS-ASYNC1")
+        assert writer._queue == []
+        db.commit()
+
+    assert [event["type"] for event in writer._queue] == ["writer_commit"]
+    writer.flush()
+    assert _count("writer_commit") == 1
+    assert _count("writer_rollback") == 0
@@ -0,0 +1,111 @@
+"""Tests for bulk order status transitions."""
+
+from app.models import ActivityLog, Order, Product, User
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+
+def _seed(db, marker: str, count: int, status: str = "pending") -> list[Order]:
+    product = Product(
+        slug=f"{marker}-product",
+        title=f"{marker} Product",
+        description_short="Bulk status product",
+        price_idr=100000,
+        category="robot",
+    )
+    user = User(email=f"{marker}@example.com", password_hash="not-used")
+    orders = [
+        Order(
+            product=product,
+            user=user if index % 2 == 0 else None,
+            name="Bulk Customer",
+            email=f"{marker}@example.com",
+            whatsapp="081234567890",
+            status=status,
+        )
+        for index in range(count)
+    ]
+    db.add_all(orders)
+    db.commit()
+    return orders
+
+
+def test_bulk_status_requires_admin(client):
+    """Test that the bulk status endpoint requires an admin token."""
+    response = client.post(
+        "/api/orders/admin/bulk-status", json={"status": "confirmed", "order_ids": [1]}
+    )
+    assert response.status_code == 401
+
+
+def test_bulk_status_updates_and_reports_outcomes(client, auth_headers, db_session):
+    """Test per-order outcomes for updated, unchanged and unknown orders."""
+    orders = _seed(db_session, "bulk-outcomes", 3)
+    orders[2].status = "confirmed"
+    db_session.commit()
+    ids = [order.id for order in orders]
+    code = orders[1].order_code
+
+    response = client.post(
+        "/api/orders/admin/bulk-status",
+        headers=auth_headers,
+        json={
+            "status": "confirmed",
+            "order_ids": [ids[0], ids[2], 999999],
+            "order_codes": [code.lower(), "FXS-NOPE00"],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["updated"], data["unchanged"], data["not_found"]) == (2, 1, 2)
+    outcomes = {str(result["ref"]): result["outcome"] for result in data["results"]}
+    assert outcomes == {
+        str(ids[0]): "updated",
+        str(ids[2]): "unchanged",
+        "999999": "not_found",
+        code: "updated",
+        "FXS-NOPE00": "not_found",
+    }
+
+    db_session.expire_all()
+    assert {o.status for o in db_session.query(Order).filter(Order.id.in_(ids))} == {
+        "confirmed"
+    }
+    # Only the order linked to a user and actually changed gets an activity row.
+    logs = (
+        db_session.query(ActivityLog)
+        .filter(ActivityLog.reference_id.in_([o.order_code for o in orders]))
+        .all()
+    )
+    assert [log.reference_id for log in logs] == [orders[0].order_code]
+    assert logs[0].metadata_json == {"old_status": "pending", "new_status": "confirmed"}
+
+
+def test_bulk_status_validates_input(client, auth_headers):
+    """Test that invalid statuses and empty selections are rejected."""
+    response = client.post(
+        "/api/orders/admin/bulk-status",
+        headers=auth_headers,
+        json={"status": "shipped", "order_ids": [1]},
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/api/orders/admin/bulk-status",
+        headers=auth_headers,
+        json={"status": "confirmed"},
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_status_query_count_is_constant(client, auth_headers, db_session):
+    """Test that a hundred orders are updated with a fixed number of queries."""
+    orders = _seed(db_session, "bulk-budget", 100)
+    payload = {"status": "completed", "order_ids": [order.id for order in orders]}
+
+    # Select, update, activity insert and one upsert per sales rollup table.
+    with assert_max_queries(engine, 6):
+        response = client.post(
+            "/api/orders/admin/bulk-status", headers=auth_headers, json=payload
+        )
+    assert response.json()["updated"] == 100
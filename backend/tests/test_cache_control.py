@@ -0,0 +1,67 @@
+"""Tests for per-route Cache-Control policies."""
+
+from typing import get_args
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app import routers
+from app.auth import oauth2_scheme
+from app.cache_control import policy_for
+from app.main import app
+
+# Response fields that identify or contact a person
+PII_FIELDS = {"email", "name", "full_name", "whatsapp", "notes", "password_hash"}
+
+
+def _field_names(annotation) -> set[str]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        names = set(annotation.model_fields)
+        for field in annotation.model_fields.values():
+            names |= _field_names(field.annotation)
+        return names
+    return set().union(*map(_field_names, get_args(annotation)))
+
+
+def _dependency_calls(dependant) -> set:
+    calls = {dependant.call}
+    for dependency in dependant.dependencies:
+        calls |= _dependency_calls(dependency)
+    return calls
+
+
+def test_no_authenticated_or_pii_route_is_public():
+    """Test every public route: anonymous, and without personal data."""
+    routes = [*app.router.routes]
+    for name in routers.__all__:
+        routes += getattr(routers, name).routes
+    public = set()
+    for route in routes:
+        if not isinstance(route, APIRoute) or not policy_for(route.endpoint).public:
+            continue
+        public.add(route.path)
+        assert oauth2_scheme not in _dependency_calls(route.dependant), route.path
+        assert not _field_names(route.response_model) & PII_FIELDS, route.path
+        assert route.methods == {"GET"}, route.path
+    assert public == {
+        "/api/products",
+        "/api/products/suggest",
+        "/api/products/{id_or_slug}",
+        "/api/orders/{order_code}",
+    }
+
+
+def test_cache_control_headers(client, auth_headers):
+    """Test the headers of public, private and failed requests."""
+    response = client.get("/api/products")
+    assert response.headers["cache-control"] == (
+        "public, max-age=60, stale-while-revalidate=300"
+    )
+
+    response = client.get("/api/products/admin/all", headers=auth_headers)
+    assert response.headers["cache-control"] == "private, no-store"
+    assert "Authorization" in response.headers["vary"]
+
+    response = client.get("/api/products?count=bogus")
+    assert response.status_code == 422
+    assert response.headers["cache-control"] == "private, no-store"
@@ -0,0 +1,104 @@
+"""Tests for the static catalog snapshot."""
+
+import json
+import time
+from datetime import datetime
+
+from app.config import settings
+from app.models import Product
+from app.utils.catalog_snapshot import catalog_snapshots, write_catalog_snapshot
+from tests.conftest import TestingSessionLocal
+
+
+def _read(path):
+    return json.loads(path.read_text())
+
+
+def test_snapshot_matches_the_api(client, db_session, tmp_path):
+    """Test that snapshot files hold the API responses, and old ones are pruned."""
+    for day, slug in enumerate(["snapshot-a", "snapshot-b", "snapshot c"], start=1):
+        db_session.add(
+            Product(
+                slug=slug,
+                title=f"Snapshot {slug}",
+                description_short="Snapshot",
+                description_full="Full text",
+                price_idr=100000,
+                category="snapshot-test",
+                images=["https://example.com/1.png", "https://example.com/2.png"],
+                created_at=datetime(2020, 1, day),
+            )
+        )
+    db_session.add(
+        Product(
+            slug="snapshot-inactive",
+            title="Snapshot inactive",
+            description_short="Snapshot",
+            price_idr=100000,
+            category="snapshot-test",
+            is_active=False,
+        )
+    )
+    db_session.commit()
+
+    manifest = write_catalog_snapshot(db_session, tmp_path)
+    assert _read(tmp_path / "manifest.json") == manifest
+    snapshot = tmp_path / manifest["snapshot"]
+    assert manifest["categories"]["snapshot-test"] == 1
+
+    page = _read(snapshot / "categories" / "snapshot-test" / "page-1.json")
+    api = client.get("/api/products", params={"category": "snapshot-test"}).json()
+    assert page == api
+    assert [item["slug"] for item in page["items"]] == [
+        "snapshot c",
+        "snapshot-b",
+        "snapshot-a",
+    ]
+
+    detail = _read(snapshot / "products" / "snapshot-a.json")
+    assert detail == client.get("/api/products/snapshot-a").json()
+    # Slugs that are not safe file names are left to the API
+    assert not (snapshot / "products" / "snapshot c.json").exists()
+    assert not (snapshot / "products" / "snapshot-inactive.json").exists()
+
+    newer = write_catalog_snapshot(db_session, tmp_path, keep=1)
+    assert [path.name for path in tmp_path.iterdir() if path.is_dir()] == [
+        newer["snapshot"]
+    ]
+
+
+def test_product_writes_regenerate_the_snapshot(
+    client, auth_headers, tmp_path, monkeypatch
+):
+    """Test that an admin product write publishes a new snapshot."""
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog_snapshots, "session_factory", TestingSessionLocal)
+    catalog_snapshots.start()
+    try:
+        response = client.post(
+            "/api/products/admin",
+            headers=auth_headers,
+            json={
+                "title": "Snapshot trigger",
+                "slug": "snapshot-trigger",
+                "description_short": "Snapshot",
+                "price_idr": 100000,
+                "category": "snapshot-trigger",
+            },
+        )
+        assert response.status_code == 201
+
+        deadline = time.monotonic() + 5
+        manifest = {}
+        while time.monotonic() < deadline:
+            if (tmp_path / "manifest.json").exists():
+                manifest = _read(tmp_path / "manifest.json")
+                if "snapshot-trigger" in manifest["categories"]:
+                    break
+            time.sleep(0.05)
+    finally:
+        catalog_snapshots.close()
+    assert "snapshot-trigger" in manifest["categories"]
+    assert (
+        tmp_path / manifest["snapshot"] / "products" / "snapshot-trigger.json"
+    ).exists()
@@ -0,0 +1,66 @@
+"""Tests for response compression."""
+
+import gzip
+
+import pytest
+
+from app import compression
+from app.compression import accepted_encoding, compressed_bodies
+from app.config import settings
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_accepted_encoding(accept_encoding, expected):
+    """Test Accept-Encoding negotiation, Brotli winning ties."""
+    assert accepted_encoding(accept_encoding) == expected
+
+
+def test_large_json_is_compressed_and_small_is_not(client, monkeypatch):
+    """Test the size threshold, the Vary header and the compressed body."""
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 200)
+    plain = client.get("/api/products", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["vary"]
+
+    response = client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == plain.json()
+
+    response = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_catalog_pages_reuse_compressed_bodies(client, monkeypatch):
+    """Test that a repeated public catalog page is compressed only once."""
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 1)
+    compressed_bodies.clear()
+    calls = []
+
+    def counting_compress(body, encoding):
+        calls.append(encoding)
+        return gzip.compress(body)
+
+    monkeypatch.setattr(compression, "compress", counting_compress)
+    for _ in range(3):
+        response = client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+    assert calls == ["gzip"]
+
+    # Authenticated responses are never shared.
+    for _ in range(2):
+        client.get(
+            "/api/products",
+            headers={"Accept-Encoding": "gzip", "Authorization": "Bearer x"},
+        )
+    assert calls == ["gzip"] * 3
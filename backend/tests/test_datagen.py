@@ -0,0 +1,72 @@
+"""Tests for the synthetic dataset generator."""
+
+from sqlalchemy import create_engine, text
+
+from app.datagen import (
+    DatasetGenerator,
+    DatasetSizes,
+    generate_dataset,
+    load_snapshot,
+    order_code_for,
+    write_snapshot,
+)
+
+SIZES = DatasetSizes(
+    products=10, users=20, orders=200, tickets=5, tags=15, notes=5, activities=50
+)
+
+
+def _build(path):
+    engine = create_engine(f"sqlite:///{path}")
+    counts = generate_dataset(
+        engine, DatasetGenerator(SIZES, seed=7), log=lambda _: None
+    )
+    return engine, counts
+
+
+def test_generate_dataset_row_counts(tmp_path):
+    """Test that every table receives the requested number of rows."""
+    engine, counts = _build(tmp_path / "data.db")
+    assert counts == {
+        "products": 10,
+        "users": 20,
+        "orders": 200,
+        "tickets": 5,
+        "customer_tags": 15,
+        "customer_notes": 5,
+        "activity_logs": 50,
+    }
+    with engine.connect() as conn:
+        codes = conn.execute(text("SELECT COUNT(DISTINCT order_code) FROM orders"))
+        assert codes.scalar() == 200
+
+
+def test_generate_dataset_is_deterministic(tmp_path):
+    """Test that the same seed produces identical data."""
+    first, _ = _build(tmp_path / "first.db")
+    second, _ = _build(tmp_path / "second.db")
+    query = text("SELECT order_code, product_id, user_id, status FROM orders")
+    with first.connect() as a, second.connect() as b:
+        assert a.execute(query).all() == b.execute(query).all()
+
+
+def test_order_codes_are_unique():
+    """Test that generated order codes never collide."""
+    codes = {order_code_for(i) for i in range(1, 20_001)}
+    assert len(codes) == 20_000
+    assert all(code.startswith("FXS-") and len(code) == 10 for code in codes)
+
+
+def test_snapshot_roundtrip(tmp_path):
+    """Test writing a snapshot and loading it back with its manifest."""
+    engine, counts = _build(tmp_path / "data.db")
+    snapshot = tmp_path / "snapshot.db"
+    write_snapshot(engine, snapshot, {"rows": counts})
+
+    target = tmp_path / "copy.db"
+    manifest = load_snapshot(snapshot, target)
+    assert manifest["rows"] == counts
+
+    copy = create_engine(f"sqlite:///{target}")
+    with copy.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM orders")).scalar() == 200
@@ -0,0 +1,101 @@
+"""Tests for the streaming order export."""
+
+import csv
+import io
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Order, Product
+from app.utils.export import encode_ndjson, stream_chunks
+from tests.conftest import engine
+
+
+@pytest.fixture(scope="module", autouse=True)
+def export_orders():
+    with Session(engine) as db:
+        product = Product(
+            slug="export-product",
+            title="Export Product",
+            description_short="Exported",
+            price_idr=250000,
+            category="robot",
+            images=["https://example.com/export.png"],
+        )
+        for index, (status, day) in enumerate(
+            [("exported", 1), ("exported", 2), ("exported", 3), ("export-skip", 2)]
+        ):
+            db.add(
+                Order(
+                    product=product,
+                    name=f"Exporter {index}",
+                    email=f"exporter{index}@example.com",
+                    whatsapp="081234567890",
+                    notes='Comma, "quote"\nnewline' if index == 0 else None,
+                    status=status,
+                    created_at=datetime(2024, 5, day, 12, 0, 0),
+                )
+            )
+        db.commit()
+
+
+def test_export_requires_admin(client):
+    """Test that exporting orders requires an admin token."""
+    response = client.get("/api/orders/admin/export")
+    assert response.status_code == 401
+
+
+def test_export_csv(client, auth_headers):
+    """Test that CSV export has a header row and one row per matching order."""
+    response = client.get(
+        "/api/orders/admin/export?status=exported", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert "orders.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Exporter 2", "Exporter 1", "Exporter 0"]
+    assert rows[2]["notes"] == 'Comma, "quote"\nnewline'
+    assert rows[2]["product_title"] == "Export Product"
+    assert rows[2]["product_image"] == "https://example.com/export.png"
+    # Same timestamp format as the DRF export
+    assert rows[2]["created_at"] == "2024-05-01T12:00:00Z"
+
+
+def test_export_ndjson_with_date_range(client, auth_headers):
+    """Test NDJSON export filtered by an inclusive date range."""
+    response = client.get(
+        "/api/orders/admin/export?format=ndjson&status=exported"
+        "&date_from=2024-05-02&date_to=2024-05-02",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = response.content.splitlines()
+    assert len(lines) == 1
+    item = orjson.loads(lines[0])
+    assert item["name"] == "Exporter 1"
+    assert item["product_price"] == 250000
+    assert item["created_at"] == "2024-05-02T12:00:00Z"
+
+
+def test_export_rejects_unknown_format(client, auth_headers):
+    """Test that only csv and ndjson are accepted."""
+    response = client.get("/api/orders/admin/export?format=xml", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_stream_chunks_reads_in_chunks():
+    """Test that rows are fetched and encoded one chunk at a time."""
+    statement = (
+        select(Order.id, Order.name)
+        .where(Order.status == "exported")
+        .order_by(Order.id)
+    )
+    blocks = list(encode_ndjson(stream_chunks(engine, statement, chunk_size=2)))
+    assert [block.count(b"\n") for block in blocks] == [2, 1]
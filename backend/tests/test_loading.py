@@ -0,0 +1,78 @@
+"""Tests for strict relationship loading."""
+
+import logging
+
+import pytest
+from sqlalchemy.orm import Session, joinedload
+
+from app.models import Order, Product
+from app.utils.loading import LazyLoadError, enable_strict_loading
+from tests.conftest import engine
+
+
+def _seed_order(db) -> Order:
+    product = Product(
+        slug="strict-loading-product",
+        title="Strict Loading Product",
+        description_short="Loaded explicitly",
+        price_idr=150000,
+        category="ebook",
+    )
+    order = Order(
+        product=product,
+        name="Strict Loader",
+        email="strict@example.com",
+        whatsapp="081234567890",
+    )
+    db.add(order)
+    db.commit()
+    return order
+
+
+@pytest.fixture(scope="module")
+def order_code():
+    with Session(engine) as db:
+        return _seed_order(db).order_code
+
+
+def test_implicit_lazy_load_raises(db_session, order_code):
+    """Test that strict mode raises on an implicit relationship load."""
+    order = db_session.query(Order).filter(Order.order_code == order_code).one()
+    with pytest.raises(LazyLoadError, match="Order.product"):
+        order.product  # noqa: B018
+
+
+def test_explicit_loader_option_is_allowed(db_session, order_code):
+    """Test that declared eager loads pass in strict mode."""
+    order = (
+        db_session.query(Order)
+        .options(joinedload(Order.product))
+        .filter(Order.order_code == order_code)
+        .one()
+    )
+    assert order.product.title == "Strict Loading Product"
+
+
+def test_warn_mode_logs_stack_trace(caplog, order_code):
+    """Test that warn mode logs the lazy load with a stack trace."""
+    with Session(engine) as db:
+        enable_strict_loading(db, "warn")
+        order = db.query(Order).filter(Order.order_code == order_code).one()
+        with caplog.at_level(logging.WARNING, logger="app.utils.loading"):
+            assert order.product.slug == "strict-loading-product"
+
+    assert "Implicit lazy load of Order.product" in caplog.text
+    assert "Stack (most recent call last)" in caplog.text
+
+
+def test_invalid_mode_rejected():
+    """Test that unknown strict loading modes are rejected."""
+    with pytest.raises(ValueError):
+        enable_strict_loading(Session, "sometimes")
+
+
+def test_public_order_status_loads_product_explicitly(client, order_code):
+    """Test that the public order lookup works under strict loading."""
+    response = client.get(f"/api/orders/{order_code}")
+    assert response.status_code == 200
+    assert response.json()["product_title"] == "Strict Loading Product"
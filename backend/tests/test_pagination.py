@@ -0,0 +1,97 @@
+"""Tests for cached, estimated and skipped list totals."""
+
+from app.config import settings
+from app.models import Order, Product
+from tests.conftest import engine
+from tests.query_budget import QueryCounter
+
+
+def _count_queries(statements: list[str]) -> int:
+    return sum("count(*)" in statement.lower() for statement in statements)
+
+
+def test_totals_are_cached_until_a_write(client, auth_headers):
+    """Test that a repeated page skips COUNT(*) and a product write refreshes it."""
+    params = {"category": "pagination-cache"}
+    client.post(
+        "/api/products/admin",
+        headers=auth_headers,
+        json={
+            "title": "Pagination Cached",
+            "slug": "pagination-cached-0",
+            "description_short": "Counted once",
+            "price_idr": 100000,
+            "category": "pagination-cache",
+        },
+    )
+    assert client.get("/api/products", params=params).json()["total"] == 1
+    with QueryCounter(engine) as counter:
+        body = client.get("/api/products", params=params).json()
+    assert (body["total"], body["exact"], body["has_more"]) == (1, True, False)
+    assert _count_queries(counter.statements) == 0
+
+    client.post(
+        "/api/products/admin",
+        headers=auth_headers,
+        json={
+            "title": "Pagination Cached",
+            "slug": "pagination-cached-1",
+            "description_short": "Counted again",
+            "price_idr": 100000,
+            "category": "pagination-cache",
+        },
+    )
+    body = client.get("/api/products", params={**params, "page_size": 1}).json()
+    assert (body["total"], body["pages"], body["has_more"]) == (2, 2, True)
+
+    # One cached total per filter, whatever the sort, view or fields
+    with QueryCounter(engine) as counter:
+        for extra in ({"sort": "name"}, {"view": "full"}, {"fields": "slug"}):
+            assert (
+                client.get("/api/products", params={**params, **extra}).json()["total"]
+                == 2
+            )
+    assert _count_queries(counter.statements) == 0
+
+
+def test_count_none_and_estimates(client, auth_headers, db_session, monkeypatch):
+    """Test count=none paging and estimated totals for unfiltered tables."""
+    product = Product(
+        slug="pagination-orders",
+        title="Pagination Orders",
+        description_short="Ordered",
+        price_idr=100000,
+        category="pagination-test",
+    )
+    db_session.add(product)
+    db_session.flush()
+    db_session.add_all(
+        Order(
+            product_id=product.id,
+            name="Paged Customer",
+            email="paged@example.com",
+            whatsapp="081234567890",
+            status="pagination-test",
+        )
+        for _ in range(3)
+    )
+    db_session.commit()
+
+    url = "/api/orders/admin/all"
+    params = {"status": "pagination-test", "page_size": 2, "count": "none"}
+    with QueryCounter(engine) as counter:
+        body = client.get(url, headers=auth_headers, params=params).json()
+    assert (body["total"], body["has_more"], len(body["items"])) == (None, True, 2)
+    assert _count_queries(counter.statements) == 0
+    body = client.get(url, headers=auth_headers, params={**params, "page": 2}).json()
+    assert (body["total"], body["has_more"], len(body["items"])) == (None, False, 1)
+
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_MIN_ROWS", 1)
+    body = client.get(url, headers=auth_headers, params={"count": "estimate"}).json()
+    highest_id = max(item["id"] for item in body["items"])
+    assert (body["total"], body["exact"]) == (highest_id, False)
+
+    # Filtered lists are never estimated.
+    params["count"] = "estimate"
+    body = client.get(url, headers=auth_headers, params=params).json()
+    assert (body["total"], body["exact"]) == (3, True)
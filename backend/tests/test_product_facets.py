@@ -0,0 +1,59 @@
+"""Tests for facet counts on the product listing."""
+
+from app.models import Product
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+
+def test_list_products_returns_facet_counts(client, db_session):
+    """Test category, badge and price counts for the current filters."""
+    db_session.add_all(
+        Product(
+            slug=f"facet-{index}",
+            title=f"Facetmark {category} {index}",
+            description_short="Faceted product",
+            price_idr=price,
+            category=category,
+            badges=badges,
+            is_active=active,
+        )
+        for index, (category, price, badges, active) in enumerate(
+            [
+                ("facet-robot", 99000, ["new", "popular"], True),
+                ("facet-robot", 250000, ["new"], True),
+                ("facet-robot", 1500000, None, True),
+                ("facet-ebook", 79000, ["new"], True),
+                ("facet-ebook", 79000, ["new"], False),
+            ]
+        )
+    )
+    db_session.commit()
+
+    params = {"search": "facetmark", "facets": "true", "page_size": 1}
+    with assert_max_queries(engine, 3):
+        response = client.get("/api/products", params=params)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 4
+    assert body["facets"]["category"] == [
+        {"value": "facet-robot", "count": 3},
+        {"value": "facet-ebook", "count": 1},
+    ]
+    assert body["facets"]["badge"] == [
+        {"value": "new", "count": 3},
+        {"value": "popular", "count": 1},
+    ]
+    assert [bucket["count"] for bucket in body["facets"]["price"]] == [2, 0, 1, 0, 1]
+    assert body["facets"]["price"][0] == {"min": None, "max": 100000, "count": 2}
+
+    # The category facet keeps every category; the others follow the filter.
+    params["category"] = "facet-robot"
+    facets = client.get("/api/products", params=params).json()["facets"]
+    assert [item["count"] for item in facets["category"]] == [3, 1]
+    assert facets["badge"] == [
+        {"value": "new", "count": 2},
+        {"value": "popular", "count": 1},
+    ]
+    assert [bucket["count"] for bucket in facets["price"]] == [1, 0, 1, 0, 1]
+
+    assert client.get("/api/products").json()["facets"] is None
@@ -0,0 +1,174 @@
+"""Tests for the bulk product import."""
+
+import io
+import json
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Product
+from app.utils.catalog import get_catalog_version
+from app.utils.product_import import import_products
+
+CSV_HEADER = "slug,title,description_short,price_idr,category,badges,images\n"
+
+
+def _upload(client, headers, content: str, filename: str, **params):
+    return client.post(
+        "/api/products/admin/import",
+        headers=headers,
+        params=params,
+        files={"file": (filename, content.encode(), "application/octet-stream")},
+    )
+
+
+def test_import_requires_admin(client):
+    """Test that bulk import requires an admin token."""
+    response = _upload(client, {}, CSV_HEADER, "products.csv")
+    assert response.status_code == 401
+
+
+def test_import_csv_creates_and_updates(client, auth_headers, db_session):
+    """Test that CSV rows are upserted by slug and bad rows are reported."""
+    db_session.add(
+        Product(
+            slug="import-existing",
+            title="Old Title",
+            description_short="Before import",
+            price_idr=100000,
+            category="ebook",
+        )
+    )
+    db_session.commit()
+    version_before = get_catalog_version(db_session)
+
+    content = CSV_HEADER + (
+        'import-new,New Product,Brand new,150000,robot,new|popular,"[""a.png""]"\n'
+        "import-existing,New Title,,,,,\n"
+        "import-bad-price,Bad,Bad price,mahal,robot,,\n"
+        "import-new,Duplicate,Again,1,robot,,\n"
+        "import-missing-fields,,,,,,\n"
+    )
+    response = _upload(client, auth_headers, content, "products.csv")
+    assert response.status_code == 200
+    report = response.json()
+
+    assert report["created"] == 1
+    assert report["updated"] == 1
+    assert report["failed"] == 3
+    assert report["catalog_version"] == version_before + 1
+    errors = {error["row"]: error for error in report["errors"]}
+    assert errors[3]["slug"] == "import-bad-price"
+    assert errors[3]["errors"][0]["loc"] == ["price_idr"]
+    assert "Duplicate slug" in errors[4]["errors"][0]["msg"]
+    assert {e["loc"][0] for e in errors[5]["errors"]} >= {"title", "price_idr"}
+
+    db_session.expire_all()
+    created = db_session.query(Product).filter_by(slug="import-new").one()
+    assert created.badges == ["new", "popular"]
+    assert created.images == ["a.png"]
+    updated = db_session.query(Product).filter_by(slug="import-existing").one()
+    assert updated.title == "New Title"
+    assert updated.price_idr == 100000
+
+
+def test_import_jsonl(client, auth_headers, db_session):
+    """Test JSONL import, selected by the format parameter."""
+    lines = [
+        {
+            "slug": "import-jsonl",
+            "title": "JSONL Product",
+            "description_short": "From JSONL",
+            "price_idr": 50000,
+            "category": "merchandise",
+            "is_active": False,
+        },
+        ["not", "an", "object"],
+    ]
+    content = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+    response = _upload(client, auth_headers, content, "upload.txt", format="jsonl")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 1
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+
+    product = db_session.query(Product).filter_by(slug="import-jsonl").one()
+    assert product.is_active is False
+
+
+def test_import_rejects_unreadable_files(client, auth_headers):
+    """Test that unknown formats and CSVs without a slug column are rejected."""
+    response = _upload(client, auth_headers, "a,b\n1,2\n", "products.xlsx")
+    assert response.status_code == 400
+
+    response = _upload(client, auth_headers, "title\nNo slug\n", "products.csv")
+    assert response.status_code == 400
+    assert "slug" in response.json()["detail"]
+
+
+def test_import_without_changes_keeps_catalog_version(db_session):
+    """Test that the catalog version only moves when products were written."""
+    version = get_catalog_version(db_session)
+    report = import_products(db_session, io.BytesIO(CSV_HEADER.encode()), "csv")
+    assert report["created"] == report["updated"] == 0
+    assert report["catalog_version"] == version
+
+
+def test_import_writes_in_chunks(db_session):
+    """Test that chunked imports still bump the catalog version once."""
+    version = get_catalog_version(db_session)
+    rows = "".join(
+        f"import-chunk-{i},Chunk {i},Chunked,{1000 + i},ebook,,\n" for i in range(7)
+    )
+    report = import_products(
+        db_session, io.BytesIO((CSV_HEADER + rows).encode()), "csv", chunk_size=3
+    )
+    assert report["created"] == 7
+    assert report["catalog_version"] == version + 1
+    assert (
+        db_session.query(Product).filter(Product.slug.like("import-chunk-%")).count()
+        == 7
+    )
+
+
+def test_rows_of_a_rolled_back_chunk_can_be_retried(db_session, monkeypatch):
+    """Test that a slug is only taken once its chunk has been written."""
+    commit = db_session.commit
+    failures = [IntegrityError("INSERT", {}, Exception("taken"))]
+
+    def commit_failing_once():
+        if failures:
+            raise failures.pop()
+        commit()
+
+    monkeypatch.setattr(db_session, "commit", commit_failing_once)
+    rows = "".join(
+        f"{slug},Retry,Retried,1000,ebook,,\n"
+        for slug in ("import-retry-a", "import-retry-b", "import-retry-a")
+    )
+    report = import_products(
+        db_session, io.BytesIO((CSV_HEADER + rows).encode()), "csv", chunk_size=2
+    )
+    assert [error["row"] for error in report["errors"]] == [1, 2]
+    assert "rolled back" in report["errors"][0]["errors"][0]["msg"]
+    assert report["created"] == 1
+
+
+def test_single_product_writes_bump_catalog_version(client, auth_headers, db_session):
+    """Test that the one-at-a-time admin endpoints bump the catalog version too."""
+    version = get_catalog_version(db_session)
+    response = client.post(
+        "/api/products/admin",
+        headers=auth_headers,
+        json={
+            "title": "Versioned Product",
+            "slug": "versioned-product",
+            "description_short": "Bumps the version",
+            "price_idr": 10000,
+            "category": "ebook",
+        },
+    )
+    product_id = response.json()["id"]
+    client.patch(
+        f"/api/products/admin/{product_id}/toggle-active", headers=auth_headers
+    )
+    assert get_catalog_version(db_session) == version + 2
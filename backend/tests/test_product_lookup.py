@@ -0,0 +1,77 @@
+"""Tests for the single-query product detail lookup."""
+
+from app.models import Product
+from app.utils.product_lookup import product_resolver
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+
+def _create(client, auth_headers, slug: str) -> dict:
+    response = client.post(
+        "/api/products/admin",
+        headers=auth_headers,
+        json={
+            "title": f"Lookup {slug}",
+            "slug": slug,
+            "description_short": "Looked up",
+            "price_idr": 100000,
+            "category": "lookup-test",
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_numeric_slugs_resolve_in_one_query(client, auth_headers, db_session):
+    """Test that ids win over numeric slugs and either costs one query."""
+    product = _create(client, auth_headers, "lookup-by-id")
+    numeric = _create(client, auth_headers, "987654321")
+    # A slug that equals another product's id loses to the id, as before.
+    shadowed = _create(client, auth_headers, str(product["id"]))
+
+    with assert_max_queries(engine, 2):  # product + related
+        response = client.get("/api/products/987654321")
+    assert response.json()["id"] == numeric["id"]
+    response = client.get(f"/api/products/{product['id']}")
+    assert response.json()["id"] == product["id"]
+    response = client.get(f"/api/products/{shadowed['slug']}")
+    assert response.json()["id"] == product["id"]
+
+
+def test_unknown_slugs_are_cached_until_a_product_write(client, auth_headers):
+    """Test the negative cache and invalidation on create and slug changes."""
+    assert client.get("/api/products/lookup-later").status_code == 404
+    with assert_max_queries(engine, 0):
+        assert client.get("/api/products/lookup-later").status_code == 404
+
+    product = _create(client, auth_headers, "lookup-later")
+    assert client.get("/api/products/lookup-later").json()["id"] == product["id"]
+    with assert_max_queries(engine, 2):
+        assert client.get("/api/products/lookup-later").status_code == 200
+
+    client.patch(
+        f"/api/products/admin/{product['id']}",
+        headers=auth_headers,
+        json={"slug": "lookup-renamed"},
+    )
+    assert client.get("/api/products/lookup-later").status_code == 404
+    assert client.get("/api/products/lookup-renamed").json()["id"] == product["id"]
+
+
+def test_slugs_renamed_elsewhere_are_looked_up_again(db_session):
+    """Test that a stale slug -> id entry falls back to the slug query."""
+    product = Product(
+        slug="lookup-stale",
+        title="Lookup Stale",
+        description_short="Renamed without a catalog bump",
+        price_idr=100000,
+        category="lookup-test",
+    )
+    db_session.add(product)
+    db_session.commit()
+    assert product_resolver.resolve(db_session, "lookup-stale").id == product.id
+
+    product.slug = "lookup-fresh"
+    db_session.commit()
+    assert product_resolver.resolve(db_session, "lookup-stale") is None
+    assert product_resolver.resolve(db_session, "lookup-fresh").id == product.id
@@ -0,0 +1,138 @@
+"""Tests for product counters, trending scores and automatic badges."""
+
+from datetime import UTC, datetime
+
+from pytest import approx
+
+from app.models import Order, Product
+from app.utils.catalog import get_catalog_version
+from app.utils.product_stats import (
+    apply_counts,
+    assign_badges,
+    current_hour,
+    product_counters,
+    recount_sales,
+    update_trending_scores,
+)
+from tests.conftest import TestingSessionLocal
+
+NOW = datetime(2024, 6, 1, 12, 30, tzinfo=UTC)
+
+
+def _products(db, category: str, count: int, **fields) -> list[Product]:
+    products = [
+        Product(
+            slug=f"{category}-{index}",
+            title=f"{category} {index}",
+            description_short="Counted product",
+            price_idr=100000,
+            category=category,
+            **fields,
+        )
+        for index in range(count)
+    ]
+    db.add_all(products)
+    db.commit()
+    return products
+
+
+def _slugs(client, category: str, sort: str) -> list[str]:
+    response = client.get("/api/products", params={"category": category, "sort": sort})
+    assert response.status_code == 200
+    return [item["slug"] for item in response.json()["items"]]
+
+
+def test_views_and_sales_are_counted_and_flushed(client, db_session, monkeypatch):
+    """Test that detail views and new orders reach the products on flush."""
+    monkeypatch.setattr(product_counters, "session_factory", TestingSessionLocal)
+    viewed, bought, untouched = _products(db_session, "stats-popular", 3)
+    ids = [viewed.id, bought.id, untouched.id]
+
+    for _ in range(3):
+        assert client.get(f"/api/products/{ids[0]}").status_code == 200
+    response = client.post(
+        "/api/orders",
+        json={
+            "product_id": ids[1],
+            "name": "Counted Customer",
+            "email": "counted@example.com",
+            "whatsapp": "081234567890",
+        },
+    )
+    assert response.status_code == 201
+    assert product_counters.flush() >= 2
+    assert product_counters.flush() == 0
+
+    db_session.expire_all()
+    assert (viewed.view_count, viewed.sales_count) == (3, 0)
+    assert (bought.view_count, bought.sales_count) == (0, 1)
+    assert (untouched.view_count, untouched.trending_score) == (0, 0)
+    assert bought.trending_score > viewed.trending_score
+
+    # Popular is by sales; ties fall back to newest first.
+    assert _slugs(client, "stats-popular", "popular") == [
+        "stats-popular-1",
+        "stats-popular-2",
+        "stats-popular-0",
+    ]
+
+
+def test_trending_score_fades_over_the_window(client, db_session):
+    """Test the sliding window: older buckets weigh less, expired ones nothing."""
+    fresh, older, expired = _products(db_session, "stats-trending", 3)
+    hour = current_hour(NOW)
+    apply_counts(
+        db_session,
+        {
+            (fresh.id, hour): [6, 0],
+            (older.id, hour - 36): [10, 1],  # (10 + 10) * 36 / 72
+            (expired.id, hour - 72): [100, 0],
+        },
+        NOW,
+    )
+    db_session.commit()
+
+    db_session.expire_all()
+    assert fresh.trending_score == 6
+    assert older.trending_score == 10
+    assert expired.trending_score == 0
+    assert _slugs(client, "stats-trending", "trending") == [
+        "stats-trending-1",
+        "stats-trending-0",
+        "stats-trending-2",
+    ]
+
+    # A day later every bucket has lost another 24/72 of its weight.
+    update_trending_scores(db_session, now=datetime(2024, 6, 2, 12, 30, tzinfo=UTC))
+    db_session.commit()
+    db_session.expire_all()
+    assert fresh.trending_score == approx(4)
+    assert older.trending_score == approx(20 / 6)
+
+
+def test_recount_and_badges_keep_hand_set_badges(db_session):
+    """Test sales recounts from orders and threshold badges next to others."""
+    seller, quiet = _products(db_session, "stats-badges", 2, badges=["new", "popular"])
+    db_session.add_all(
+        Order(
+            product_id=seller.id,
+            name="Badge Customer",
+            email="badges@example.com",
+            whatsapp="081234567890",
+            status=status,
+        )
+        for status in ("completed", "pending", "cancelled")
+    )
+    db_session.commit()
+
+    assert recount_sales(db_session) >= 1
+    db_session.expire_all()
+    assert (seller.sales_count, quiet.sales_count) == (2, 0)
+
+    version = get_catalog_version(db_session)
+    assert assign_badges(db_session, min_sales=2, min_trending=1000) >= 2
+    db_session.commit()
+    db_session.expire_all()
+    assert seller.badges == ["new", "bestseller"]
+    assert quiet.badges == ["new"]
+    assert get_catalog_version(db_session) == version + 1
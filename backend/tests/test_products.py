@@ -102,3 +102,31 @@ def test_get_product_not_found(client):
     """Test getting a non-existent product."""
     response = client.get("/api/products/99999")
     assert response.status_code == 404
+
+
+def test_product_list_views(client, auth_headers):
+    """Test that list cards drop description_full and keep the first image."""
+    client.post(
+        "/api/products/admin",
+        json={
+            "title": "Card View Product",
+            "slug": "card-view-product",
+            "description_short": "Short",
+            "description_full": "Long text " * 200,
+            "price_idr": 150000,
+            "category": "card-view",
+            "images": ["https://example.com/1.jpg", "https://example.com/2.jpg"],
+        },
+        headers=auth_headers,
+    )
+    params = {"category": "card-view"}
+
+    (card,) = client.get("/api/products", params=params).json()["items"]
+    assert "description_full" not in card
+    assert card["images"] == ["https://example.com/1.jpg"]
+
+    params["view"] = "full"
+    (full,) = client.get("/api/products", params=params).json()["items"]
+    assert full["description_full"].startswith("Long text")
+    assert len(full["images"]) == 2
+    assert full.keys() - card.keys() == {"description_full"}
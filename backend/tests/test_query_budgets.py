@@ -0,0 +1,274 @@
+"""Query-count budgets for list endpoints.
+
+Each test seeds 1, 10 and 100 rows under a unique marker and checks that the
+endpoint's query count stays within budget and does not grow with N.
+"""
+
+import itertools
+
+import pytest
+
+from app.auth import create_access_token
+from app.models import (
+    ActivityLog,
+    CustomerNote,
+    CustomerTag,
+    Order,
+    Product,
+    Ticket,
+    User,
+)
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries, assert_queries_constant
+
+_markers = itertools.count(1)
+
+
+def _marker() -> str:
+    return f"budget{next(_markers)}"
+
+
+def _product(db, marker: str, index: int = 0, **overrides) -> Product:
+    fields = {
+        "slug": f"{marker}-product-{index}",
+        "title": f"{marker} Product {index}",
+        "description_short": "Budget test product",
+        "price_idr": 100000,
+        "category": "indikator",
+        "images": ["https://example.com/image.png"],
+    }
+    product = Product(**{**fields, **overrides})
+    db.add(product)
+    return product
+
+
+def _customer(db, marker: str, index: int = 0) -> User:
+    user = User(
+        email=f"{marker}-{index}@example.com",
+        password_hash="not-used",
+        full_name=f"{marker} Customer {index}",
+    )
+    db.add(user)
+    return user
+
+
+def _order(db, product: Product, user: User | None, **overrides) -> Order:
+    order = Order(
+        product=product,
+        user=user,
+        name="Budget Customer",
+        email=user.email if user else "guest@example.com",
+        whatsapp="081234567890",
+        **overrides,
+    )
+    db.add(order)
+    return order
+
+
+def _user_headers(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": user.email, "role": "user"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _get(client, url: str, expected_items: int, **kwargs):
+    def request():
+        response = client.get(url, **kwargs)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        items = data if isinstance(data, list) else data["items"]
+        assert len(items) == expected_items
+
+    return request
+
+
+def test_assert_max_queries_reports_statements(db_session):
+    """Test that exceeding the budget fails and lists the statements."""
+    with pytest.raises(AssertionError, match="2 queries executed, budget is 1"):
+        with assert_max_queries(engine, 1):
+            db_session.query(Product).count()
+            db_session.query(User).count()
+
+
+def test_assert_queries_constant_detects_n_plus_one(db_session):
+    """Test that a per-row query pattern is reported as growing with N."""
+
+    def make_request(n):
+        marker = _marker()
+        for i in range(n):
+            _product(db_session, marker, i)
+        db_session.commit()
+
+        def request():
+            products = db_session.query(Product).filter(
+                Product.slug.startswith(f"{marker}-")
+            )
+            for product in products.all():
+                db_session.query(Order).filter(Order.product_id == product.id).count()
+
+        return request
+
+    with pytest.raises(AssertionError, match="grows with row count"):
+        assert_queries_constant(engine, make_request, limit=1000, scale=(1, 5))
+
+
+def test_products_list_budget(client, db_session):
+    """Test the public product list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        for i in range(n):
+            _product(db_session, marker, i, category=marker)
+        db_session.commit()
+        return _get(client, f"/api/products?category={marker}&page_size=100", n)
+
+    assert_queries_constant(engine, make_request, limit=2)
+
+
+def test_products_admin_list_budget(client, db_session, auth_headers):
+    """Test the admin product list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        for i in range(n):
+            _product(db_session, marker, i, is_active=False)
+        db_session.commit()
+        url = f"/api/products/admin/all?search={marker}&page_size=100"
+        return _get(client, url, n, headers=auth_headers)
+
+    assert_queries_constant(engine, make_request, limit=2)
+
+
+def test_my_orders_budget(client, db_session):
+    """Test the customer order list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        user = _customer(db_session, marker)
+        for i in range(n):
+            _order(db_session, _product(db_session, marker, i), user)
+        db_session.commit()
+        return _get(client, "/api/orders/me", n, headers=_user_headers(user))
+
+    assert_queries_constant(engine, make_request, limit=2)
+
+
+def test_admin_orders_budget(client, db_session, auth_headers):
+    """Test the admin order list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        for i in range(n):
+            _order(db_session, _product(db_session, marker, i), None, status=marker)
+        db_session.commit()
+        url = f"/api/orders/admin/all?status={marker}&page_size=100"
+        return _get(client, url, n, headers=auth_headers)
+
+    assert_queries_constant(engine, make_request, limit=2)
+
+
+def test_my_tickets_budget(client, db_session):
+    """Test the customer ticket list query budget."""
+
+    def make_request(n):
+        user = _customer(db_session, _marker())
+        db_session.flush()
+        for i in range(n):
+            db_session.add(Ticket(user_id=user.id, title=f"Ticket {i}", message="Hi"))
+        db_session.commit()
+        url = "/api/tickets?page_size=100"
+        return _get(client, url, n, headers=_user_headers(user))
+
+    assert_queries_constant(engine, make_request, limit=3)
+
+
+def test_admin_tickets_budget(client, db_session, auth_headers):
+    """Test the admin ticket list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        user = _customer(db_session, marker)
+        db_session.flush()
+        for i in range(n):
+            db_session.add(
+                Ticket(
+                    user_id=user.id, title=f"Ticket {i}", message="Hi", status=marker
+                )
+            )
+        db_session.commit()
+        url = f"/api/tickets/admin/all?status={marker}&page_size=100"
+        return _get(client, url, n, headers=auth_headers)
+
+    assert_queries_constant(engine, make_request, limit=2)
+
+
+def test_admin_customers_budget(client, db_session, auth_headers):
+    """Test the CRM customer list query budget."""
+
+    def make_request(n):
+        marker = _marker()
+        product = _product(db_session, marker)
+        for i in range(n):
+            user = _customer(db_session, marker, i)
+            _order(db_session, product, user)
+            db_session.flush()
+            db_session.add(CustomerTag(customer_id=user.id, tag="VIP"))
+            db_session.add(ActivityLog(customer_id=user.id, type="order_created"))
+        db_session.commit()
+        url = f"/api/admin/customers?search={marker}&page_size=100"
+        return _get(client, url, n, headers=auth_headers)
+
+    assert_queries_constant(engine, make_request, limit=4)
+
+
+@pytest.mark.parametrize("resource", ["orders", "tickets", "tags", "notes", "activity"])
+def test_customer_resource_lists_budget(client, db_session, auth_headers, resource):
+    """Test the per-customer CRM list query budgets."""
+
+    def make_request(n):
+        marker = _marker()
+        user = _customer(db_session, marker)
+        product = _product(db_session, marker)
+        db_session.flush()
+        for i in range(n):
+            if resource == "orders":
+                _order(db_session, product, user)
+            elif resource == "tickets":
+                db_session.add(Ticket(user_id=user.id, title="Ticket", message="Hi"))
+            elif resource == "tags":
+                db_session.add(CustomerTag(customer_id=user.id, tag=f"tag-{i}"))
+            elif resource == "notes":
+                db_session.add(
+                    CustomerNote(customer_id=user.id, note="Hi", created_by_admin="a")
+                )
+            else:
+                db_session.add(ActivityLog(customer_id=user.id, type="note_added"))
+        db_session.commit()
+        url = f"/api/admin/customers/{user.id}/{resource}"
+        return _get(client, url, n, headers=auth_headers)
+
+    # The activity timeline also reads the partition registry.
+    limit = 2 if resource == "activity" else 1
+    assert_queries_constant(engine, make_request, limit=limit)
+
+
+def test_customer_summary_budget(client, db_session, auth_headers):
+    """Test that the customer summary does not load orders one by one."""
+
+    def make_request(n):
+        marker = _marker()
+        user = _customer(db_session, marker)
+        for i in range(n):
+            _order(db_session, _product(db_session, marker, i), user)
+        db_session.commit()
+        url = f"/api/admin/customers/{user.id}"
+
+        def request():
+            response = client.get(url, headers=auth_headers)
+            assert response.status_code == 200
+            assert response.json()["total_orders"] == n
+            assert response.json()["total_spend"] == n * 100000
+
+        return request
+
+    # +1: a customer without recent activity is looked up in the partitions.
+    assert_queries_constant(engine, make_request, limit=5)
@@ -0,0 +1,100 @@
+"""Tests for the co-purchase related-products index."""
+
+import numpy as np
+
+from app.models import Order, Product, RelatedProduct
+from app.utils.related_products import refresh_related_products, related_from_baskets
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+
+def test_related_from_baskets_ranks_by_cosine_similarity():
+    """Test pair counts, cosine ranking, the top-K cut and candidate filter."""
+    # Customer baskets: {1, 2, 3}, {1, 2}, {1, 3}, {1, 4}, {2, 4}
+    customers = np.array([0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4])
+    products = np.array([1, 2, 3, 1, 2, 1, 3, 1, 4, 2, 4])
+    buyers = np.bincount(products)
+    related = related_from_baskets(
+        customers,
+        products,
+        buyers,
+        targets=np.array([1, 3]),
+        candidates=np.array([1, 2, 3]),
+        limit=2,
+        min_customers=1,
+    )
+
+    rows = list(zip(*(related[name].tolist() for name in related), strict=True))
+    # 1-2 and 1-3 share 2 customers; 1-2: 2/sqrt(4*3), 1-3: 2/sqrt(4*2).
+    # Product 4 is not a candidate.
+    assert [row[:4] for row in rows] == [
+        (1, 0, 3, 2),
+        (1, 1, 2, 2),
+        (3, 0, 1, 2),
+        (3, 1, 2, 1),
+    ]
+    assert rows[0][4] == 2 / np.sqrt(8)
+
+
+def _product(db, slug: str) -> Product:
+    product = Product(
+        slug=slug,
+        title=slug.title(),
+        description_short="Related product",
+        price_idr=100000,
+        category="related-test",
+    )
+    db.add(product)
+    return product
+
+
+def _buy(db, email: str, *products: Product, status: str = "completed") -> None:
+    db.add_all(
+        Order(
+            product_id=product.id,
+            name="Related Customer",
+            email=email,
+            whatsapp="081234567890",
+            status=status,
+        )
+        for product in products
+    )
+
+
+def test_detail_returns_related_and_refresh_is_incremental(client, db_session):
+    """Test the detail endpoint's ``related`` and incremental refreshes."""
+    base, often, once, hidden = (
+        _product(db_session, f"related-{name}")
+        for name in ("base", "often", "once", "hidden")
+    )
+    db_session.flush()
+    hidden.is_active = False
+    for index in range(3):
+        _buy(db_session, f"related-{index}@example.com", base, often, hidden)
+    _buy(db_session, "related-3@example.com", base, once)
+    _buy(db_session, "related-4@example.com", base, once, status="cancelled")
+    db_session.commit()
+
+    refresh_related_products(db_session, full=True, min_customers=1)
+    url = f"/api/products/{base.slug}"
+    with assert_max_queries(engine, 2):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert [item["slug"] for item in response.json()["related"]] == [
+        "related-often",
+        "related-once",
+    ]
+
+    # Only products ordered since the last run are rebuilt.
+    db_session.query(RelatedProduct).filter_by(product_id=often.id).delete()
+    db_session.commit()
+    _buy(db_session, "Related-3@example.com", once)
+    _buy(db_session, "related-5@example.com", once)
+    db_session.commit()
+    assert refresh_related_products(db_session, min_customers=1)["products"] == 1
+
+    response = client.get(f"/api/products/{once.id}")
+    assert [item["slug"] for item in response.json()["related"]] == ["related-base"]
+    assert client.get(f"/api/products/{often.id}").json()["related"] == []
+
+    assert refresh_related_products(db_session)["products"] == 0
@@ -0,0 +1,126 @@
+"""Tests for RFM customer scoring."""
+
+from datetime import UTC, datetime
+
+import numpy as np
+
+from app.models import CustomerScore, Order, Product, User
+from app.utils.rfm import compute_customer_scores, quintile_scores, score_customers
+
+NOW = datetime(2024, 6, 30, 12, tzinfo=UTC)
+
+
+def test_quintile_scores_split_masked_values_into_fifths():
+    """Test quintile buckets, shared scores for ties and 0 outside the mask."""
+    values = np.arange(1, 11)
+    mask = np.ones(10, dtype=bool)
+    assert quintile_scores(values, mask).tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+
+    ties = np.array([1, 1, 1, 1, 5, 9])
+    mask = np.array([True] * 5 + [False])
+    assert quintile_scores(ties, mask).tolist() == [1, 1, 1, 1, 5, 0]
+
+
+def test_score_customers_assigns_segments():
+    """Test recency in days and segments for buyers and non-buyers."""
+    day = 86_400
+    aggregates = {
+        "customer_id": np.array([1, 2, 3, 4, 5, 6]),
+        "last_order_at": NOW.timestamp() - np.array([1, 2, 40, 90, 200, 0]) * day,
+        "frequency": np.array([9, 8, 2, 6, 1, 0]),
+        "monetary": np.array([900, 800, 50, 500, 10, 0]),
+    }
+    scores = score_customers(aggregates, NOW)
+
+    assert scores["recency_days"].tolist() == [1, 2, 40, 90, 200, None]
+    assert scores["rfm_score"].tolist()[-1] == "000"
+    assert scores["segment"].tolist() == [
+        "champion",
+        "champion",
+        "promising",
+        "at_risk",
+        "hibernating",
+        "prospect",
+    ]
+
+
+def test_scores_are_stored_and_exposed_on_customers(client, auth_headers, db_session):
+    """Test the scoring job end to end and the customer list sorts and filters."""
+    product = Product(
+        slug="rfm-product",
+        title="RFM Product",
+        description_short="Scored",
+        price_idr=100000,
+        category="rfm-test",
+    )
+    big, small, idle = (
+        User(email=f"rfm-{name}@example.com", password_hash="not-used")
+        for name in ("big", "small", "idle")
+    )
+    db_session.add_all([product, big, small, idle])
+    db_session.flush()
+    for user, day, status in [
+        (big, 1, "completed"),
+        (big, 20, "completed"),
+        (big, 25, "cancelled"),
+        (small, 10, "pending"),
+    ]:
+        db_session.add(
+            Order(
+                product_id=product.id,
+                user_id=user.id,
+                name="RFM Customer",
+                email=user.email,
+                whatsapp="081234567890",
+                status=status,
+                created_at=datetime(2024, 6, day, 12, tzinfo=UTC),
+            )
+        )
+    db_session.commit()
+
+    assert compute_customer_scores(db_session, now=NOW) >= 3
+    stored = {
+        score.customer_id: score
+        for score in db_session.query(CustomerScore).filter(
+            CustomerScore.customer_id.in_([big.id, small.id, idle.id])
+        )
+    }
+    assert (stored[big.id].frequency, stored[big.id].monetary_idr) == (2, 200000)
+    assert stored[big.id].recency_days == 10  # the cancelled order does not count
+    assert stored[small.id].recency_days == 20
+    assert stored[idle.id].recency_days is None
+    assert stored[idle.id].segment == "prospect"
+
+    response = client.get(
+        "/api/admin/customers",
+        headers=auth_headers,
+        params={"search": "rfm-", "sort": "monetary"},
+    )
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["email"] for item in items] == [
+        "rfm-big@example.com",
+        "rfm-small@example.com",
+        "rfm-idle@example.com",
+    ]
+    assert items[0]["rfm"]["frequency"] == 2
+
+    response = client.get(
+        "/api/admin/customers",
+        headers=auth_headers,
+        params={"search": "rfm-", "sort": "recency", "min_rfm_total": 1},
+    )
+    assert [item["email"] for item in response.json()] == [
+        "rfm-big@example.com",
+        "rfm-small@example.com",
+    ]
+
+    response = client.get(
+        "/api/admin/customers",
+        headers=auth_headers,
+        params={"search": "rfm-", "segment": "prospect"},
+    )
+    assert [item["email"] for item in response.json()] == ["rfm-idle@example.com"]
+
+    summary = client.get(f"/api/admin/customers/{idle.id}", headers=auth_headers)
+    assert summary.json()["rfm"]["rfm_score"] == "000"
@@ -0,0 +1,149 @@
+"""Tests for the daily sales rollups and the sales analytics endpoint."""
+
+from datetime import UTC, datetime
+
+from app.models import Order, Product, SalesDailyCategory
+from app.utils.sales_rollup import rebuild_sales_rollups
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+CATEGORY = "analytics-test"
+
+
+def _product(db, slug: str, price: int) -> Product:
+    product = Product(
+        slug=slug,
+        title=slug.title(),
+        description_short="Analytics product",
+        price_idr=price,
+        category=CATEGORY,
+    )
+    db.add(product)
+    db.commit()
+    return product
+
+
+def _order(client, product_id: int) -> dict:
+    response = client.post(
+        "/api/orders",
+        json={
+            "product_id": product_id,
+            "name": "Analytics Customer",
+            "email": "analytics@example.com",
+            "whatsapp": "081234567890",
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _category_rows(db) -> dict[str, tuple[int, int]]:
+    rows = db.query(SalesDailyCategory).filter_by(category=CATEGORY)
+    return {row.status: (row.orders, row.revenue_idr) for row in rows}
+
+
+def test_sales_analytics_requires_admin(client):
+    """Test that sales analytics require an admin token."""
+    response = client.get("/api/admin/analytics/sales")
+    assert response.status_code == 401
+
+
+def test_rollups_follow_order_writes(client, auth_headers, db_session):
+    """Test that creates and status changes keep the rollups in step."""
+    cheap = _product(db_session, "analytics-cheap", 100000)
+    pricey = _product(db_session, "analytics-pricey", 250000)
+    orders = [_order(client, cheap.id) for _ in range(3)] + [_order(client, pricey.id)]
+
+    response = client.patch(
+        f"/api/orders/admin/{orders[0]['id']}/status",
+        headers=auth_headers,
+        json={"status": "completed"},
+    )
+    assert response.status_code == 200
+    response = client.post(
+        "/api/orders/admin/bulk-status",
+        headers=auth_headers,
+        json={"status": "cancelled", "order_ids": [orders[1]["id"], orders[3]["id"]]},
+    )
+    assert response.json()["updated"] == 2
+
+    db_session.expire_all()
+    assert _category_rows(db_session) == {
+        "pending": (1, 100000),
+        "completed": (1, 100000),
+        "cancelled": (2, 350000),
+    }
+
+    response = client.get(
+        "/api/admin/analytics/sales",
+        headers=auth_headers,
+        params={"group_by": "product", "status": "cancelled", "limit": 500},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    items = {item["product_slug"]: item for item in data["items"]}
+    assert items["analytics-pricey"]["revenue_idr"] == 250000
+    assert items["analytics-cheap"]["orders"] == 1
+    assert data["status"] == "cancelled"
+    assert data["date_to"] == datetime.now(UTC).date().isoformat()
+
+    # A full rebuild from orders arrives at the same numbers.
+    incremental = _category_rows(db_session)
+    rebuild_sales_rollups(db_session)
+    db_session.expire_all()
+    assert _category_rows(db_session) == incremental
+
+
+def test_sales_analytics_groups_by_category_and_day(client, auth_headers, db_session):
+    """Test category and day breakdowns over an explicit date range."""
+    product = _product(db_session, "analytics-history", 50000)
+    db_session.add_all(
+        Order(
+            product_id=product.id,
+            name="History",
+            email="history@example.com",
+            whatsapp="081234567890",
+            status="completed",
+            created_at=datetime(2020, 5, day, 10, tzinfo=UTC),
+        )
+        for day in (1, 1, 2)
+    )
+    db_session.commit()
+    rebuild_sales_rollups(db_session)
+
+    params = {"date_from": "2020-05-01", "date_to": "2020-05-31"}
+    with assert_max_queries(engine, 2):
+        response = client.get(
+            "/api/admin/analytics/sales",
+            headers=auth_headers,
+            params={**params, "group_by": "category"},
+        )
+    data = response.json()
+    assert (data["orders"], data["revenue_idr"]) == (3, 150000)
+    assert data["by_status"] == [
+        {"status": "completed", "orders": 3, "revenue_idr": 150000}
+    ]
+    assert data["items"][0]["category"] == CATEGORY
+
+    response = client.get(
+        "/api/admin/analytics/sales", headers=auth_headers, params=params
+    )
+    assert [(i["day"], i["orders"]) for i in response.json()["items"]] == [
+        ("2020-05-01", 2),
+        ("2020-05-02", 1),
+    ]
+
+
+def test_sales_analytics_validates_filters(client, auth_headers):
+    """Test that reversed date ranges and unknown statuses are rejected."""
+    response = client.get(
+        "/api/admin/analytics/sales",
+        headers=auth_headers,
+        params={"date_from": "2024-02-01", "date_to": "2024-01-01"},
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/admin/analytics/sales", headers=auth_headers, params={"status": "shipped"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,107 @@
+"""Tests for the list response serialization fast path."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from pydantic import BaseModel
+
+from app.main import app
+from app.models import Order, Product
+from app.schemas import OrderListResponse, ProductListResponse, ProductResponse
+from app.serialization import FastJSONResponse, project
+
+
+class _Stamp(BaseModel):
+    at: datetime
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime(2025, 1, 2, 3, 4, 5),
+        datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=UTC),
+        datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=7))),
+    ],
+)
+def test_fast_json_matches_pydantic_datetimes(value):
+    """Test that datetimes render exactly like Pydantic's JSON mode."""
+    assert (
+        FastJSONResponse({"at": value}).body
+        == _Stamp(at=value).model_dump_json().encode()
+    )
+
+
+def test_project_follows_schema_field_order():
+    """Test that projected columns are labelled in response field order."""
+    columns = project(ProductResponse, Product)
+    assert [c.name for c in columns] == list(ProductResponse.model_fields)
+
+
+@pytest.mark.parametrize(
+    ("path", "schema"),
+    [
+        ("/api/products", "ProductListResponse"),
+        ("/api/products/admin/all", "ProductListResponse"),
+        ("/api/orders/me", "OrderListResponse"),
+        ("/api/orders/admin/all", "OrderListResponse"),
+        ("/api/tickets", "TicketListResponse"),
+    ],
+)
+def test_openapi_keeps_response_models(path, schema):
+    """Test that fast-path routes still document their response models."""
+    responses = app.openapi()["paths"][path]["get"]["responses"]
+    content = responses["200"]["content"]["application/json"]["schema"]
+    assert content == {"$ref": f"#/components/schemas/{schema}"}
+
+
+def test_product_list_matches_response_model(client, auth_headers):
+    """Test that the product list is exactly what the response model emits."""
+    client.post(
+        "/api/products/admin",
+        headers=auth_headers,
+        json={
+            "title": "Serializer Product",
+            "slug": "serializer-product",
+            "description_short": "Fast path",
+            "price_idr": 120000,
+            "category": "ebook",
+            "badges": ["new"],
+            "images": ["https://example.com/a.png"],
+        },
+    )
+    response = client.get("/api/products?search=Serializer")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["slug"] == "serializer-product"
+    assert ProductListResponse.model_validate(data).model_dump(mode="json") == data
+
+
+def test_order_list_matches_response_model(client, auth_headers, db_session):
+    """Test that admin order rows carry the product fields of the response model."""
+    product = Product(
+        slug="serializer-order-product",
+        title="Serializer Order Product",
+        description_short="Fast path",
+        price_idr=90000,
+        category="robot",
+        images=["https://example.com/first.png", "https://example.com/second.png"],
+    )
+    db_session.add(
+        Order(
+            product=product,
+            name="Serializer",
+            email="serializer@example.com",
+            whatsapp="081234567890",
+            status="serializer",
+        )
+    )
+    db_session.commit()
+
+    response = client.get(
+        "/api/orders/admin/all?status=serializer", headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["product_title"] == "Serializer Order Product"
+    assert data["items"][0]["product_image"] == "https://example.com/first.png"
+    assert OrderListResponse.model_validate(data).model_dump(mode="json") == data
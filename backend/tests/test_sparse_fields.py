@@ -0,0 +1,70 @@
+"""Tests for sparse fieldsets (``fields=``) on list endpoints."""
+
+from app.models import Order, Product, User
+from app.schemas.crm import CustomerSummary
+from tests.conftest import engine
+from tests.query_budget import QueryCounter
+
+
+def test_order_fields_skip_the_product_join(client, auth_headers, db_session):
+    """Test that only requested columns are selected and products are not joined."""
+    product = Product(
+        slug="sparse-order-product",
+        title="Sparse Order Product",
+        description_short="Sparse",
+        price_idr=90000,
+        category="robot",
+        images=["https://example.com/sparse.png"],
+    )
+    db_session.add(
+        Order(
+            product=product,
+            name="Sparse",
+            email="sparse@example.com",
+            whatsapp="081234567890",
+            status="sparse-test",
+        )
+    )
+    db_session.commit()
+
+    url = "/api/orders/admin/all"
+    params = {"status": "sparse-test", "fields": "order_code, status"}
+    with QueryCounter(engine) as counter:
+        response = client.get(url, headers=auth_headers, params=params)
+    (item,) = response.json()["items"]
+    assert list(item) == ["order_code", "status"]
+    assert not any("products" in statement for statement in counter.statements)
+
+    params["fields"] = "status,product_image"
+    (item,) = client.get(url, headers=auth_headers, params=params).json()["items"]
+    assert item == {
+        "status": "sparse-test",
+        "product_image": "https://example.com/sparse.png",
+    }
+
+    params["fields"] = "status,password"
+    response = client.get(url, headers=auth_headers, params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password"
+
+
+def test_customer_fields_skip_summary_queries(client, auth_headers, db_session):
+    """Test that unrequested customer aggregates are never queried."""
+    user = User(
+        email="sparse-customer@example.com",
+        full_name="Sparse Customer",
+        password_hash="x",
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    url = f"/api/admin/customers/{user.id}"
+    with QueryCounter(engine) as counter:
+        response = client.get(url, headers=auth_headers, params={"fields": "id,email"})
+    assert response.json() == {"id": user.id, "email": "sparse-customer@example.com"}
+    assert counter.count == 1
+
+    # The full summary still matches the response model.
+    data = client.get(url, headers=auth_headers).json()
+    assert list(data) == list(CustomerSummary.model_fields)
+    assert CustomerSummary.model_validate(data).model_dump(mode="json") == data
@@ -0,0 +1,147 @@
+"""Tests for serving stale catalog reads while the database is slow or locked."""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.models import Product
+from app.routers import products
+from app.utils.stale_reads import STALE_WARNING, StaleWhileRevalidate
+
+LOCKED = OperationalError(
+    "SELECT 1", {}, sqlite3.OperationalError("database is locked")
+)
+
+
+def test_slow_render_serves_stale_with_one_refresh():
+    """Test that requests waiting on a slow render are answered stale."""
+    reads = StaleWhileRevalidate(budget=0.05)
+    assert reads.get("key", lambda: b"1") == (b"1", None)
+
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_render():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"2"
+
+    results = []
+    first = threading.Thread(
+        target=lambda: results.append(reads.get("key", slow_render))
+    )
+    first.start()
+    assert started.wait(5)
+    for _ in range(3):
+        body, age = reads.get("key", slow_render)
+        assert body == b"1"
+        assert age is not None
+    assert len(calls) == 1
+
+    release.set()
+    first.join(5)
+    assert results == [(b"2", None)]
+    assert reads.get("key", lambda: b"3") == (b"3", None)
+
+
+def test_fresh_reads_render_inline_without_threads():
+    """Test that fresh reads render once each, on the caller's thread."""
+    reads = StaleWhileRevalidate(budget=0.05)
+    caller = threading.get_ident()
+    renders = []
+
+    def render():
+        renders.append(threading.get_ident())
+        return len(renders)
+
+    threads = threading.active_count()
+    for count in range(1, 21):
+        assert reads.get("hot", render) == (count, None)
+    assert renders == [caller] * 20
+    assert threading.active_count() == threads
+
+
+def test_stuck_render_does_not_block_other_keys():
+    """Test that a render stuck on one key leaves other keys free."""
+    reads = StaleWhileRevalidate(budget=0.05)
+    reads.get("stuck", lambda: b"1")
+    started, release = threading.Event(), threading.Event()
+
+    def stuck():
+        started.set()
+        release.wait(5)
+        return b"2"
+
+    first = threading.Thread(target=reads.get, args=("stuck", stuck))
+    first.start()
+    assert started.wait(5)
+    assert reads.get("stuck", stuck)[1] is not None
+    assert reads.get("other", lambda: b"fresh") == (b"fresh", None)
+    assert reads.get("other", lambda: b"again") == (b"again", None)
+    release.set()
+    first.join(5)
+
+
+def test_lock_errors_serve_stale_and_other_errors_raise():
+    """Test that only lock errors fall back to the last good body."""
+    reads = StaleWhileRevalidate(budget=1)
+
+    def locked():
+        raise LOCKED
+
+    with pytest.raises(OperationalError):
+        reads.get("key", locked)  # nothing to fall back to
+
+    reads.get("key", lambda: b"good")
+    assert reads.get("key", locked)[0] == b"good"
+
+    def broken():
+        raise ValueError("bug")
+
+    with pytest.raises(ValueError):
+        reads.get("key", broken)
+
+
+def test_product_list_served_stale_when_locked(client, monkeypatch):
+    """Test the stale response of the product listing."""
+    fresh = client.get("/api/products?page_size=5")
+    assert "warning" not in fresh.headers
+
+    def locked_page(*args, **kwargs):
+        raise LOCKED
+
+    monkeypatch.setattr(products, "fetch_page", locked_page)
+    stale = client.get("/api/products?page_size=5")
+    assert stale.status_code == 200
+    assert stale.headers["warning"] == STALE_WARNING
+    assert int(stale.headers["age"]) >= 0
+    assert stale.content == fresh.content
+
+
+def test_product_detail_counts_views_when_served_stale(client, db_session, monkeypatch):
+    """Test that stale product reads still record the product's view."""
+    product = Product(
+        slug="stale-detail-product",
+        title="Stale Detail Product",
+        description_short="Served from the last good read",
+        price_idr=150000,
+        category="ebook",
+    )
+    db_session.add(product)
+    db_session.commit()
+    url = f"/api/products/{product.slug}"
+    assert client.get(url).status_code == 200
+
+    viewed = []
+    monkeypatch.setattr(products.product_counters, "record_view", viewed.append)
+
+    def locked_resolve(*args, **kwargs):
+        raise LOCKED
+
+    monkeypatch.setattr(products.product_resolver, "resolve", locked_resolve)
+    stale = client.get(url)
+    assert stale.headers["warning"] == STALE_WARNING
+    assert viewed == [product.id]
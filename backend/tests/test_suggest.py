@@ -0,0 +1,88 @@
+"""Tests for typeahead product suggestions."""
+
+from app.models import Product
+from app.utils.catalog import bump_catalog_version
+from app.utils.suggest import SuggestIndex
+from tests.conftest import engine
+from tests.query_budget import assert_max_queries
+
+
+def _item(product_id: int, title: str) -> dict:
+    slug = "-".join(title.lower().split())
+    return {"id": product_id, "slug": slug, "title": title}
+
+
+def test_suggest_index_matches_prefixes_then_typos():
+    """Test word prefixes in rank order, multi-word queries and typo fallback."""
+    index = SuggestIndex(
+        [
+            _item(1, "Golden Scalper EA"),
+            _item(2, "Swift Scalper EA"),
+            _item(3, "Gold Trend Indicator"),
+            _item(4, "Psikologi Trading Café"),
+        ]
+    )
+
+    def ids(query: str, limit: int = 8) -> list[int]:
+        return [item["id"] for item in index.suggest(query, limit)]
+
+    assert ids("gol") == [1, 3]
+    assert ids("gold sca") == [1, 3]  # prefix match first, then by trigrams
+    assert ids("gol", limit=1) == [1]
+    assert ids("SCALP") == [1, 2]
+    assert ids("cafe") == [4]
+    assert ids("scalpr") == [1, 2]
+    assert ids("gld scalper") == [1, 2]
+    assert ids("psikolgi") == [4]
+    assert ids("xyzzy") == []
+    assert ids("zx") == []
+    assert ids("scalpr g") == [1]  # short words still match by prefix
+    assert ids("  -- ") == []
+
+
+def test_suggest_endpoint_serves_from_memory(client, auth_headers, db_session):
+    """Test the endpoint, no queries once built, and rebuilds on writes."""
+    products = [
+        Product(
+            slug=f"zephyr-suggest-{name}",
+            title=f"Zephyr {name.title()} Bot",
+            description_short="Suggested product",
+            price_idr=100000,
+            category="suggest-test",
+            images=["/img/zephyr.png"],
+            sales_count=sales,
+        )
+        for name, sales in (("breakout", 5), ("hedging", 9))
+    ]
+    db_session.add_all(products)
+    bump_catalog_version(db_session)
+    db_session.commit()
+
+    response = client.get("/api/products/suggest", params={"q": "zephyr"})
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["slug"] for item in items] == [
+        "zephyr-suggest-hedging",
+        "zephyr-suggest-breakout",
+    ]
+    assert items[0] == {
+        "id": products[1].id,
+        "slug": "zephyr-suggest-hedging",
+        "title": "Zephyr Hedging Bot",
+        "category": "suggest-test",
+        "price_idr": 100000,
+        "image": "/img/zephyr.png",
+    }
+
+    with assert_max_queries(engine, 0):
+        response = client.get("/api/products/suggest", params={"q": "zephr brek"})
+    assert [item["slug"] for item in response.json()] == ["zephyr-suggest-breakout"]
+
+    # An admin write rebuilds the index on the next request.
+    client.patch(
+        f"/api/products/admin/{products[1].id}/toggle-active", headers=auth_headers
+    )
+    response = client.get("/api/products/suggest", params={"q": "zephyr h"})
+    assert response.json() == []
+
+    assert client.get("/api/products/suggest", params={"q": ""}).status_code == 422
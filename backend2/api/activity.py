@@ -0,0 +1,297 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+"""Customer activity log writer.
+
+``log_activity`` records an event for the current transaction:
+
+- ``sync`` mode (tests): the row is inserted right away.
+- ``async`` mode: once the transaction commits (immediately in autocommit),
+  the event is handed to ``activity_writer``. The writer appends it to a local
+  spool file and a background thread inserts the spooled events with
+  ``bulk_create`` once ``ACTIVITY_BATCH_SIZE`` events are queued or
+  ``ACTIVITY_FLUSH_INTERVAL`` seconds have passed, and at exit.
+
+Each process spools to its own files in ``ACTIVITY_SPOOL_DIR``, guarded by a
+lock file held for the life of the process. Spool files left by a process
+that died before flushing are replayed when the next writer starts, so
+delivery is at-least-once. Files are kept in a subdirectory per database
+(the ``default`` connection's engine, host, port and name), so they are only
+ever replayed into the database they were logged for.
+"""
+
+import atexit
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from legacydb.models import ActivityLog
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per spool directory is assumed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK_SIZE = 500
+
+
+def _default_spool_dir() -> Path:
+    if settings.ACTIVITY_SPOOL_DIR:
+        return Path(settings.ACTIVITY_SPOOL_DIR)
+    if os.getenv("VERCEL"):
+        return Path("/tmp/fxsociety-drf-activity")
+    return Path(settings.BASE_DIR) / "activity-spool"
+
+
+def _database_dir() -> str:
+    """Spool subdirectory of the database the ``default`` connection uses."""
+    db = connection.settings_dict
+    name = f"{db['ENGINE']}://{db['HOST']}:{db['PORT']}/{db['NAME']}"
+    digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+    return f"{connection.vendor}-{digest}"
+
+
+def _encode(activity: dict[str, Any]) -> str:
+    return json.dumps({**activity, "created_at": activity["created_at"].isoformat()})
+
+
+def _decode(line: str) -> dict[str, Any]:
+    activity = json.loads(line)
+    activity["created_at"] = datetime.fromisoformat(activity["created_at"])
+    return activity
+
+
+def _read_spool(path: Path) -> list[ActivityLog]:
+    """Events in a spool file; lines torn by a crash mid-write are skipped."""
+    activities = []
+    with open(path, encoding="utf-8", errors="replace") as spool:
+        for number, line in enumerate(spool, 1):
+            if not line.strip():
+                continue
+            try:
+                activities.append(ActivityLog(**_decode(line)))
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping unreadable activity event %s:%d", path, number)
+    return activities
+
+
+class ActivityWriter:
+    """Spool activity events locally and insert them in batches."""
+
+    def __init__(
+        self,
+        spool_root: Path,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+    ):
+        self.spool_root = spool_root
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._spool_dir: Path | None = None
+        self._token = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._rotations = itertools.count(1)
+        self._queued = 0
+        self._spool: IO[str] | None = None
+        self._lock_file: IO[str] | None = None
+        self._wakeup = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+
+    @property
+    def spool_dir(self) -> Path:
+        """This database's spool directory, fixed on first use.
+
+        Not resolved at import: the test runner swaps in its database later.
+        """
+        if self._spool_dir is None:
+            self._spool_dir = self.spool_root / _database_dir()
+        return self._spool_dir
+
+    def enqueue(self, activities: list[dict[str, Any]]) -> None:
+        """Spool ``activities`` for the next batch insert."""
+        if not activities:
+            return
+        self.start()
+        with self._wakeup:
+            if self._spool is None:
+                path = self.spool_dir / f"{self._token}.spool"
+                self._spool = open(path, "a", encoding="utf-8")  # noqa: SIM115
+            self._spool.write("".join(_encode(a) + "\n" for a in activities))
+            self._spool.flush()
+            self._queued += len(activities)
+            if self._queued >= self.batch_size:
+                self._wakeup.notify()
+
+    def start(self) -> None:
+        """Start the flush thread on first use; it replays orphaned spools first."""
+        if self._thread is not None:
+            return
+        with self._wakeup:
+            if self._thread is not None:
+                return
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            # Lock before the file becomes visible under its final name, so
+            # recovery never mistakes a starting writer for a dead one.
+            staging = self.spool_dir / f"{self._token}.lock.tmp"
+            self._lock_file = open(staging, "w")  # noqa: SIM115
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            staging.rename(self.spool_dir / f"{self._token}.lock")
+            self._closing = False
+            self._thread = threading.Thread(
+                target=self._run, name="activity-writer", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the flush thread after a final flush."""
+        with self._wakeup:
+            thread, self._closing = self._thread, True
+            self._wakeup.notify()
+        if thread is None:
+            return
+        thread.join()
+        self.flush()
+        with self._wakeup:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                (self.spool_dir / f"{self._token}.lock").unlink(missing_ok=True)
+                self._lock_file = None
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            try:
+                self.recover()
+            except Exception:
+                logger.exception("Failed to recover spooled activity events")
+            while True:
+                with self._wakeup:
+                    if not self._closing and self._queued < self.batch_size:
+                        self._wakeup.wait(self.flush_interval)
+                    closing = self._closing
+                if closing:
+                    return
+                try:
+                    self.flush()
+                except Exception:
+                    # Spooled events stay on disk for the next flush.
+                    logger.exception("Failed to flush activity events")
+                # Idle between batches without holding a database connection.
+                connection.close()
+        finally:
+            connection.close()
+
+    def flush(self) -> int:
+        """Insert everything spooled so far and return the number of events."""
+        with self._flush_lock:
+            with self._wakeup:
+                if self._spool is not None:
+                    self._spool.close()
+                    self._spool = None
+                    self._queued = 0
+                    (self.spool_dir / f"{self._token}.spool").rename(
+                        self.spool_dir
+                        / f"{self._token}.{next(self._rotations):06d}.flushing"
+                    )
+            # Batches whose insert failed earlier are retried too.
+            return sum(
+                self._insert_file(path)
+                for path in sorted(self.spool_dir.glob(f"{self._token}.*.flushing"))
+            )
+
+    def recover(self) -> int:
+        """Insert events spooled by writers whose process is gone."""
+        recovered = 0
+        with self._flush_lock, self._recovery_lock():
+            spooled = [
+                *self.spool_dir.glob("*.spool"),
+                *self.spool_dir.glob("*.flushing"),
+            ]
+            for token in sorted({path.name.split(".", 1)[0] for path in spooled}):
+                if token == self._token or self._owner_is_alive(token):
+                    continue
+                for path in sorted(self.spool_dir.glob(f"{token}.*")):
+                    if path.suffix in (".spool", ".flushing"):
+                        recovered += self._insert_file(path)
+                (self.spool_dir / f"{token}.lock").unlink(missing_ok=True)
+        if recovered:
+            logger.warning("Recovered %d spooled activity events", recovered)
+        return recovered
+
+    @contextmanager
+    def _recovery_lock(self) -> Iterator[None]:
+        with open(self.spool_dir / "recovery.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _owner_is_alive(self, token: str) -> bool:
+        lock_path = self.spool_dir / f"{token}.lock"
+        if fcntl is None or not lock_path.exists():
+            return False
+        with open(lock_path) as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            return False
+
+    def _insert_file(self, path: Path) -> int:
+        try:
+            activities = _read_spool(path)
+            with transaction.atomic():
+                ActivityLog.objects.bulk_create(
+                    activities, batch_size=INSERT_CHUNK_SIZE
+                )
+        except Exception:
+            # Keep the file; the next flush retries it.
+            logger.exception("Failed to insert the activity events in %s", path)
+            return 0
+        path.unlink()
+        return len(activities)
+
+
+activity_writer = ActivityWriter(
+    _default_spool_dir(),
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+)
+# Django has no shutdown hook; flush what is spooled on exit.
+atexit.register(activity_writer.close)
+
+
+def log_activity(
+    customer_id: int,
+    activity_type: str,
+    reference_id: str | None = None,
+    metadata: dict[str, object] | None = None,
+) -> None:
+    """Log an activity for a customer once the current transaction commits."""
+    activity: dict[str, Any] = {
+        "customer_id": customer_id,
+        "type": activity_type,
+        "reference_id": reference_id,
+        "metadata_json": metadata,
+        "created_at": timezone.now(),
+    }
+    if settings.ACTIVITY_WRITER_MODE == "sync":
+        ActivityLog.objects.create(**activity)
+    else:
+        transaction.on_commit(lambda: activity_writer.enqueue([activity]))
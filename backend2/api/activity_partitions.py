@@ -0,0 +1,155 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Customer timelines across the month-partitioned activity log.
+
+The FastAPI backend (``python -m app.activity_retention``) moves closed months
+out of ``activity_logs`` into ``activity_logs_YYYYMM`` tables registered in
+``activity_partitions``, and drops them once archived. ``customer_timeline``
+and ``last_activity_at`` read the hot table, then the live partitions newest
+first, stopping as soon as older months cannot change the answer (see
+backend/app/utils/activity_partitions.py).
+"""
+
+import re
+from datetime import UTC, datetime
+
+from django.db import connection
+from django.db.models import Max, Q
+
+from legacydb.models import ActivityLog, ActivityPartition
+
+PARTITION_TABLE = re.compile(r"activity_logs_\d{6}")
+ACTIVITY_COLUMNS = (
+    "id",
+    "customer_id",
+    "type",
+    "reference_id",
+    "metadata_json",
+    "created_at",
+)
+
+
+def _month_bounds(month: str) -> tuple[datetime, datetime]:
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=UTC)
+    end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    return start, end
+
+
+def _newest_first(item: ActivityLog) -> tuple[float, int]:
+    return -item.created_at.timestamp(), -item.id
+
+
+def _hot_rows(
+    customer_id: int,
+    limit: int | None,
+    before: datetime | None,
+    before_id: int | None,
+) -> list[ActivityLog]:
+    rows = ActivityLog.objects.filter(customer_id=customer_id)
+    if before is not None:
+        older = Q(created_at__lt=before)
+        if before_id is not None:
+            older |= Q(created_at=before, id__lt=before_id)
+        rows = rows.filter(older)
+    rows = rows.order_by("-created_at", "-id")
+    return list(rows if limit is None else rows[:limit])
+
+
+def _partition_rows(
+    table: str,
+    customer_id: int,
+    limit: int | None,
+    before: datetime | None,
+    before_id: int | None,
+) -> list[ActivityLog]:
+    quote = connection.ops.quote_name
+    sql = (
+        f"SELECT {', '.join(map(quote, ACTIVITY_COLUMNS))} FROM {quote(table)}"
+        " WHERE customer_id = %s"
+    )
+    params: list[object] = [customer_id]
+    if before is not None:
+        value = connection.ops.adapt_datetimefield_value(before)
+        if before_id is None:
+            sql += " AND created_at < %s"
+            params.append(value)
+        else:
+            sql += " AND (created_at < %s OR (created_at = %s AND id < %s))"
+            params += [value, value, before_id]
+    sql += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return list(ActivityLog.objects.raw(sql, params))
+
+
+def _live_partitions() -> list[ActivityPartition]:
+    """Partitions that still have a table, newest first."""
+    return [
+        partition
+        for partition in ActivityPartition.objects.filter(
+            archived_at__isnull=True
+        ).order_by("-month")
+        if PARTITION_TABLE.fullmatch(partition.table_name)
+    ]
+
+
+def customer_timeline(
+    customer_id: int,
+    limit: int | None = None,
+    before: datetime | None = None,
+    before_id: int | None = None,
+) -> list[ActivityLog]:
+    """The customer's newest ``limit`` events (all by default), newest first.
+
+    ``before``/``before_id`` are the ``created_at`` and ``id`` of the last
+    event already seen.
+    """
+    items = _hot_rows(customer_id, limit, before, before_id)
+    for partition in _live_partitions():
+        start, end = _month_bounds(partition.month)
+        if before is not None and start > before:
+            continue
+        if limit is not None and len(items) >= limit:
+            items.sort(key=_newest_first)
+            if items[limit - 1].created_at >= end:
+                break
+        items += _partition_rows(
+            partition.table_name, customer_id, limit, before, before_id
+        )
+    items.sort(key=_newest_first)
+    return items[:limit]
+
+
+def last_activity_at(customer_ids: list[int]) -> dict[int, datetime]:
+    """Latest activity per customer, reading partitions only for the misses."""
+    latest: dict[int, datetime] = dict(
+        ActivityLog.objects.filter(customer_id__in=customer_ids)
+        .values("customer_id")
+        .annotate(last=Max("created_at"))
+        .values_list("customer_id", "last")
+    )
+    missing = [cid for cid in customer_ids if cid not in latest]
+    for partition in _live_partitions() if missing else []:
+        latest.update(_partition_latest(partition.table_name, missing))
+        missing = [cid for cid in missing if cid not in latest]
+        if not missing:
+            break
+    return latest
+
+
+def _partition_latest(table: str, customer_ids: list[int]) -> dict[int, datetime]:
+    quote = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(customer_ids))
+    # raw() needs a primary key column; MAX(id) only satisfies it, while
+    # going through the model converts created_at on every backend.
+    sql = (
+        "SELECT MAX(id) AS id, customer_id, MAX(created_at) AS created_at"
+        f" FROM {quote(table)} WHERE customer_id IN ({placeholders})"
+        " GROUP BY customer_id"
+    )
+    return {
+        row.customer_id: row.created_at
+        for row in ActivityLog.objects.raw(sql, customer_ids)
+        if row.created_at is not None
+    }
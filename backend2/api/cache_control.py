@@ -0,0 +1,82 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+"""Per-view ``Cache-Control`` policies.
+
+Views declare how shared caches (CDNs) and browsers may keep their responses
+with a ``cache_policy`` class attribute::
+
+    class ProductDetailView(APIView):
+        cache_policy = CATALOG
+
+Every other view is ``PRIVATE`` ("private, no-store", varying on
+``Authorization``), so a new endpoint is never public by accident. Error
+responses other than 404 are never stored.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    public: bool = False
+    max_age: int = 0
+    stale_while_revalidate: int = 0
+    no_store: bool = False
+    vary: tuple[str, ...] = ()
+
+    @property
+    def header(self) -> str:
+        directives = ["public" if self.public else "private"]
+        if self.no_store:
+            directives.append("no-store")
+        else:
+            directives.append(f"max-age={self.max_age}")
+            if self.stale_while_revalidate:
+                directives.append(
+                    f"stale-while-revalidate={self.stale_while_revalidate}"
+                )
+        return ", ".join(directives)
+
+
+CATALOG = CachePolicy(
+    public=True,
+    max_age=settings.CACHE_CATALOG_MAX_AGE,
+    stale_while_revalidate=settings.CACHE_CATALOG_STALE_WHILE_REVALIDATE,
+)
+ORDER_STATUS = CachePolicy(public=True, max_age=settings.CACHE_ORDER_STATUS_MAX_AGE)
+PRIVATE = CachePolicy(no_store=True, vary=("Authorization",))
+NO_STORE = CachePolicy(no_store=True)
+
+
+def policy_for(view: Callable[..., object]) -> CachePolicy:
+    view_class = getattr(view, "view_class", view)
+    return getattr(view_class, "cache_policy", PRIVATE)
+
+
+class CacheControlMiddleware:
+    """Add the matched view's ``Cache-Control``/``Vary`` headers.
+
+    Requests that matched no URL (404s, CORS preflights) are left alone.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        match = request.resolver_match
+        if match is None or response.has_header("Cache-Control"):
+            return response
+
+        policy = policy_for(match.func)
+        if response.status_code >= 400 and response.status_code != 404:
+            policy = NO_STORE
+        response.headers["Cache-Control"] = policy.header
+        if policy.vary:
+            patch_vary_headers(response, policy.vary)
+        return response
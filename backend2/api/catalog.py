@@ -0,0 +1,44 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Catalog version shared with the FastAPI backend.
+
+The FastAPI backend rebuilds its product suggestion index when the
+``catalog_version`` row moves and names catalog snapshots after it. Product
+writes made here bump it in their own transaction, like
+``bump_catalog_version`` in ``app/utils/catalog.py``, so FastAPI processes
+see them as they see each other's writes.
+"""
+
+from django.db.models import F
+from django.utils import timezone
+
+from legacydb.models import CatalogVersion
+
+CATALOG_VERSION_ID = 1
+
+
+def get_catalog_version() -> int:
+    """Current catalog version (0 before the first product write)."""
+    version = (
+        CatalogVersion.objects.filter(id=CATALOG_VERSION_ID)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_catalog_version() -> int:
+    """
+    Increment the catalog version and return the new value.
+    Call it inside the transaction that writes products.
+    """
+    now = timezone.now()
+    updated = CatalogVersion.objects.filter(id=CATALOG_VERSION_ID).update(
+        version=F("version") + 1, updated_at=now
+    )
+    if not updated:
+        _ = CatalogVersion.objects.create(
+            id=CATALOG_VERSION_ID, version=1, updated_at=now
+        )
+        return 1
+    return get_catalog_version()
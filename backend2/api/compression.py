@@ -0,0 +1,190 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Response compression negotiated on ``Accept-Encoding``.
+
+Responses whose content type starts with one of
+``COMPRESSION_CONTENT_TYPES`` are sent with Brotli (when the ``brotli``
+package is installed) or gzip, whichever the client accepts with the higher
+weight, Brotli on ties. Bodies under ``COMPRESSION_MIN_SIZE`` bytes are sent
+as is; streamed bodies (exports) are compressed chunk by chunk.
+
+Anonymous GETs under ``COMPRESSION_CACHE_PATHS`` are public catalog pages
+that render the same bytes for every visitor, so their compressed bodies are
+kept in an LRU keyed by the body's digest: a hot page is compressed once, not
+on every hit.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """The encoding to answer ``Accept-Encoding`` with, None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def stream_compressor(
+    encoding: str,
+) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """``(compress_chunk, finish)`` for a body sent in several chunks."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type.startswith(tuple(settings.COMPRESSION_CONTENT_TYPES))
+
+
+class CompressedBodyCache:
+    """Compressed bodies by encoding and body digest, bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def compressed(self, body: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        cached = compress(body, encoding)
+        if len(cached) > self.max_bytes:
+            return cached
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = cached
+                self._size += len(cached)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    compress_chunk, finish = stream_compressor(encoding)
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def _compress_async_stream(
+    chunks: AsyncIterator[bytes], encoding: str
+) -> AsyncIterator[bytes]:
+    compress_chunk, finish = stream_compressor(encoding)
+    async for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """Compress responses (see the module docstring)."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if (
+            not settings.COMPRESSION_ENABLED
+            or response.status_code in (204, 304)
+            or response.has_header("Content-Encoding")
+            or not is_compressible(response.get("Content-Type", ""))
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if request.method == "HEAD":  # no body to compress
+            return response
+        encoding = accepted_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(
+                    response.streaming_content, encoding
+                )
+            else:
+                response.streaming_content = _compress_stream(
+                    response.streaming_content, encoding
+                )
+            if response.has_header("Content-Length"):
+                del response.headers["Content-Length"]
+        else:
+            body = response.content
+            if len(body) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            cacheable = (
+                request.method == "GET"
+                and "Authorization" not in request.headers
+                and request.path.startswith(tuple(settings.COMPRESSION_CACHE_PATHS))
+            )
+            if cacheable:
+                response.content = compressed_bodies.compressed(body, encoding)
+            else:
+                response.content = compress(body, encoding)
+            response.headers["Content-Length"] = str(len(response.content))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -1,20 +1,26 @@
 # pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
 
-from datetime import timedelta
-from typing import cast
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any, cast
 
-from django.db.models import Q
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.activity import log_activity
+from api.activity_partitions import customer_timeline, last_activity_at
 from api.authentication import JWTAuthentication, JWTUser
-from api.orders import OrderWithProductSerializer
+from api.fastserializers import ValuesSerializer, parse_fields, select_fields
+from api.orders import ORDER_WITH_PRODUCT_VALUES
 from api.permissions import IsJWTAdmin
-from api.tickets import TicketResponseSerializer
+from api.renderers import FastJSONRenderer
+from api.tickets import TICKET_VALUES
 from legacydb.models import ActivityLog, CustomerNote, CustomerTag, Order, Ticket, User
 
 
@@ -81,6 +87,15 @@ class ActivityLogResponseSerializer(serializers.ModelSerializer[ActivityLog]):
         )
 
 
+CUSTOMER_TAG_VALUES = ValuesSerializer(CustomerTagResponseSerializer)
+CUSTOMER_NOTE_VALUES = ValuesSerializer(CustomerNoteResponseSerializer)
+ACTIVITY_LOG_VALUES = ValuesSerializer(ActivityLogResponseSerializer)
+
+CUSTOMER_FIELDS = tuple(CustomerSummarySerializer().fields)
+# Read with the user; the other summary fields take a query each.
+CUSTOMER_USER_FIELDS = ("id", "email", "full_name", "created_at")
+
+
 def _parse_int_query(
     request: Request,
     key: str,
@@ -118,72 +133,61 @@ def _parse_int_query(
     return value
 
 
-def _build_customer_summary(user: User) -> dict[str, object]:
-    user_orders = list(Order.objects.select_related("product").filter(user_id=user.id))
-    total_spend = 0
-    for order in user_orders:
-        if order.product_id is not None:
-            total_spend += order.product.price_idr
+def _build_customer_summaries(
+    users: list[User], fields: Sequence[str] = CUSTOMER_FIELDS
+) -> list[dict[str, object]]:
+    """Build summaries for a page of users with a fixed number of queries.
 
-    last_activity = (
-        ActivityLog.objects.filter(customer_id=user.id).order_by("-created_at").first()
-    )
-    tags = list(
-        CustomerTag.objects.filter(customer_id=user.id)
-        .order_by("-created_at")
-        .values_list("tag", flat=True)
-    )
+    Only ``fields`` are returned, and the queries behind the others skipped.
+    """
+    user_ids = [user.id for user in users]
+
+    order_stats: dict[int, dict[str, Any]] = {}
+    if "total_orders" in fields or "total_spend" in fields:
+        order_stats = {
+            row["user_id"]: row
+            for row in Order.objects.filter(user_id__in=user_ids)
+            .values("user_id")
+            .annotate(total_orders=Count("id"), total_spend=Sum("product__price_idr"))
+        }
+    last_activities: dict[int, datetime] = {}
+    if "last_activity" in fields:
+        last_activities = last_activity_at(user_ids)
+    tags: dict[int, list[str]] = {user_id: [] for user_id in user_ids}
+    if "tags" in fields:
+        for customer_id, tag in (
+            CustomerTag.objects.filter(customer_id__in=user_ids)
+            .order_by("-created_at")
+            .values_list("customer_id", "tag")
+        ):
+            tags[customer_id].append(tag)
+
+    summaries: list[dict[str, object]] = []
+    for user in users:
+        stats = order_stats.get(user.id, {})
+        last_activity = last_activities.get(user.id)
+        summary = {
+            "id": user.id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "whatsapp": None,
+            "total_orders": stats.get("total_orders", 0),
+            "total_spend": stats.get("total_spend") or 0,
+            "last_activity": (
+                last_activity if last_activity is not None else user.created_at
+            ),
+            "tags": tags[user.id],
+        }
+        summaries.append({name: summary[name] for name in fields})
+    return summaries
 
-    return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "whatsapp": None,
-        "total_orders": len(user_orders),
-        "total_spend": total_spend,
-        "last_activity": (
-            last_activity.created_at if last_activity is not None else user.created_at
-        ),
-        "tags": tags,
-    }
-
-
-def _order_with_product_payload(order: Order) -> dict[str, object]:
-    product_image: str | None = None
-    images = order.product.images
-    if isinstance(images, list) and images:
-        first = images[0]
-        if isinstance(first, str):
-            product_image = first
-
-    return {
-        "id": order.id,
-        "order_code": order.order_code,
-        "product_id": order.product_id,
-        "name": order.name,
-        "email": order.email,
-        "whatsapp": order.whatsapp,
-        "notes": order.notes,
-        "status": order.status,
-        "created_at": order.created_at,
-        "updated_at": order.updated_at,
-        "product_title": order.product.title,
-        "product_price": order.product.price_idr,
-        "product_category": order.product.category,
-        "product_slug": order.product.slug,
-        "product_image": product_image,
-    }
-
-
-def _log_activity(
-    customer_id: int, activity_type: str, metadata: dict[str, object] | None = None
-) -> None:
-    ActivityLog.objects.create(
-        customer_id=customer_id,
-        type=activity_type,
-        metadata_json=metadata,
-        created_at=timezone.now(),
-    )
+
+def _customer_summary_serializer(fields: Sequence[str]) -> CustomerSummarySerializer:
+    serializer = CustomerSummarySerializer()
+    for name in CUSTOMER_FIELDS:
+        if name not in fields:
+            del serializer.fields[name]
+    return serializer
 
 
 class AdminStatsView(APIView):
@@ -216,8 +220,9 @@ class AdminCustomerListView(APIView):
         _sort = request.query_params.get("sort", "activity")
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 20, minimum=1, maximum=100)
+        fields = parse_fields(request, CUSTOMER_FIELDS)
 
-        query = User.objects.all()
+        query = User.objects.only(*CUSTOMER_USER_FIELDS)
 
         if search:
             query = query.filter(
@@ -231,54 +236,55 @@ class AdminCustomerListView(APIView):
         offset = (page - 1) * page_size
         paged_users = users[offset : offset + page_size]
 
-        items = [_build_customer_summary(user) for user in paged_users]
-        return Response(CustomerSummarySerializer(items, many=True).data)
+        items = _build_customer_summaries(list(paged_users), fields)
+        serializer = _customer_summary_serializer(fields)
+        return Response([serializer.to_representation(item) for item in items])
 
 
 class AdminCustomerDetailView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
 
-    def get(self, _request: Request, customer_id: int) -> Response:
-        user = User.objects.filter(id=customer_id).first()
+    def get(self, request: Request, customer_id: int) -> Response:
+        fields = parse_fields(request, CUSTOMER_FIELDS)
+        user = User.objects.only(*CUSTOMER_USER_FIELDS).filter(id=customer_id).first()
         if user is None:
             return Response(
                 {"detail": "Customer not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        payload = _build_customer_summary(user)
-        return Response(CustomerSummarySerializer(payload).data)
+        payload = _build_customer_summaries([user], fields)[0]
+        return Response(_customer_summary_serializer(fields).to_representation(payload))
 
 
 class AdminCustomerOrdersView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
-    def get(self, _request: Request, customer_id: int) -> Response:
-        orders = (
-            Order.objects.select_related("product")
-            .filter(user_id=customer_id)
-            .order_by("-created_at")
-        )
-        payload = [_order_with_product_payload(order) for order in orders]
-        return Response(OrderWithProductSerializer(payload, many=True).data)
+    def get(self, request: Request, customer_id: int) -> Response:
+        orders = Order.objects.filter(user_id=customer_id).order_by("-created_at")
+        values = select_fields(request, ORDER_WITH_PRODUCT_VALUES)
+        return Response(values.serialize(orders))
 
 
 class AdminCustomerTicketsView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
-    def get(self, _request: Request, customer_id: int) -> Response:
+    def get(self, request: Request, customer_id: int) -> Response:
         tickets = Ticket.objects.filter(user_id=customer_id).order_by("-created_at")
-        return Response(TicketResponseSerializer(tickets, many=True).data)
+        return Response(select_fields(request, TICKET_VALUES).serialize(tickets))
 
 
 class AdminCustomerTagsView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
-    def get(self, _request: Request, customer_id: int) -> Response:
+    def get(self, request: Request, customer_id: int) -> Response:
         tags = CustomerTag.objects.filter(customer_id=customer_id)
-        return Response(CustomerTagResponseSerializer(tags, many=True).data)
+        return Response(select_fields(request, CUSTOMER_TAG_VALUES).serialize(tags))
 
     def post(self, request: Request, customer_id: int) -> Response:
         serializer = CustomerTagCreateSerializer(data=request.data)
@@ -303,7 +309,7 @@ class AdminCustomerTagsView(APIView):
             tag=tag_name,
             created_at=timezone.now(),
         )
-        _log_activity(customer_id, "tag_added", metadata={"tag": tag_name})
+        log_activity(customer_id, "tag_added", metadata={"tag": tag_name})
         return Response(CustomerTagResponseSerializer(tag).data)
 
 
@@ -313,19 +319,20 @@ class AdminCustomerTagDeleteView(APIView):
 
     def delete(self, _request: Request, customer_id: int, tag_name: str) -> Response:
         CustomerTag.objects.filter(customer_id=customer_id, tag=tag_name).delete()
-        _log_activity(customer_id, "tag_removed", metadata={"tag": tag_name})
+        log_activity(customer_id, "tag_removed", metadata={"tag": tag_name})
         return Response({"status": "ok"})
 
 
 class AdminCustomerNotesView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
-    def get(self, _request: Request, customer_id: int) -> Response:
+    def get(self, request: Request, customer_id: int) -> Response:
         notes = CustomerNote.objects.filter(customer_id=customer_id).order_by(
             "-created_at"
         )
-        return Response(CustomerNoteResponseSerializer(notes, many=True).data)
+        return Response(select_fields(request, CUSTOMER_NOTE_VALUES).serialize(notes))
 
     def post(self, request: Request, customer_id: int) -> Response:
         serializer = CustomerNoteCreateSerializer(data=request.data)
@@ -347,16 +354,29 @@ class AdminCustomerNotesView(APIView):
             created_by_admin=admin_username,
             created_at=timezone.now(),
         )
-        _log_activity(customer_id, "note_added")
+        log_activity(customer_id, "note_added")
         return Response(CustomerNoteResponseSerializer(note).data)
 
 
 class AdminCustomerActivityView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
-
-    def get(self, _request: Request, customer_id: int) -> Response:
-        activity_items = ActivityLog.objects.filter(customer_id=customer_id).order_by(
-            "-created_at"
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
+
+    def get(self, request: Request, customer_id: int) -> Response:
+        # Newest first, hot table and live partitions; the whole timeline
+        # unless ``limit`` is given. ``before``/``before_id`` are the
+        # created_at and id of the last item seen.
+        limit = _parse_int_query(request, "limit", 0, minimum=1, maximum=500)
+        before_id = _parse_int_query(request, "before_id", 0, minimum=1)
+        before = None
+        if raw_before := request.query_params.get("before"):
+            try:
+                before = serializers.DateTimeField().to_internal_value(raw_before)
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"before": exc.detail}) from exc
+
+        activity_items = customer_timeline(
+            customer_id, limit or None, before, before_id or None
         )
-        return Response(ActivityLogResponseSerializer(activity_items, many=True).data)
+        return Response(ACTIVITY_LOG_VALUES.serialize_objects(activity_items))
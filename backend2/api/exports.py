@@ -0,0 +1,91 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+"""Streaming CSV / NDJSON exports.
+
+Items come from ``ValuesSerializer.iterate`` (a server-side cursor) and are
+encoded in blocks of ``EXPORT_CHUNK_SIZE``, so memory use depends on the chunk
+size, not on the export size. Timestamps are written in UTC as ISO 8601 with
+a ``Z`` suffix whatever ``TIME_ZONE`` is, the same as the FastAPI exports.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any
+
+import orjson
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Always pick the first renderer.
+
+    Export views read ``?format=`` themselves; DRF's default negotiation would
+    treat it as a renderer override and answer 404 for ``csv``/``ndjson``.
+    Error responses are therefore always JSON.
+    """
+
+    def select_parser(self, request: Request, parsers: list[Any]) -> Any:
+        return parsers[0] if parsers else None
+
+    def select_renderer(
+        self,
+        request: Request,
+        renderers: list[BaseRenderer],
+        format_suffix: str | None = None,
+    ) -> tuple[BaseRenderer, str]:
+        renderer = renderers[0]
+        return renderer, renderer.media_type
+
+
+def export_timestamp(value: datetime | None) -> str | None:
+    """``created_at``-style value as written to exports: UTC, ``Z`` suffix."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.isoformat() + "Z"
+
+
+def _chunks(
+    items: Iterable[dict[str, Any]], chunk_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def encode_csv(
+    items: Iterable[dict[str, Any]],
+    fieldnames: Sequence[str],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    yield buffer.getvalue().encode()
+
+    for chunk in _chunks(items, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        for item in chunk:
+            writer.writerow([item[name] for name in fieldnames])
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(
+    items: Iterable[dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    for chunk in _chunks(items, chunk_size):
+        yield b"".join(orjson.dumps(item) + b"\n" for item in chunk)
@@ -0,0 +1,136 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+"""Read-only fast path for list serializers.
+
+``ValuesSerializer`` is compiled once from an existing DRF serializer class. It
+reads rows with ``values_list()`` instead of model instances and only runs a
+converter for fields whose representation differs from the database value
+(datetimes, plus any explicit transform), so its output matches the DRF
+serializer it was built from.
+
+Views serving these rows take ``fields=`` (sparse fieldsets): a
+comma-separated list of response fields. ``select_fields`` narrows the
+serializer to them, so only their columns are selected, and relations only
+read by other fields are not joined.
+"""
+
+import copy
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+Converter = Callable[[Any], Any]
+
+
+def datetime_representation(value: datetime | None) -> str | None:
+    """Same output as ``serializers.DateTimeField().to_representation``."""
+    if not value:
+        return None
+    if settings.USE_TZ:
+        current = timezone.get_current_timezone()
+        if timezone.is_aware(value):
+            value = value.astimezone(current)
+        else:
+            value = timezone.make_aware(value, current)
+    elif timezone.is_aware(value):
+        value = timezone.make_naive(value, UTC)
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+class ValuesSerializer:
+    def __init__(
+        self,
+        serializer_class: type[serializers.Serializer[Any]],
+        sources: Mapping[str, str] | None = None,
+        transforms: Mapping[str, Converter] | None = None,
+    ) -> None:
+        sources = sources or {}
+        transforms = transforms or {}
+        fields = serializer_class().fields
+
+        self.names: tuple[str, ...] = tuple(fields)
+        self.lookups: tuple[str, ...] = tuple(
+            sources.get(name, name) for name in self.names
+        )
+        converters: list[tuple[int, Converter]] = []
+        for index, (name, field) in enumerate(fields.items()):
+            if name in transforms:
+                converters.append((index, transforms[name]))
+            elif isinstance(field, serializers.DateTimeField):
+                converters.append((index, datetime_representation))
+        self.converters: tuple[tuple[int, Converter], ...] = tuple(converters)
+
+    def only(self, names: Iterable[str]) -> "ValuesSerializer":
+        """A copy reading just ``names``, kept in field order."""
+        wanted = set(names)
+        indexes = [index for index, name in enumerate(self.names) if name in wanted]
+        if len(indexes) == len(self.names):
+            return self
+        position = {old: new for new, old in enumerate(indexes)}
+        narrowed = copy.copy(self)
+        narrowed.names = tuple(self.names[index] for index in indexes)
+        narrowed.lookups = tuple(self.lookups[index] for index in indexes)
+        narrowed.converters = tuple(
+            (position[index], convert)
+            for index, convert in self.converters
+            if index in position
+        )
+        return narrowed
+
+    def serialize(self, queryset: QuerySet[Any]) -> list[dict[str, Any]]:
+        return list(self._items(queryset.values_list(*self.lookups)))
+
+    def serialize_objects(self, objects: Iterable[Any]) -> list[dict[str, Any]]:
+        """Like ``serialize``, for instances already read (e.g. by ``raw()``).
+
+        Every lookup must be an attribute of the instances.
+        """
+        lookups = self.lookups
+        rows = (tuple(getattr(obj, name) for name in lookups) for obj in objects)
+        return list(self._items(rows))
+
+    def iterate(
+        self, queryset: QuerySet[Any], chunk_size: int
+    ) -> Iterator[dict[str, Any]]:
+        """Like ``serialize`` but streamed through a server-side cursor."""
+        rows = queryset.values_list(*self.lookups).iterator(chunk_size=chunk_size)
+        return self._items(rows)
+
+    def _items(self, rows: Iterable[tuple[Any, ...]]) -> Iterator[dict[str, Any]]:
+        names = self.names
+        converters = self.converters
+        for row in rows:
+            if converters:
+                row = list(row)
+                for index, convert in converters:
+                    row[index] = convert(row[index])
+            yield dict(zip(names, row, strict=True))
+
+
+def parse_fields(request: Request, available: Sequence[str]) -> list[str]:
+    """Names requested by ``fields=``, in ``available`` order; all when empty."""
+    raw = request.query_params.get("fields") or ""
+    wanted = {name.strip() for name in raw.split(",")} - {""}
+    if not wanted:
+        return list(available)
+    unknown = wanted.difference(available)
+    if unknown:
+        raise ValidationError(
+            {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}"]}
+        )
+    return [name for name in available if name in wanted]
+
+
+def select_fields(request: Request, values: ValuesSerializer) -> ValuesSerializer:
+    """``values`` narrowed to the fields requested by ``fields=``."""
+    return values.only(parse_fields(request, values.names))
@@ -3,17 +3,36 @@
 import re
 import secrets
 import string
+from datetime import date, datetime, time, timedelta
 from typing import cast
 
+from django.db import transaction
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.activity import log_activity
 from api.authentication import JWTAuthentication, JWTUser
+from api.cache_control import ORDER_STATUS, CachePolicy
+from api.exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_CONTENT_TYPES,
+    ExportContentNegotiation,
+    encode_csv,
+    encode_ndjson,
+    export_timestamp,
+)
+from api.fastserializers import ValuesSerializer, select_fields
+from api.pagination import count_total, page_items, parse_count_mode
 from api.permissions import IsJWTAdmin, IsJWTUser
+from api.renderers import FastJSONRenderer
+from api.sales_rollup import apply_sales_deltas, order_created, status_changed
 from legacydb.models import ActivityLog, Order, Product, User
 
 
@@ -60,10 +79,34 @@ class OrderCreateSerializer(serializers.Serializer[dict[str, object]]):
         return cleaned
 
 
+VALID_ORDER_STATUSES = ("pending", "confirmed", "completed", "cancelled")
+
+
 class OrderStatusUpdateSerializer(serializers.Serializer[dict[str, object]]):
     status: serializers.CharField = serializers.CharField()
 
 
+class OrderBulkStatusUpdateSerializer(serializers.Serializer[dict[str, object]]):
+    status: serializers.CharField = serializers.CharField()
+    order_ids: serializers.ListField = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    order_codes: serializers.ListField = serializers.ListField(
+        child=serializers.CharField(), required=False, max_length=1000
+    )
+
+
+class OrderExportQuerySerializer(serializers.Serializer[dict[str, object]]):
+    format: serializers.ChoiceField = serializers.ChoiceField(
+        choices=("csv", "ndjson"), default="csv"
+    )
+    status: serializers.CharField = serializers.CharField(
+        required=False, allow_blank=True
+    )
+    date_from: serializers.DateField = serializers.DateField(required=False)
+    date_to: serializers.DateField = serializers.DateField(required=False)
+
+
 class OrderResponseSerializer(serializers.ModelSerializer[Order]):
     class Meta:
         model: type[Order] = Order
@@ -115,24 +158,27 @@ class OrderWithProductSerializer(OrderResponseSerializer):
         )
 
 
-def _order_with_product_payload(order: Order) -> dict[str, object]:
-    return {
-        "id": order.id,
-        "order_code": order.order_code,
-        "product_id": order.product_id,
-        "name": order.name,
-        "email": order.email,
-        "whatsapp": order.whatsapp,
-        "notes": order.notes,
-        "status": order.status,
-        "created_at": order.created_at,
-        "updated_at": order.updated_at,
-        "product_title": order.product.title,
-        "product_price": order.product.price_idr,
-        "product_category": order.product.category,
-        "product_slug": order.product.slug,
-        "product_image": _first_product_image(order.product.images),
-    }
+ORDER_PRODUCT_SOURCES = {
+    "product_title": "product__title",
+    "product_price": "product__price_idr",
+    "product_category": "product__category",
+    "product_slug": "product__slug",
+    "product_image": "product__images",
+}
+ORDER_WITH_PRODUCT_VALUES = ValuesSerializer(
+    OrderWithProductSerializer,
+    sources=ORDER_PRODUCT_SOURCES,
+    transforms={"product_image": _first_product_image},
+)
+ORDER_EXPORT_VALUES = ValuesSerializer(
+    OrderWithProductSerializer,
+    sources=ORDER_PRODUCT_SOURCES,
+    transforms={
+        "product_image": _first_product_image,
+        "created_at": export_timestamp,
+        "updated_at": export_timestamp,
+    },
+)
 
 
 def _parse_int_query(
@@ -171,21 +217,6 @@ def _parse_int_query(
     return value
 
 
-def _log_activity(
-    user_id: int,
-    activity_type: str,
-    reference_id: str | None = None,
-    metadata: dict[str, object] | None = None,
-) -> None:
-    ActivityLog.objects.create(
-        customer_id=user_id,
-        type=activity_type,
-        reference_id=reference_id,
-        metadata_json=metadata,
-        created_at=timezone.now(),
-    )
-
-
 class CreateOrderView(APIView):
     authentication_classes: list[type] = []
     permission_classes: list[type] = []
@@ -212,23 +243,27 @@ class CreateOrderView(APIView):
         email = str(validated_data["email"])
         user = User.objects.filter(email=email).first()
         now = timezone.now()
-        order = Order.objects.create(
-            order_code=_generate_unique_order_code(),
-            product_id=product_id,
-            user_id=user.id if user is not None else None,
-            name=str(validated_data["name"]),
-            email=email,
-            whatsapp=str(validated_data["whatsapp"]),
-            notes=cast(str | None, validated_data.get("notes")),
-            status="pending",
-            created_at=now,
-            updated_at=now,
-        )
+        with transaction.atomic():
+            order = Order.objects.create(
+                order_code=_generate_unique_order_code(),
+                product_id=product_id,
+                user_id=user.id if user is not None else None,
+                name=str(validated_data["name"]),
+                email=email,
+                whatsapp=str(validated_data["whatsapp"]),
+                notes=cast(str | None, validated_data.get("notes")),
+                status="pending",
+                created_at=now,
+                updated_at=now,
+            )
+            apply_sales_deltas(
+                order_created(now, product.id, product.category, product.price_idr)
+            )
 
         if user is not None:
-            _log_activity(
-                user_id=user.id,
-                activity_type="order_created",
+            log_activity(
+                user.id,
+                "order_created",
                 reference_id=order.order_code,
                 metadata={"product": product.title, "price": product.price_idr},
             )
@@ -242,6 +277,7 @@ class CreateOrderView(APIView):
 class MyOrdersView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTUser]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         jwt_user = request.user
@@ -259,24 +295,16 @@ class MyOrdersView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        orders = (
-            Order.objects.select_related("product")
-            .filter(user_id=user.id)
-            .order_by("-created_at")
-        )
+        orders = Order.objects.filter(user_id=user.id).order_by("-created_at")
 
-        items = [_order_with_product_payload(order) for order in orders]
-        return Response(
-            {
-                "items": OrderWithProductSerializer(items, many=True).data,
-                "total": len(items),
-            }
-        )
+        items = select_fields(request, ORDER_WITH_PRODUCT_VALUES).serialize(orders)
+        return Response({"items": items, "total": len(items)})
 
 
 class PublicOrderStatusView(APIView):
     authentication_classes: list[type] = []
     permission_classes: list[type] = []
+    cache_policy: CachePolicy = ORDER_STATUS
 
     def get(self, _request: Request, order_code: str) -> Response:
         order = (
@@ -304,27 +332,82 @@ class PublicOrderStatusView(APIView):
 class AdminOrderListView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         status_filter = request.query_params.get("status")
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 20, minimum=1, maximum=100)
+        count = parse_count_mode(request)
 
-        query = Order.objects.select_related("product").all()
-        if status_filter and status_filter != "all":
+        query = Order.objects.all()
+        filtered = bool(status_filter and status_filter != "all")
+        if filtered:
             query = query.filter(status=status_filter)
 
-        total = query.count()
-        offset = (page - 1) * page_size
-        orders = query.order_by("-created_at")[offset : offset + page_size]
-        items = [_order_with_product_payload(order) for order in orders]
+        total, exact = count_total(query, count, None if filtered else Order)
+        items, has_more = page_items(
+            select_fields(request, ORDER_WITH_PRODUCT_VALUES),
+            query.order_by("-created_at"),
+            page,
+            page_size,
+        )
 
         return Response(
-            {
-                "items": OrderWithProductSerializer(items, many=True).data,
-                "total": total,
-            }
+            {"items": items, "total": total, "exact": exact, "has_more": has_more}
+        )
+
+
+def _invalid_status_response() -> Response:
+    return Response(
+        {"detail": f"Status tidak valid. Gunakan: {', '.join(VALID_ORDER_STATUSES)}"},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def _start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class AdminOrderExportView(APIView):
+    authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
+    permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    content_negotiation_class: type[ExportContentNegotiation] = ExportContentNegotiation
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        serializer = OrderExportQuerySerializer(data=request.query_params)
+        _ = serializer.is_valid(raise_exception=True)
+        params = cast(dict[str, object], serializer.validated_data)
+        export_format = cast(str, params["format"])
+        status_filter = params.get("status")
+        date_from = cast(date | None, params.get("date_from"))
+        date_to = cast(date | None, params.get("date_to"))
+
+        query = Order.objects.all()
+        if status_filter and status_filter != "all":
+            query = query.filter(status=status_filter)
+        if date_from is not None:
+            query = query.filter(created_at__gte=_start_of_day(date_from))
+        if date_to is not None:
+            query = query.filter(
+                created_at__lt=_start_of_day(date_to + timedelta(days=1))
+            )
+
+        items = ORDER_EXPORT_VALUES.iterate(
+            query.order_by("-created_at", "-id"), chunk_size=EXPORT_CHUNK_SIZE
         )
+        if export_format == "csv":
+            body = encode_csv(items, ORDER_EXPORT_VALUES.names)
+        else:
+            body = encode_ndjson(items)
+
+        response = StreamingHttpResponse(
+            body, content_type=EXPORT_CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="orders.{export_format}"'
+        )
+        return response
 
 
 class AdminOrderStatusUpdateView(APIView):
@@ -342,33 +425,151 @@ class AdminOrderStatusUpdateView(APIView):
             )
 
         new_status = str(validated_data_raw.get("status", ""))
-        valid_statuses = ["pending", "confirmed", "completed", "cancelled"]
-        if new_status not in valid_statuses:
-            return Response(
-                {
-                    "detail": "Status tidak valid. Gunakan: pending, confirmed, completed, cancelled"
-                },
-                status=status.HTTP_400_BAD_REQUEST,
+        if new_status not in VALID_ORDER_STATUSES:
+            return _invalid_status_response()
+
+        with transaction.atomic():
+            order = (
+                Order.objects.select_for_update(of=("self",))
+                .select_related("product")
+                .filter(id=order_id)
+                .first()
             )
-
-        order = Order.objects.filter(id=order_id).first()
-        if order is None:
-            return Response(
-                {"detail": "Order tidak ditemukan"},
-                status=status.HTTP_404_NOT_FOUND,
+            if order is None:
+                return Response(
+                    {"detail": "Order tidak ditemukan"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            old_status = order.status
+            order.status = new_status
+            order.updated_at = timezone.now()
+            order.save(update_fields=["status", "updated_at"])
+            apply_sales_deltas(
+                status_changed(
+                    order.created_at,
+                    old_status,
+                    new_status,
+                    order.product_id,
+                    order.product.category,
+                    order.product.price_idr,
+                )
             )
 
-        old_status = order.status
-        order.status = new_status
-        order.updated_at = timezone.now()
-        order.save(update_fields=["status", "updated_at"])
-
         if order.user_id is not None:
-            _log_activity(
-                user_id=order.user_id,
-                activity_type="order_status_updated",
+            log_activity(
+                order.user_id,
+                "order_status_updated",
                 reference_id=order.order_code,
                 metadata={"old_status": old_status, "new_status": new_status},
             )
 
         return Response(OrderResponseSerializer(order).data)
+
+
+class AdminOrderBulkStatusView(APIView):
+    authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
+    permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+
+    def post(self, request: Request) -> Response:
+        serializer = OrderBulkStatusUpdateSerializer(data=request.data)
+        _ = serializer.is_valid(raise_exception=True)
+        validated_data = cast(dict[str, object], serializer.validated_data)
+
+        new_status = str(validated_data["status"])
+        if new_status not in VALID_ORDER_STATUSES:
+            return _invalid_status_response()
+        order_ids = list(
+            dict.fromkeys(cast(list[int], validated_data.get("order_ids", [])))
+        )
+        order_codes = list(
+            dict.fromkeys(
+                code.upper()
+                for code in cast(list[str], validated_data.get("order_codes", []))
+            )
+        )
+        if not order_ids and not order_codes:
+            return Response(
+                {"detail": "Berikan order_ids atau order_codes"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            rows = list(
+                Order.objects.select_for_update(of=("self",))
+                .filter(Q(id__in=order_ids) | Q(order_code__in=order_codes))
+                .values(
+                    "id",
+                    "order_code",
+                    "user_id",
+                    "status",
+                    "created_at",
+                    "product_id",
+                    "product__category",
+                    "product__price_idr",
+                )
+            )
+            changed = [row for row in rows if row["status"] != new_status]
+            if changed:
+                now = timezone.now()
+                Order.objects.filter(id__in=[row["id"] for row in changed]).update(
+                    status=new_status, updated_at=now
+                )
+                ActivityLog.objects.bulk_create(
+                    [
+                        ActivityLog(
+                            customer_id=row["user_id"],
+                            type="order_status_updated",
+                            reference_id=row["order_code"],
+                            metadata_json={
+                                "old_status": row["status"],
+                                "new_status": new_status,
+                            },
+                            created_at=now,
+                        )
+                        for row in changed
+                        if row["user_id"] is not None
+                    ]
+                )
+                apply_sales_deltas(
+                    delta
+                    for row in changed
+                    for delta in status_changed(
+                        row["created_at"],
+                        row["status"],
+                        new_status,
+                        row["product_id"],
+                        row["product__category"],
+                        row["product__price_idr"],
+                    )
+                )
+
+        by_id = {row["id"]: row for row in rows}
+        by_code = {row["order_code"]: row for row in rows}
+        results: list[dict[str, object]] = []
+        counts = {"updated": 0, "unchanged": 0, "not_found": 0}
+        reported: set[int] = set()
+        refs: list[tuple[int | str, dict[str, object] | None]] = [
+            (order_id, by_id.get(order_id)) for order_id in order_ids
+        ] + [(code, by_code.get(code)) for code in order_codes]
+        for ref, row in refs:
+            if row is not None and row["id"] in reported:
+                continue  # same order given by both id and code
+            if row is None:
+                outcome = "not_found"
+                results.append({"ref": ref, "outcome": outcome})
+            else:
+                outcome = "unchanged" if row["status"] == new_status else "updated"
+                results.append(
+                    {
+                        "ref": ref,
+                        "outcome": outcome,
+                        "order_id": row["id"],
+                        "order_code": row["order_code"],
+                        "old_status": row["status"],
+                    }
+                )
+                reported.add(cast(int, row["id"]))
+            counts[outcome] += 1
+
+        return Response({"status": new_status, **counts, "results": results})
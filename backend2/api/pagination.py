@@ -0,0 +1,207 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Totals and pages for paginated list views.
+
+List views take ``count=``:
+
+- ``exact`` (default): the exact total. It is cached per filter signature
+  (the table and the WHERE clause's SQL and parameters, whatever the sort
+  order or selected fields) until a statement writing one of
+  the queried tables runs through this process's connections, or for
+  ``COUNT_CACHE_TTL`` seconds, which bounds staleness for writes made by
+  other processes (such as the FastAPI backend).
+- ``estimate``: like ``exact``, except that a cold cache on a large
+  unfiltered table (``COUNT_ESTIMATE_MIN_ROWS``) is answered from table
+  statistics and flagged ``exact: false``.
+- ``none``: no count at all (``total: null``), for infinite scroll.
+
+Every page is read with one extra row, so ``has_more`` is exact whatever
+the count mode.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Hashable
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet, FullResultSet
+from django.db import connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import Max, Model, QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from api.fastserializers import ValuesSerializer
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+_WRITE_STATEMENT = re.compile(
+    r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+[`\"]?(\w+)", re.IGNORECASE
+)
+
+
+class CountCache:
+    """Exact counts per filter signature, dropped when their tables change."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, {table: generation}, count)
+        self._entries: OrderedDict[Hashable, tuple[float, dict[str, int], int]] = (
+            OrderedDict()
+        )
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def snapshot(self, tables: set[str]) -> dict[str, int]:
+        """Generations to pass to ``put`` for a count about to be run."""
+        with self._lock:
+            return {table: self._generations[table] for table in tables}
+
+    def get(self, key: Hashable) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, generations, count = entry
+            if expires_at < time.monotonic() or any(
+                self._generations[table] != generation
+                for table, generation in generations.items()
+            ):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count
+
+    def put(self, key: Hashable, generations: dict[str, int], count: int) -> None:
+        """Store ``count`` unless a table changed since ``snapshot``."""
+        with self._lock:
+            if any(
+                self._generations[table] != generation
+                for table, generation in generations.items()
+            ):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, generations, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def invalidate(self, tables: set[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
+
+
+def parse_count_mode(request: Request) -> str:
+    mode = request.query_params.get("count", "exact")
+    if mode not in COUNT_MODES:
+        raise ValidationError({"count": [f"Must be one of: {', '.join(COUNT_MODES)}."]})
+    return mode
+
+
+def estimate_rows(model: type[Model]) -> int | None:
+    """Row count of ``model``'s table from statistics, without scanning it.
+
+    PostgreSQL's planner estimate (None before the first ANALYZE); elsewhere
+    the highest primary key, which over-counts deleted rows.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+    return model.objects.aggregate(highest=Max("pk"))["highest"] or 0
+
+
+def filter_signature(queryset: QuerySet[Any]) -> Hashable:
+    """The table and WHERE clause of ``queryset``, its count cache key."""
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    try:
+        where, params = compiler.compile(query.where)
+    except EmptyResultSet:
+        where, params = "<none>", []
+    except FullResultSet:
+        where, params = "", []
+    return (query.model._meta.db_table, query.distinct, where, tuple(params))
+
+
+def count_total(
+    queryset: QuerySet[Any],
+    mode: str = "exact",
+    estimate_model: type[Model] | None = None,
+) -> tuple[int | None, bool]:
+    """``(total, exact)`` of ``queryset`` for the given count mode.
+
+    Pass ``estimate_model`` when ``queryset`` lists a whole table, unfiltered.
+    """
+    if mode == "none":
+        return None, True
+
+    queryset = queryset.order_by()
+    key = filter_signature(queryset)
+    total = count_cache.get(key)
+    if total is not None:
+        return total, True
+
+    if mode == "estimate" and estimate_model is not None:
+        estimate = estimate_rows(estimate_model)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+            return estimate, False
+
+    tables = {alias.table_name for alias in queryset.query.alias_map.values()}
+    tables.add(queryset.model._meta.db_table)
+    generations = count_cache.snapshot(tables)
+    total = queryset.count()
+    count_cache.put(key, generations, total)
+    return total, True
+
+
+def page_items(
+    serializer: ValuesSerializer,
+    queryset: QuerySet[Any],
+    page: int,
+    page_size: int,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Serialized rows of ``page`` and whether another page follows."""
+    offset = (page - 1) * page_size
+    items = serializer.serialize(queryset[offset : offset + page_size + 1])
+    return items[:page_size], len(items) > page_size
+
+
+def _invalidate_on_write(execute, sql, params, many, context):
+    result = execute(sql, params, many, context)
+    match = _WRITE_STATEMENT.match(sql)
+    if match:
+        tables = {match.group(1)}
+        # Now for reads in this transaction, and again once other
+        # connections can see the rows.
+        count_cache.invalidate(tables)
+        transaction.on_commit(
+            lambda: count_cache.invalidate(tables),
+            using=context["connection"].alias,
+        )
+    return result
+
+
+def _install_write_hook(sender, connection, **kwargs) -> None:
+    if _invalidate_on_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_invalidate_on_write)
+
+
+connection_created.connect(_install_write_hook)
+for _connection in connections.all(initialized_only=True):
+    _install_write_hook(None, _connection)
@@ -0,0 +1,113 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Product detail lookup by id or slug in a single query.
+
+``ProductDetailView`` used to query by id and, on a miss, again by slug, so
+numeric-looking slugs cost two queries. ``product_resolver`` reads the
+product in one query either way:
+
+- digits match the id or the slug, the id winning as before;
+- slugs seen before are read by primary key from an in-process slug -> id
+  map; the slug is checked on the row, so a slug changed by another process
+  only costs a second query, once;
+- keys that matched no active product are answered with a 404 from a
+  negative cache for ``PRODUCT_LOOKUP_NEGATIVE_TTL`` seconds.
+
+Both caches are cleared when a transaction that saved or deleted a Product
+in this process commits, e.g. when ``AdminProductUpdateView`` changes a
+slug. Clearing any earlier would let a concurrent lookup cache the
+uncommitted state (a new product as missing) for the rest of the TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+
+from legacydb.models import Product
+
+
+class ProductResolver:
+    """Resolve ``id_or_slug`` to an active product, caching slugs and misses."""
+
+    def __init__(self, negative_ttl: float = 30.0, max_entries: int = 10_000):
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._ids: OrderedDict[str, int] = OrderedDict()  # slug -> id
+        self._missing: OrderedDict[str, float] = OrderedDict()  # key -> expires_at
+        self._lock = threading.Lock()
+
+    def resolve(self, id_or_slug: str) -> Product | None:
+        if self._is_missing(id_or_slug):
+            return None
+
+        products = Product.objects.filter(is_active=True)
+        if id_or_slug.isdigit():
+            number = int(id_or_slug)
+            product = (
+                products.filter(Q(id=number) | Q(slug=id_or_slug))
+                .order_by(
+                    Case(
+                        When(id=number, then=Value(0)),
+                        default=Value(1),
+                        output_field=IntegerField(),
+                    )
+                )
+                .first()
+            )
+        else:
+            with self._lock:
+                product_id = self._ids.get(id_or_slug)
+            product = None
+            if product_id is not None:
+                product = products.filter(id=product_id).first()
+                if product is not None and product.slug != id_or_slug:
+                    product = None  # renamed by another process
+            if product is None:
+                product = products.filter(slug=id_or_slug).first()
+
+        with self._lock:
+            if product is None:
+                _ = self._ids.pop(id_or_slug, None)
+                self._missing[id_or_slug] = time.monotonic() + self.negative_ttl
+                self._trim(self._missing)
+            elif product.slug == id_or_slug:
+                self._ids[id_or_slug] = product.id
+                self._ids.move_to_end(id_or_slug)
+                self._trim(self._ids)
+        return product
+
+    def clear(self, **_kwargs: Any) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._missing.clear()
+
+    def _is_missing(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._missing.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._missing[key]
+                return False
+            return True
+
+    def _trim(self, entries: OrderedDict[str, Any]) -> None:
+        while len(entries) > self.max_entries:
+            _ = entries.popitem(last=False)
+
+
+product_resolver = ProductResolver(negative_ttl=settings.PRODUCT_LOOKUP_NEGATIVE_TTL)
+
+
+def _clear_on_commit(using: str, **_kwargs: Any) -> None:
+    transaction.on_commit(product_resolver.clear, using=using)
+
+
+post_save.connect(_clear_on_commit, sender=Product, weak=False)
+post_delete.connect(_clear_on_commit, sender=Product, weak=False)
@@ -3,19 +3,27 @@
 from math import ceil
 from typing import cast
 
+from django.db import transaction
 from django.db.models import Q, QuerySet
 from django.utils import timezone
 from rest_framework import serializers, status
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from legacydb.models import Product
+from legacydb.models import Product, RelatedProduct
 
 from .authentication import JWTAuthentication
+from .cache_control import CATALOG, CachePolicy
+from .catalog import bump_catalog_version
+from .fastserializers import ValuesSerializer, select_fields
+from .pagination import count_total, page_items, parse_count_mode
 from .permissions import IsJWTAdmin
+from .product_lookup import product_resolver
+from .renderers import FastJSONRenderer
 
 
 class ProductResponseSerializer(serializers.ModelSerializer[Product]):
@@ -36,6 +44,63 @@ class ProductResponseSerializer(serializers.ModelSerializer[Product]):
         )
 
 
+PRODUCT_VALUES = ValuesSerializer(ProductResponseSerializer)
+
+
+class ProductCardSerializer(serializers.ModelSerializer[Product]):
+    """Listing item: ``ProductResponseSerializer`` without ``description_full``."""
+
+    class Meta:
+        model: type[Product] = Product
+        fields: tuple[str, ...] = (
+            "id",
+            "title",
+            "slug",
+            "description_short",
+            "price_idr",
+            "category",
+            "badges",
+            "images",  # first image only
+            "is_active",
+            "created_at",
+        )
+
+
+def _single_image(image: str | None) -> list[str] | None:
+    return [image] if image is not None else None
+
+
+# Only the first image is read from the database.
+PRODUCT_CARD_VALUES = ValuesSerializer(
+    ProductCardSerializer,
+    sources={"images": "images__0"},
+    transforms={"images": _single_image},
+)
+
+PRODUCT_VIEWS = {"card": PRODUCT_CARD_VALUES, "full": PRODUCT_VALUES}
+
+
+class RelatedProductSerializer(serializers.ModelSerializer[Product]):
+    class Meta:
+        model: type[Product] = Product
+        fields: tuple[str, ...] = (
+            "id",
+            "slug",
+            "title",
+            "price_idr",
+            "category",
+            "badges",
+            "images",
+        )
+
+
+# Read from related_products rows, so every field comes from ``related``.
+RELATED_PRODUCT_VALUES = ValuesSerializer(
+    RelatedProductSerializer,
+    sources={name: f"related__{name}" for name in RelatedProductSerializer.Meta.fields},
+)
+
+
 class ProductCreateSerializer(serializers.Serializer[dict[str, object]]):
     title: serializers.CharField = serializers.CharField(max_length=200)
     slug: serializers.CharField = serializers.CharField(max_length=100)
@@ -120,26 +185,43 @@ def _parse_int_query(
     return value
 
 
+def _parse_view(request: Request) -> ValuesSerializer:
+    view = request.query_params.get("view", "card")
+    if view not in PRODUCT_VIEWS:
+        raise ValidationError(
+            {"view": [f"Must be one of: {', '.join(PRODUCT_VIEWS)}."]}
+        )
+    return select_fields(request, PRODUCT_VIEWS[view])
+
+
 def _paginated_payload(
-    queryset: QuerySet[Product], page: int, page_size: int
+    queryset: QuerySet[Product],
+    page: int,
+    page_size: int,
+    count: str = "exact",
+    estimate: bool = False,
+    serializer: ValuesSerializer = PRODUCT_VALUES,
 ) -> dict[str, object]:
-    total = queryset.count()
-    pages = ceil(total / page_size) if total > 0 else 1
-    offset = (page - 1) * page_size
-    items = queryset[offset : offset + page_size]
+    total, exact = count_total(queryset, count, Product if estimate else None)
+    pages = None if total is None else ceil(total / page_size) if total > 0 else 1
+    items, has_more = page_items(serializer, queryset, page, page_size)
 
     return {
-        "items": ProductResponseSerializer(items, many=True).data,
+        "items": items,
         "total": total,
         "page": page,
         "page_size": page_size,
         "pages": pages,
+        "exact": exact,
+        "has_more": has_more,
     }
 
 
 class ProductListView(APIView):
     authentication_classes: list[type] = []
     permission_classes: list[type] = []
+    cache_policy: CachePolicy = CATALOG
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         category = request.query_params.get("category")
@@ -147,6 +229,9 @@ class ProductListView(APIView):
         sort = request.query_params.get("sort", "newest")
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 12, minimum=1, maximum=100)
+        count = parse_count_mode(request)
+        # Cards (the default) skip description_full and all but the first image.
+        serializer = _parse_view(request)
 
         products = Product.objects.filter(is_active=True)
 
@@ -167,28 +252,32 @@ class ProductListView(APIView):
         else:
             products = products.order_by("-created_at")
 
-        return Response(_paginated_payload(products, page, page_size))
+        return Response(
+            _paginated_payload(products, page, page_size, count, serializer=serializer)
+        )
 
 
 class ProductDetailView(APIView):
     authentication_classes: list[type] = []
     permission_classes: list[type] = []
+    cache_policy: CachePolicy = CATALOG
 
     def get(self, _request: Request, id_or_slug: str) -> Response:
-        product = None
-        if id_or_slug.isdigit():
-            product = Product.objects.filter(id=int(id_or_slug), is_active=True).first()
-
-        if product is None:
-            product = Product.objects.filter(slug=id_or_slug, is_active=True).first()
-
+        # One query for ids and slugs; unknown keys are cached as misses.
+        product = product_resolver.resolve(id_or_slug)
         if product is None:
             return Response(
                 {"detail": "Produk tidak ditemukan"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return Response(ProductResponseSerializer(product).data)
+        # Precomputed by the FastAPI backend's python -m app.related_products.
+        related = RelatedProduct.objects.filter(
+            product_id=product.id, related__is_active=True
+        ).order_by("rank")
+        data = dict(ProductResponseSerializer(product).data)
+        data["related"] = RELATED_PRODUCT_VALUES.serialize(related)
+        return Response(data)
 
 
 class AdminProductListView(APIView):
@@ -197,18 +286,29 @@ class AdminProductListView(APIView):
         IsAuthenticated,
         IsJWTAdmin,
     ]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         search = request.query_params.get("search")
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 20, minimum=1, maximum=100)
+        count = parse_count_mode(request)
 
         products = Product.objects.all()
         if search:
             products = products.filter(title__icontains=search)
 
         products = products.order_by("-created_at")
-        return Response(_paginated_payload(products, page, page_size))
+        return Response(
+            _paginated_payload(
+                products,
+                page,
+                page_size,
+                count,
+                estimate=not search,
+                serializer=select_fields(request, PRODUCT_VALUES),
+            )
+        )
 
 
 class AdminProductCreateView(APIView):
@@ -238,7 +338,11 @@ class AdminProductCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        product = Product.objects.create(created_at=timezone.now(), **validated_data)
+        with transaction.atomic():
+            product = Product.objects.create(
+                created_at=timezone.now(), **validated_data
+            )
+            _ = bump_catalog_version()
         return Response(
             ProductResponseSerializer(product).data,
             status=status.HTTP_201_CREATED,
@@ -283,7 +387,9 @@ class AdminProductUpdateView(APIView):
         for field, value in validated_data.items():
             setattr(product, field, value)
 
-        product.save()
+        with transaction.atomic():
+            product.save()
+            _ = bump_catalog_version()
         return Response(ProductResponseSerializer(product).data)
 
 
@@ -303,5 +409,7 @@ class AdminProductToggleActiveView(APIView):
             )
 
         product.is_active = not product.is_active
-        product.save(update_fields=["is_active"])
+        with transaction.atomic():
+            product.save(update_fields=["is_active"])
+            _ = bump_catalog_version()
         return Response(ProductResponseSerializer(product).data)
@@ -0,0 +1,125 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Daily sales rollups, kept in step with the FastAPI backend.
+
+``sales_daily``, ``sales_daily_category`` and ``sales_daily_product`` count
+orders by the UTC day they were created and their current status, with
+revenue at the product price (see backend/app/utils/sales_rollup.py, which
+also rebuilds them: ``python -m app.sales_rollup``). Order writes here call
+``apply_sales_deltas`` in their own transaction, so the FastAPI analytics
+see them: one upsert per table, however many orders a write touches.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import UTC, date, datetime
+from typing import NamedTuple
+
+from django.db import connection
+from django.db.models import Model
+
+from legacydb.models import SalesDaily, SalesDailyCategory, SalesDailyProduct
+
+
+class SalesDelta(NamedTuple):
+    day: date
+    status: str
+    product_id: int
+    category: str
+    price_idr: int
+    orders: int  # +1 or -1
+
+
+def order_day(created_at: datetime) -> date:
+    """UTC day an order counts towards."""
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC)
+    return created_at.date()
+
+
+def order_created(
+    created_at: datetime, product_id: int, category: str, price_idr: int
+) -> list[SalesDelta]:
+    day = order_day(created_at)
+    return [SalesDelta(day, "pending", product_id, category, price_idr, 1)]
+
+
+def status_changed(
+    created_at: datetime,
+    old_status: str,
+    new_status: str,
+    product_id: int,
+    category: str,
+    price_idr: int,
+) -> list[SalesDelta]:
+    if old_status == new_status:
+        return []
+    day = order_day(created_at)
+    return [
+        SalesDelta(day, old_status, product_id, category, price_idr, -1),
+        SalesDelta(day, new_status, product_id, category, price_idr, 1),
+    ]
+
+
+def apply_sales_deltas(deltas: Iterable[SalesDelta]) -> None:
+    """Add ``deltas`` to the rollups inside the caller's transaction."""
+    daily: dict[tuple[object, ...], list[int]] = defaultdict(lambda: [0, 0])
+    by_category: dict[tuple[object, ...], list[int]] = defaultdict(lambda: [0, 0])
+    by_product: dict[tuple[object, ...], list[int]] = defaultdict(lambda: [0, 0])
+    categories: dict[int, str] = {}
+    for delta in deltas:
+        revenue = delta.orders * delta.price_idr
+        for totals in (
+            daily[delta.day, delta.status],
+            by_category[delta.day, delta.status, delta.category],
+            by_product[delta.day, delta.status, delta.product_id],
+        ):
+            totals[0] += delta.orders
+            totals[1] += revenue
+        categories[delta.product_id] = delta.category
+
+    _upsert(SalesDaily, ("day", "status"), _rows(daily))
+    _upsert(SalesDailyCategory, ("day", "status", "category"), _rows(by_category))
+    _upsert(
+        SalesDailyProduct,
+        ("day", "status", "product_id"),
+        [
+            [day, status, product_id, categories[product_id], orders, revenue]
+            for day, status, product_id, orders, revenue in _rows(by_product)
+        ],
+        extra=("category",),
+    )
+
+
+def _rows(totals: dict[tuple[object, ...], list[int]]) -> list[list[object]]:
+    # One row per primary key: PostgreSQL rejects a multi-row upsert that
+    # touches the same row twice. Keys start with the day.
+    adapt_day = connection.ops.adapt_datefield_value
+    return [
+        [adapt_day(key[0]), *key[1:], orders, revenue]
+        for key, (orders, revenue) in totals.items()
+        if orders or revenue
+    ]
+
+
+def _upsert(
+    model: type[Model],
+    keys: Sequence[str],
+    rows: list[list[object]],
+    extra: Sequence[str] = (),
+) -> None:
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [*keys, *extra, "orders", "revenue_idr"]
+    # ON CONFLICT ... DO UPDATE is understood by PostgreSQL and SQLite alike.
+    sql = (
+        f"INSERT INTO {table} ({', '.join(map(quote, columns))})"
+        f" VALUES ({', '.join(['%s'] * len(columns))})"
+        f" ON CONFLICT ({', '.join(map(quote, keys))}) DO UPDATE SET"
+        f" orders = {table}.orders + excluded.orders,"
+        f" revenue_idr = {table}.revenue_idr + excluded.revenue_idr"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
@@ -0,0 +1,62 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false
+
+"""Query-count budget helpers for tests.
+
+``assert_max_queries`` fails when a block issues more SQL statements than its
+budget. ``assert_queries_constant`` runs a callable at several row counts and
+fails when the query count grows with N, which is how an N+1 shows up.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+DEFAULT_SCALE: tuple[int, ...] = (1, 10, 100)
+
+
+def _format_queries(queries: list[dict[str, str]]) -> str:
+    return "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(queries, 1))
+
+
+@contextmanager
+def assert_max_queries(
+    limit: int, using: str = DEFAULT_DB_ALIAS
+) -> Iterator[CaptureQueriesContext]:
+    """Fail if the block executes more than ``limit`` SQL statements."""
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed > limit:
+        raise AssertionError(
+            f"{executed} queries executed, budget is {limit}:\n"
+            + _format_queries(context.captured_queries)
+        )
+
+
+def count_queries(func: Callable[[], object], using: str = DEFAULT_DB_ALIAS) -> int:
+    """Run ``func`` and return how many SQL statements it executed."""
+    with CaptureQueriesContext(connections[using]) as context:
+        func()
+    return len(context.captured_queries)
+
+
+def assert_queries_constant(
+    make_request: Callable[[int], Callable[[], object]],
+    limit: int,
+    scale: Iterable[int] = DEFAULT_SCALE,
+    using: str = DEFAULT_DB_ALIAS,
+) -> dict[int, int]:
+    """Check that an endpoint's query count does not grow with its row count.
+
+    ``make_request(n)`` seeds ``n`` rows and returns a zero-argument callable
+    that performs the request. Only the request itself is counted.
+    """
+    counts = {n: count_queries(make_request(n), using) for n in scale}
+    over_budget = {n: c for n, c in counts.items() if c > limit}
+    if over_budget:
+        raise AssertionError(f"query budget of {limit} exceeded: {over_budget}")
+    if len(set(counts.values())) > 1:
+        raise AssertionError(f"query count grows with row count: {counts}")
+    return counts
@@ -0,0 +1,848 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false, reportAttributeAccessIssue=false
+
+"""Parity tests for the values() list serializers and the fast JSON renderer."""
+
+import csv
+import gzip
+import io
+import json
+from datetime import UTC, datetime
+
+import pytest
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api import activity, compression
+from api.activity import ActivityWriter, log_activity
+from api.auth import create_admin_access_token, create_user_access_token
+from api.cache_control import policy_for
+from api.catalog import get_catalog_version
+from api.crm import (
+    ACTIVITY_LOG_VALUES,
+    CUSTOMER_NOTE_VALUES,
+    CUSTOMER_TAG_VALUES,
+    ActivityLogResponseSerializer,
+    CustomerNoteResponseSerializer,
+    CustomerTagResponseSerializer,
+)
+from api.exports import encode_ndjson
+from api.orders import ORDER_WITH_PRODUCT_VALUES, OrderWithProductSerializer
+from api.pagination import count_cache, count_total
+from api.product_lookup import product_resolver
+from api.products import PRODUCT_VALUES, ProductResponseSerializer
+from api.renderers import FastJSONRenderer
+from api.testing import assert_max_queries, assert_queries_constant
+from api.tickets import TICKET_VALUES, TicketResponseSerializer
+from legacydb.models import (
+    ActivityLog,
+    ActivityPartition,
+    CustomerNote,
+    CustomerTag,
+    Order,
+    Product,
+    RelatedProduct,
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+    Ticket,
+    User,
+)
+
+CREATED = datetime(2025, 3, 4, 5, 6, 7, 123456, tzinfo=UTC)
+UPDATED = datetime(2025, 3, 5, 1, 2, 3, tzinfo=UTC)
+TRICKY_TEXT = 'L\u00ednea\u2028separada\u2029 "kutip" \\ <b>&</b> \U0001f680'
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    # legacydb models are unmanaged, so the test database has no tables yet.
+    with django_db_blocker.unblock(), connection.schema_editor() as editor:
+        for model in apps.get_app_config("legacydb").get_models():
+            editor.create_model(model)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Test transactions roll back without a write to invalidate the caches on.
+    count_cache.clear()
+    product_resolver.clear()
+
+
+@pytest.fixture
+def seeded(db):
+    user = User.objects.create(
+        email="parity@example.com",
+        full_name=TRICKY_TEXT,
+        password_hash="x",
+        is_active=True,
+        created_at=CREATED,
+    )
+    with_images = Product.objects.create(
+        title=TRICKY_TEXT,
+        slug="parity-images",
+        description_short="Short",
+        description_full=None,
+        price_idr=150000,
+        category="ebook",
+        badges=["new", "best"],
+        images=["https://example.com/a.png", "https://example.com/b.png"],
+        is_active=True,
+        created_at=CREATED,
+    )
+    without_images = Product.objects.create(
+        title="No images",
+        slug="parity-no-images",
+        description_short="Short",
+        price_idr=0,
+        category="robot",
+        badges=None,
+        images=[],
+        is_active=False,
+        created_at=UPDATED,
+    )
+    for index, product in enumerate((with_images, without_images)):
+        Order.objects.create(
+            order_code=f"FXS-PAR{index}",
+            product=product,
+            user=user,
+            name=TRICKY_TEXT,
+            email="parity@example.com",
+            whatsapp="081234567890",
+            notes=None if index else TRICKY_TEXT,
+            status="pending",
+            created_at=CREATED,
+            updated_at=UPDATED,
+        )
+    Ticket.objects.create(
+        user=user,
+        title=TRICKY_TEXT,
+        message="Halo",
+        status="open",
+        created_at=CREATED,
+        updated_at=UPDATED,
+    )
+    CustomerTag.objects.create(customer=user, tag=TRICKY_TEXT, created_at=CREATED)
+    CustomerNote.objects.create(
+        customer=user, note=TRICKY_TEXT, created_by_admin="admin", created_at=UPDATED
+    )
+    ActivityLog.objects.create(
+        customer=user,
+        type="order_created",
+        reference_id=None,
+        metadata_json={"note": TRICKY_TEXT, "nested": {"ids": [1, 2]}, "ok": True},
+        created_at=CREATED,
+    )
+    return user
+
+
+def _legacy_order_payload(order: Order) -> dict[str, object]:
+    images = order.product.images
+    return {
+        "id": order.id,
+        "order_code": order.order_code,
+        "product_id": order.product_id,
+        "name": order.name,
+        "email": order.email,
+        "whatsapp": order.whatsapp,
+        "notes": order.notes,
+        "status": order.status,
+        "created_at": order.created_at,
+        "updated_at": order.updated_at,
+        "product_title": order.product.title,
+        "product_price": order.product.price_idr,
+        "product_category": order.product.category,
+        "product_slug": order.product.slug,
+        "product_image": images[0] if images else None,
+    }
+
+
+def _assert_same_bytes(expected_data, fast_data):
+    expected = JSONRenderer().render(expected_data)
+    assert FastJSONRenderer().render(fast_data) == expected
+
+
+@pytest.mark.parametrize(
+    ("model", "serializer_class", "values"),
+    [
+        (Product, ProductResponseSerializer, PRODUCT_VALUES),
+        (Ticket, TicketResponseSerializer, TICKET_VALUES),
+        (CustomerTag, CustomerTagResponseSerializer, CUSTOMER_TAG_VALUES),
+        (CustomerNote, CustomerNoteResponseSerializer, CUSTOMER_NOTE_VALUES),
+        (ActivityLog, ActivityLogResponseSerializer, ACTIVITY_LOG_VALUES),
+    ],
+)
+def test_values_serializer_matches_model_serializer(
+    seeded, model, serializer_class, values
+):
+    """Test that values() rows render byte for byte like the ModelSerializer."""
+    queryset = model.objects.order_by("id")
+    _assert_same_bytes(
+        serializer_class(queryset, many=True).data, values.serialize(queryset)
+    )
+
+
+def test_order_values_match_order_with_product_serializer(seeded):
+    """Test that joined order rows render like the per-instance payload did."""
+    orders = Order.objects.select_related("product").order_by("id")
+    legacy = [_legacy_order_payload(order) for order in orders]
+    _assert_same_bytes(
+        OrderWithProductSerializer(legacy, many=True).data,
+        ORDER_WITH_PRODUCT_VALUES.serialize(Order.objects.order_by("id")),
+    )
+
+
+def test_order_values_serializer_uses_one_query(seeded, django_assert_num_queries):
+    """Test that product columns come from the same query as the orders."""
+    with django_assert_num_queries(1):
+        items = ORDER_WITH_PRODUCT_VALUES.serialize(Order.objects.order_by("id"))
+    assert [item["product_image"] for item in items] == [
+        "https://example.com/a.png",
+        None,
+    ]
+
+
+def test_fast_renderer_falls_back_for_indented_output():
+    """Test that browsable/indented rendering still goes through DRF."""
+    data = {"title": TRICKY_TEXT, "at": CREATED}
+    context = {"indent": 4}
+    assert FastJSONRenderer().render(
+        data, "application/json; indent=4", context
+    ) == JSONRenderer().render(data, "application/json; indent=4", context)
+
+
+def test_fast_renderer_matches_drf_for_error_payloads():
+    """Test that non-list payloads such as validation errors are unchanged."""
+    data = {"detail": "Produk tidak ditemukan", "page": ["A valid integer."]}
+    _assert_same_bytes(data, data)
+
+
+@pytest.fixture
+def admin_client():
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {create_admin_access_token(settings.ADMIN_USERNAME)}"
+    )
+    return client
+
+
+def test_order_export_csv_streams_all_matching_orders(seeded, admin_client):
+    """Test that the CSV export streams a header plus every matching order."""
+    response = admin_client.get("/api/orders/admin/export?status=pending")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+
+    body = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [row["order_code"] for row in rows] == ["FXS-PAR1", "FXS-PAR0"]
+    assert rows[1]["notes"] == TRICKY_TEXT
+    assert rows[1]["product_image"] == "https://example.com/a.png"
+    assert rows[1]["created_at"] == "2025-03-04T05:06:07.123456Z"
+
+
+def test_order_export_ndjson_date_range(seeded, admin_client, settings):
+    """Test NDJSON export with an inclusive date range."""
+    # Timestamps stay in FastAPI's export format: UTC with a Z suffix
+    settings.TIME_ZONE = "Asia/Jakarta"
+    response = admin_client.get(
+        "/api/orders/admin/export?format=ndjson&date_from=2025-03-04&date_to=2025-03-04"
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).splitlines()
+    assert len(lines) == 2
+    item = json.loads(lines[0])
+    assert item["product_title"] in (TRICKY_TEXT, "No images")
+    assert item["created_at"] == "2025-03-04T05:06:07.123456Z"
+    assert item["updated_at"] == "2025-03-05T01:02:03Z"
+
+    response = admin_client.get("/api/orders/admin/export?date_from=2025-03-05")
+    assert b"".join(response.streaming_content).count(b"\n") == 1
+
+
+def test_order_export_rejects_unknown_format(seeded, admin_client):
+    """Test that invalid export parameters return a JSON 400."""
+    response = admin_client.get("/api/orders/admin/export?format=xml")
+    assert response.status_code == 400
+    assert "format" in response.json()
+
+
+def test_order_export_chunks_output():
+    """Test that exports are encoded in chunk-sized blocks."""
+    items = ({"id": index} for index in range(5))
+    blocks = list(encode_ndjson(items, chunk_size=2))
+    assert [block.count(b"\n") for block in blocks] == [2, 2, 1]
+
+
+def test_bulk_order_status_single_transaction(
+    seeded, admin_client, django_assert_max_num_queries
+):
+    """Test bulk status outcomes and that writes do not grow per order."""
+    first, second = Order.objects.order_by("id")
+    Order.objects.filter(id=second.id).update(status="confirmed")
+
+    # Select, update, activity insert and one upsert per sales rollup table.
+    with django_assert_max_num_queries(9):
+        response = admin_client.post(
+            "/api/orders/admin/bulk-status",
+            {
+                "status": "confirmed",
+                "order_ids": [first.id, second.id, 999999],
+                "order_codes": [first.order_code.lower()],
+            },
+            format="json",
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["updated"], data["unchanged"], data["not_found"]) == (1, 1, 1)
+    assert [result["outcome"] for result in data["results"]] == [
+        "updated",
+        "unchanged",
+        "not_found",
+    ]
+
+    logs = ActivityLog.objects.filter(type="order_status_updated")
+    assert [log.reference_id for log in logs] == [first.order_code]
+    assert logs[0].metadata_json == {"old_status": "pending", "new_status": "confirmed"}
+
+
+def test_order_writes_keep_sales_rollups_in_step(seeded, admin_client):
+    """Test that creates, status updates and bulk updates move the rollups."""
+    product = Product.objects.get(slug="parity-images")
+    response = APIClient().post(
+        "/api/orders",
+        {
+            "product_id": product.id,
+            "name": "Rollup",
+            "email": "rollup@example.com",
+            "whatsapp": "081234567890",
+        },
+        format="json",
+    )
+    assert response.status_code == 201
+    order = Order.objects.get(order_code=response.json()["order_code"])
+
+    def totals(model, *keys):
+        rows = model.objects.filter(orders__gt=0)
+        return {
+            row[:-2]: row[-2:]
+            for row in rows.values_list(*keys, "orders", "revenue_idr")
+        }
+
+    assert totals(SalesDaily, "status") == {("pending",): (1, 150000)}
+
+    url = f"/api/orders/admin/{order.id}/status"
+    response = admin_client.patch(url, {"status": "confirmed"}, format="json")
+    assert response.status_code == 200
+    assert totals(SalesDailyCategory, "status", "category") == {
+        ("confirmed", "ebook"): (1, 150000)
+    }
+
+    response = admin_client.post(
+        "/api/orders/admin/bulk-status",
+        {"status": "completed", "order_ids": [order.id]},
+        format="json",
+    )
+    assert response.json()["updated"] == 1
+    assert totals(SalesDailyProduct, "status", "product_id") == {
+        ("completed", product.id): (1, 150000)
+    }
+    (day,) = SalesDaily.objects.filter(orders=1).values_list("day", flat=True)
+    assert day == order.created_at.astimezone(UTC).date()
+
+
+def test_bulk_order_status_rejects_invalid_status(seeded, admin_client):
+    """Test that unknown target statuses are rejected."""
+    response = admin_client.post(
+        "/api/orders/admin/bulk-status",
+        {"status": "shipped", "order_ids": [1]},
+        format="json",
+    )
+    assert response.status_code == 400
+
+
+def test_product_detail_includes_active_related_products(
+    seeded, django_assert_num_queries
+):
+    """Test that ``related`` lists active related products by rank."""
+    with_images, without_images = Product.objects.order_by("id")
+    third = Product.objects.create(
+        title="Related",
+        slug="parity-related",
+        description_short="Short",
+        price_idr=99000,
+        category="ebook",
+        created_at=CREATED,
+    )
+    for rank, related in enumerate((third, without_images)):
+        RelatedProduct.objects.create(
+            product=with_images, rank=rank, related=related, customers=2, score=0.5
+        )
+
+    with django_assert_num_queries(2):
+        response = APIClient().get("/api/products/parity-images")
+    assert response.status_code == 200
+    assert response.json()["related"] == [
+        {
+            "id": third.id,
+            "slug": "parity-related",
+            "title": "Related",
+            "price_idr": 99000,
+            "category": "ebook",
+            "badges": None,
+            "images": None,
+        }
+    ]
+
+
+def test_async_activity_is_spooled_after_commit(
+    seeded, settings, tmp_path, monkeypatch, django_capture_on_commit_callbacks
+):
+    """Test that async activity waits for commit and is inserted in one batch."""
+    settings.ACTIVITY_WRITER_MODE = "async"
+    writer = ActivityWriter(tmp_path, batch_size=100, flush_interval=3600)
+    monkeypatch.setattr(activity, "activity_writer", writer)
+    customer = User.objects.get(email="parity@example.com")
+    before = ActivityLog.objects.count()
+    # A dead writer's spool for another database is never replayed here
+    other_database = tmp_path / "postgresql-0123456789abcdef"
+    other_database.mkdir()
+    (other_database / "1-dead.spool").write_text(
+        '{"customer_id": 1, "type": "other_db", "reference_id": null, '
+        '"metadata_json": null, "created_at": "2026-01-01T00:00:00+00:00"}\n'
+    )
+    spool_dir = writer.spool_dir
+
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            for index in range(3):
+                log_activity(customer.id, "writer_async", reference_id=str(index))
+            assert not spool_dir.exists()
+        assert len(list(spool_dir.glob("*.spool"))) == 1
+        assert ActivityLog.objects.count() == before
+
+        assert writer.flush() == 3
+    finally:
+        writer.close()
+    assert ActivityLog.objects.filter(type="writer_async").count() == 3
+    assert {path.name for path in spool_dir.iterdir()} == {"recovery.lock"}
+    assert (other_database / "1-dead.spool").exists()
+    assert not ActivityLog.objects.filter(type="other_db").exists()
+
+
+def test_torn_spool_lines_are_skipped(seeded, tmp_path):
+    """Test that a line cut short by a crash does not stop the writer."""
+    writer = ActivityWriter(tmp_path, batch_size=100, flush_interval=3600)
+    writer.spool_dir.mkdir(parents=True)
+    good = activity._encode(
+        {
+            "customer_id": seeded.id,
+            "type": "writer_torn",
+            "reference_id": None,
+            "metadata_json": None,
+            "created_at": CREATED,
+        }
+    )
+    (writer.spool_dir / "1-dead.spool").write_text(good + "\n" + good[:25])
+
+    try:
+        assert writer.recover() == 1
+        assert not any(writer.spool_dir.glob("1-dead.*"))
+    finally:
+        writer.close()
+    assert ActivityLog.objects.filter(type="writer_torn").count() == 1
+
+
+def test_list_totals_are_cached_estimated_or_skipped(
+    seeded, admin_client, settings, django_assert_num_queries
+):
+    """Test cached counts, write invalidation, count=none and count=estimate."""
+    url = "/api/products/admin/all"
+    assert admin_client.get(url).json()["total"] == 2
+    with django_assert_num_queries(1):
+        data = admin_client.get(url).json()
+    assert (data["total"], data["exact"], data["has_more"]) == (2, True, False)
+    # One cached total per filter, whatever the columns, joins or sort
+    priced = Product.objects.filter(price_idr__gte=0)
+    assert count_total(priced.values("slug")) == (2, True)
+    with django_assert_num_queries(0):
+        assert count_total(priced.only("title").order_by("-price_idr")) == (2, True)
+        assert count_total(priced.values("title", "category")) == (2, True)
+
+    Product.objects.create(
+        title="Counted",
+        slug="parity-counted",
+        description_short="Short",
+        price_idr=1000,
+        category="ebook",
+        is_active=True,
+        created_at=CREATED,
+    )
+    assert admin_client.get(url).json()["total"] == 3
+
+    data = admin_client.get("/api/orders/admin/all?count=none&page_size=1").json()
+    assert (data["total"], data["has_more"], len(data["items"])) == (None, True, 1)
+
+    settings.COUNT_ESTIMATE_MIN_ROWS = 1
+    highest = max(Ticket.objects.values_list("id", flat=True))
+    data = admin_client.get("/api/tickets/admin/all?count=estimate").json()
+    assert (data["total"], data["exact"]) == (highest, False)
+    data = admin_client.get("/api/tickets/admin/all?count=estimate&status=open").json()
+    assert (data["total"], data["exact"]) == (1, True)
+
+    assert admin_client.get(f"{url}?count=maybe").status_code == 400
+
+
+def test_product_detail_lookup_is_one_query_and_caches_misses(
+    seeded, admin_client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    """Test numeric slugs, the negative cache and invalidation on slug changes."""
+    numeric = Product.objects.create(
+        title="Numeric",
+        slug="987654321",
+        description_short="Short",
+        price_idr=1000,
+        category="ebook",
+        is_active=True,
+        created_at=CREATED,
+    )
+    with django_assert_num_queries(2):  # product + related
+        response = APIClient().get("/api/products/987654321")
+    assert response.json()["id"] == numeric.id
+
+    assert APIClient().get("/api/products/parity-later").status_code == 404
+    with django_assert_num_queries(0):
+        assert APIClient().get("/api/products/parity-later").status_code == 404
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = admin_client.patch(
+            f"/api/products/admin/{numeric.id}", {"slug": "parity-later"}, format="json"
+        )
+    assert response.status_code == 200
+    # Cleared on commit, not while the transaction is still open
+    assert APIClient().get("/api/products/parity-later").status_code == 404
+    for callback in callbacks:
+        callback()
+    assert APIClient().get("/api/products/parity-later").json()["id"] == numeric.id
+    assert APIClient().get("/api/products/987654321").status_code == 404
+
+
+def test_admin_product_writes_bump_the_catalog_version(seeded, admin_client):
+    """Test that creates, updates and toggles move the shared catalog version."""
+    assert get_catalog_version() == 0
+    response = admin_client.post(
+        "/api/products/admin",
+        {
+            "title": "Versioned",
+            "slug": "parity-versioned",
+            "description_short": "Short",
+            "price_idr": 1000,
+            "category": "ebook",
+        },
+        format="json",
+    )
+    assert response.status_code == 201
+    assert get_catalog_version() == 1
+
+    product_id = response.json()["id"]
+    url = f"/api/products/admin/{product_id}"
+    response = admin_client.patch(url, {"title": "Renamed"}, format="json")
+    assert response.status_code == 200
+    assert admin_client.patch(f"{url}/toggle-active").status_code == 200
+    assert get_catalog_version() == 3
+
+    # Rejected writes leave it alone
+    response = admin_client.patch(url, {"slug": "parity-images"}, format="json")
+    assert response.status_code == 400
+    assert get_catalog_version() == 3
+
+
+def test_product_list_views(seeded):
+    """Test that list cards drop description_full and keep the first image."""
+    (card,) = APIClient().get("/api/products").json()["items"]
+    assert "description_full" not in card
+    assert card["images"] == ["https://example.com/a.png"]
+
+    (full,) = APIClient().get("/api/products?view=full").json()["items"]
+    assert full["images"] == ["https://example.com/a.png", "https://example.com/b.png"]
+    assert full.keys() - card.keys() == {"description_full"}
+
+    assert APIClient().get("/api/products?view=compact").status_code == 400
+
+
+def test_sparse_fields_skip_unrequested_columns_and_joins(seeded, admin_client):
+    """Test that ``fields=`` narrows the SELECT and drops unneeded queries."""
+    url = "/api/orders/admin/all?fields=order_code,status"
+    with CaptureQueriesContext(connection) as captured:
+        items = admin_client.get(url).json()["items"]
+    assert items[0] == {"order_code": "FXS-PAR0", "status": "pending"}
+    assert not any('"products"' in query["sql"] for query in captured)
+
+    url = "/api/orders/admin/all?fields=status,product_image"
+    items = admin_client.get(url).json()["items"]
+    assert items[0] == {
+        "status": "pending",
+        "product_image": "https://example.com/a.png",
+    }
+
+    customer = User.objects.get(email="parity@example.com")
+    url = f"/api/admin/customers/{customer.id}?fields=id,email"
+    with CaptureQueriesContext(connection) as captured:
+        response = admin_client.get(url)
+    assert response.json() == {"id": customer.id, "email": "parity@example.com"}
+    assert len(captured) == 1
+
+    response = admin_client.get("/api/tickets/admin/all?fields=title,password")
+    assert response.status_code == 400
+    assert response.json() == {"fields": ["Unknown fields: password"]}
+
+
+def test_compression_thresholds_streams_and_cached_bodies(
+    seeded, settings, admin_client, monkeypatch
+):
+    """Test gzip negotiation, the size threshold and compressed body reuse."""
+    settings.COMPRESSION_MIN_SIZE = 1
+    compression.compressed_bodies.clear()
+    calls = []
+
+    def counting_compress(body, encoding):
+        calls.append(encoding)
+        return gzip.compress(body)
+
+    monkeypatch.setattr(compression, "compress", counting_compress)
+    client = APIClient()
+    plain = client.get("/api/products")
+    assert not plain.has_header("Content-Encoding")
+    assert "Accept-Encoding" in plain["Vary"]
+    for _ in range(3):
+        response = client.get("/api/products", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+    assert calls == ["gzip"]
+
+    response = admin_client.get(
+        "/api/orders/admin/export?status=pending", HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    body = gzip.decompress(b"".join(response.streaming_content)).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [row["order_code"] for row in rows] == ["FXS-PAR1", "FXS-PAR0"]
+
+    settings.COMPRESSION_MIN_SIZE = 10**6
+    response = client.get("/api/products", HTTP_ACCEPT_ENCODING="gzip")
+    assert not response.has_header("Content-Encoding")
+
+
+def _keys(payload):
+    if isinstance(payload, dict):
+        return set(payload).union(*map(_keys, payload.values()))
+    if isinstance(payload, list):
+        return set().union(*map(_keys, payload))
+    return set()
+
+
+def test_no_authenticated_or_pii_view_is_public(seeded, admin_client):
+    """Test every public view: anonymous, read-only, and without personal data."""
+    public = {
+        pattern.name: pattern.callback.view_class
+        for pattern in get_resolver().url_patterns
+        if policy_for(pattern.callback).public
+    }
+    assert set(public) == {"products-list", "products-get", "orders-status"}
+    for view_class in public.values():
+        assert view_class.authentication_classes == []
+        assert view_class.permission_classes == []
+        assert not {"post", "put", "patch", "delete"} & set(dir(view_class))
+
+    client = APIClient()
+    pii = {"email", "name", "full_name", "whatsapp", "notes", "password_hash"}
+    for url in ("/api/products", "/api/products/parity-images", "/api/orders/FXS-PAR0"):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response["Cache-Control"].startswith("public, max-age=")
+        assert not _keys(response.json()) & pii, url
+
+    response = admin_client.get("/api/orders/admin/all")
+    assert response["Cache-Control"] == "private, no-store"
+    assert "Authorization" in response["Vary"]
+
+
+def _budget_customer(n: int) -> tuple[User, APIClient]:
+    """A customer with ``n`` rows of everything, and a client logged in as them."""
+    suffix = User.objects.count()
+    user = User.objects.create(
+        email=f"budget-{suffix}@example.com",
+        full_name="Budget",
+        password_hash="x",
+        is_active=True,
+        created_at=CREATED,
+    )
+    products = Product.objects.bulk_create(
+        Product(
+            title=f"Budget {suffix}-{index}",
+            slug=f"budget-{suffix}-{index}",
+            description_short="Short",
+            price_idr=1000 * index,
+            category="ebook",
+            images=["https://example.com/budget.png"],
+            is_active=True,
+            created_at=CREATED,
+        )
+        for index in range(n)
+    )
+    Order.objects.bulk_create(
+        Order(
+            order_code=f"FXS-B{suffix}-{index}",
+            product=product,
+            user=user,
+            name="Budget",
+            email=user.email,
+            whatsapp="081234567890",
+            status="pending",
+            created_at=CREATED,
+            updated_at=UPDATED,
+        )
+        for index, product in enumerate(products)
+    )
+    Ticket.objects.bulk_create(
+        Ticket(
+            user=user,
+            title=f"Ticket {index}",
+            message="Halo",
+            status="open",
+            created_at=CREATED,
+            updated_at=UPDATED,
+        )
+        for index in range(n)
+    )
+    CustomerTag.objects.bulk_create(
+        CustomerTag(customer=user, tag=f"tag-{index}", created_at=CREATED)
+        for index in range(n)
+    )
+    CustomerNote.objects.bulk_create(
+        CustomerNote(
+            customer=user, note="Note", created_by_admin="admin", created_at=CREATED
+        )
+        for _ in range(n)
+    )
+    ActivityLog.objects.bulk_create(
+        ActivityLog(
+            customer=user,
+            type="order_created",
+            reference_id=str(index),
+            metadata_json={"index": index},
+            created_at=CREATED,
+        )
+        for index in range(n)
+    )
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {create_user_access_token(user.email)}"
+    )
+    return user, client
+
+
+# Every list view, by URL ("{id}": the seeded customer), and its query budget
+LIST_VIEW_BUDGETS = {
+    "/api/products?page_size=100": 2,
+    "/api/products/admin/all?page_size=100": 2,
+    "/api/orders/me": 2,
+    "/api/orders/admin/all?page_size=100": 2,
+    "/api/tickets?page_size=100": 3,
+    "/api/tickets/admin/all?page_size=100": 2,
+    "/api/admin/customers?page_size=100": 4,
+    "/api/admin/customers/{id}/orders": 1,
+    "/api/admin/customers/{id}/tickets": 1,
+    "/api/admin/customers/{id}/tags": 1,
+    "/api/admin/customers/{id}/notes": 1,
+    "/api/admin/customers/{id}/activity": 2,
+}
+
+
+@pytest.mark.parametrize("url", LIST_VIEW_BUDGETS)
+def test_list_view_queries_do_not_grow_with_rows(db, admin_client, url):
+    """Test that each list view runs the same queries for 1, 10 and 100 rows."""
+    budget = LIST_VIEW_BUDGETS[url]
+    admin = "/admin/" in url
+
+    def make_request(n: int):
+        user, client = _budget_customer(n)
+        path = url.format(id=user.id)
+
+        def request() -> None:
+            response = (admin_client if admin else client).get(path)
+            assert response.status_code == 200, response.content
+
+        return request
+
+    assert_queries_constant(make_request, budget)
+
+
+def test_customer_detail_query_budget(seeded, admin_client):
+    """Test the customer summary's fixed query budget."""
+    with assert_max_queries(4):
+        response = admin_client.get(f"/api/admin/customers/{seeded.id}")
+    assert response.status_code == 200
+
+
+def test_customer_activity_reads_partitions_and_pages_through_ties(
+    seeded, admin_client
+):
+    """Test the timeline and last activity across live partitions."""
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE activity_logs_202101 (id INTEGER PRIMARY KEY, "
+            "customer_id INTEGER NOT NULL, type VARCHAR(50) NOT NULL, "
+            "reference_id VARCHAR(50), metadata_json TEXT, created_at DATETIME)"
+        )
+        for index in range(3):  # one timestamp for all of them
+            cursor.execute(
+                f"INSERT INTO {quote('activity_logs_202101')} VALUES "
+                "(%s, %s, 'note_added', %s, NULL, %s)",
+                [
+                    1000 + index,
+                    seeded.id,
+                    f"rolled-{index}",
+                    connection.ops.adapt_datetimefield_value(
+                        datetime(2021, 1, 5, 12, tzinfo=UTC)
+                    ),
+                ],
+            )
+    ActivityPartition.objects.create(
+        month="2021-01", table_name="activity_logs_202101", row_count=3
+    )
+    ActivityPartition.objects.create(
+        month="2020-12",
+        table_name="activity_logs_202012",  # dropped once archived
+        row_count=1,
+        archived_at=CREATED,
+    )
+    url = f"/api/admin/customers/{seeded.id}/activity"
+
+    everything = admin_client.get(url).json()
+    assert [item["reference_id"] for item in everything] == [
+        None,
+        "rolled-2",
+        "rolled-1",
+        "rolled-0",
+    ]
+
+    first = admin_client.get(url, {"limit": 2}).json()
+    last = first[-1]
+    rest = admin_client.get(
+        url, {"limit": 2, "before": last["created_at"], "before_id": last["id"]}
+    ).json()
+    assert first + rest == everything
+    assert admin_client.get(url, {"before": "yesterday"}).status_code == 400
+
+    # Customers whose events were all rolled out keep their last activity
+    ActivityLog.objects.filter(customer_id=seeded.id).delete()
+    (customer,) = admin_client.get("/api/admin/customers").json()
+    assert customer["last_activity"] == "2021-01-05T12:00:00Z"
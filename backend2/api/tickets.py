@@ -3,12 +3,16 @@
 from django.utils import timezone
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from api.authentication import JWTAuthentication, JWTUser
+from api.fastserializers import ValuesSerializer, select_fields
+from api.pagination import count_total, page_items, parse_count_mode
 from api.permissions import IsJWTAdmin, IsJWTUser
+from api.renderers import FastJSONRenderer
 from legacydb.models import Ticket, User
 
 
@@ -31,6 +35,9 @@ class TicketResponseSerializer(serializers.ModelSerializer[Ticket]):
         )
 
 
+TICKET_VALUES = ValuesSerializer(TicketResponseSerializer)
+
+
 def _parse_int_query(
     request: Request,
     key: str,
@@ -86,6 +93,7 @@ def _require_user(request: Request) -> User | Response:
 class TicketListCreateView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTUser]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         user_or_response = _require_user(request)
@@ -95,17 +103,15 @@ class TicketListCreateView(APIView):
 
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 20, minimum=1, maximum=100)
+        count = parse_count_mode(request)
 
         query = Ticket.objects.filter(user_id=user.id).order_by("-updated_at")
-        total = query.count()
-        offset = (page - 1) * page_size
-        tickets = query[offset : offset + page_size]
+        total, exact = count_total(query, count)
+        values = select_fields(request, TICKET_VALUES)
+        items, has_more = page_items(values, query, page, page_size)
 
         return Response(
-            {
-                "items": TicketResponseSerializer(tickets, many=True).data,
-                "total": total,
-            }
+            {"items": items, "total": total, "exact": exact, "has_more": has_more}
         )
 
     def post(self, request: Request) -> Response:
@@ -141,24 +147,24 @@ class TicketListCreateView(APIView):
 class AdminTicketListView(APIView):
     authentication_classes: list[type[JWTAuthentication]] = [JWTAuthentication]
     permission_classes: list[type] = [IsAuthenticated, IsJWTAdmin]
+    renderer_classes: list[type[BaseRenderer]] = [FastJSONRenderer]
 
     def get(self, request: Request) -> Response:
         status_filter = request.query_params.get("status")
         page = _parse_int_query(request, "page", 1, minimum=1)
         page_size = _parse_int_query(request, "page_size", 20, minimum=1, maximum=100)
+        count = parse_count_mode(request)
 
         query = Ticket.objects.all()
-        if status_filter and status_filter != "all":
+        filtered = bool(status_filter and status_filter != "all")
+        if filtered:
             query = query.filter(status=status_filter)
 
         query = query.order_by("-updated_at")
-        total = query.count()
-        offset = (page - 1) * page_size
-        tickets = query[offset : offset + page_size]
+        total, exact = count_total(query, count, None if filtered else Ticket)
+        values = select_fields(request, TICKET_VALUES)
+        items, has_more = page_items(values, query, page, page_size)
 
         return Response(
-            {
-                "items": TicketResponseSerializer(tickets, many=True).data,
-                "total": total,
-            }
+            {"items": items, "total": total, "exact": exact, "has_more": has_more}
         )
@@ -26,6 +26,56 @@ ACCESS_TOKEN_EXPIRE_MINUTES = RUNTIME_CONFIG["ACCESS_TOKEN_EXPIRE_MINUTES"]
 JWT_ISSUER = RUNTIME_CONFIG["JWT_ISSUER"]
 JWT_AUDIENCE = RUNTIME_CONFIG["JWT_AUDIENCE"]
 
+# Activity log writer: "async" batches inserts in a background thread
+# (see api/activity.py), "sync" inserts each event inline.
+ACTIVITY_WRITER_MODE = os.environ.get("ACTIVITY_WRITER_MODE", "async")
+ACTIVITY_BATCH_SIZE = int(os.environ.get("ACTIVITY_BATCH_SIZE", "200"))
+ACTIVITY_FLUSH_INTERVAL = float(os.environ.get("ACTIVITY_FLUSH_INTERVAL", "1.0"))
+ACTIVITY_SPOOL_DIR = os.environ.get("ACTIVITY_SPOOL_DIR") or None
+
+# List totals (see api/pagination.py): exact counts are cached per filter
+# until a write in this process or COUNT_CACHE_TTL seconds; count=estimate
+# reports table statistics for unfiltered tables of COUNT_ESTIMATE_MIN_ROWS+.
+COUNT_CACHE_TTL = float(os.environ.get("COUNT_CACHE_TTL", "60.0"))
+COUNT_ESTIMATE_MIN_ROWS = int(os.environ.get("COUNT_ESTIMATE_MIN_ROWS", "10000"))
+
+# Seconds an unknown product id/slug is answered with 404 without a query
+# (see api/product_lookup.py).
+PRODUCT_LOOKUP_NEGATIVE_TTL = float(
+    os.environ.get("PRODUCT_LOOKUP_NEGATIVE_TTL", "30.0")
+)
+
+# Response compression (see api/compression.py): gzip or Brotli for bodies of
+# COMPRESSION_MIN_SIZE+ bytes whose content type starts with one of
+# COMPRESSION_CONTENT_TYPES. Compressed bodies of anonymous GETs under
+# COMPRESSION_CACHE_PATHS are reused, up to COMPRESSION_CACHE_MAX_BYTES.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CONTENT_TYPES = os.environ.get(
+    "COMPRESSION_CONTENT_TYPES", "application/json,application/x-ndjson,text/"
+).split(",")
+COMPRESSION_CACHE_PATHS = os.environ.get(
+    "COMPRESSION_CACHE_PATHS", "/api/products"
+).split(",")
+COMPRESSION_CACHE_MAX_BYTES = int(
+    os.environ.get("COMPRESSION_CACHE_MAX_BYTES", str(8 * 1024 * 1024))
+)
+
+# Cache-Control of public views (see api/cache_control.py), in seconds:
+# catalog reads may be served stale for CACHE_CATALOG_STALE_WHILE_REVALIDATE
+# while a CDN refetches; every undeclared view is "private, no-store".
+CACHE_CATALOG_MAX_AGE = int(os.environ.get("CACHE_CATALOG_MAX_AGE", "60"))
+CACHE_CATALOG_STALE_WHILE_REVALIDATE = int(
+    os.environ.get("CACHE_CATALOG_STALE_WHILE_REVALIDATE", "300")
+)
+CACHE_ORDER_STATUS_MAX_AGE = int(os.environ.get("CACHE_ORDER_STATUS_MAX_AGE", "10"))
+
 INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "corsheaders",
@@ -34,7 +84,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so every response (CORS errors included) can be compressed.
+    "api.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    # Inside CORS, so preflights (answered by CORS) carry no cache policy.
+    "api.cache_control.CacheControlMiddleware",
     "django.middleware.common.CommonMiddleware",
 ]
 
@@ -4,12 +4,30 @@ from . import settings as base_settings
 
 ALGORITHM = base_settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = base_settings.ACCESS_TOKEN_EXPIRE_MINUTES
+ACTIVITY_BATCH_SIZE = base_settings.ACTIVITY_BATCH_SIZE
+ACTIVITY_FLUSH_INTERVAL = base_settings.ACTIVITY_FLUSH_INTERVAL
+ACTIVITY_SPOOL_DIR = base_settings.ACTIVITY_SPOOL_DIR
+ACTIVITY_WRITER_MODE = "sync"
 ADMIN_PASSWORD = base_settings.ADMIN_PASSWORD
 ADMIN_USERNAME = base_settings.ADMIN_USERNAME
 ALLOWED_HOSTS = base_settings.ALLOWED_HOSTS
 APPEND_SLASH = base_settings.APPEND_SLASH
 ASGI_APPLICATION = base_settings.ASGI_APPLICATION
 BASE_DIR = base_settings.BASE_DIR
+CACHE_CATALOG_MAX_AGE = base_settings.CACHE_CATALOG_MAX_AGE
+CACHE_CATALOG_STALE_WHILE_REVALIDATE = (
+    base_settings.CACHE_CATALOG_STALE_WHILE_REVALIDATE
+)
+CACHE_ORDER_STATUS_MAX_AGE = base_settings.CACHE_ORDER_STATUS_MAX_AGE
+COMPRESSION_BROTLI_QUALITY = base_settings.COMPRESSION_BROTLI_QUALITY
+COMPRESSION_CACHE_MAX_BYTES = base_settings.COMPRESSION_CACHE_MAX_BYTES
+COMPRESSION_CACHE_PATHS = base_settings.COMPRESSION_CACHE_PATHS
+COMPRESSION_CONTENT_TYPES = base_settings.COMPRESSION_CONTENT_TYPES
+COMPRESSION_ENABLED = base_settings.COMPRESSION_ENABLED
+COMPRESSION_GZIP_LEVEL = base_settings.COMPRESSION_GZIP_LEVEL
+COMPRESSION_MIN_SIZE = base_settings.COMPRESSION_MIN_SIZE
+COUNT_CACHE_TTL = base_settings.COUNT_CACHE_TTL
+COUNT_ESTIMATE_MIN_ROWS = base_settings.COUNT_ESTIMATE_MIN_ROWS
 CORS_ALLOWED_ORIGINS = base_settings.CORS_ALLOWED_ORIGINS
 CORS_ALLOW_CREDENTIALS = base_settings.CORS_ALLOW_CREDENTIALS
 CORS_ALLOW_HEADERS = base_settings.CORS_ALLOW_HEADERS
@@ -22,6 +40,7 @@ JWT_AUDIENCE = base_settings.JWT_AUDIENCE
 JWT_ISSUER = base_settings.JWT_ISSUER
 LANGUAGE_CODE = base_settings.LANGUAGE_CODE
 MIDDLEWARE = base_settings.MIDDLEWARE
+PRODUCT_LOOKUP_NEGATIVE_TTL = base_settings.PRODUCT_LOOKUP_NEGATIVE_TTL
 REST_FRAMEWORK = base_settings.REST_FRAMEWORK
 ROOT_URLCONF = base_settings.ROOT_URLCONF
 SECRET_KEY = base_settings.SECRET_KEY
@@ -25,6 +25,8 @@ CreateOrderView = cast(type[APIView], orders_module.CreateOrderView)
 MyOrdersView = cast(type[APIView], orders_module.MyOrdersView)
 PublicOrderStatusView = cast(type[APIView], orders_module.PublicOrderStatusView)
 AdminOrderListView = cast(type[APIView], orders_module.AdminOrderListView)
+AdminOrderExportView = cast(type[APIView], orders_module.AdminOrderExportView)
+AdminOrderBulkStatusView = cast(type[APIView], orders_module.AdminOrderBulkStatusView)
 AdminOrderStatusUpdateView = cast(
     type[APIView], orders_module.AdminOrderStatusUpdateView
 )
@@ -94,6 +96,16 @@ urlpatterns = [
         AdminOrderListView.as_view(),
         name="orders-admin-all",
     ),
+    path(
+        "api/orders/admin/export",
+        AdminOrderExportView.as_view(),
+        name="orders-admin-export",
+    ),
+    path(
+        "api/orders/admin/bulk-status",
+        AdminOrderBulkStatusView.as_view(),
+        name="orders-admin-bulk-status",
+    ),
     path(
         "api/orders/admin/<int:order_id>/status",
         AdminOrderStatusUpdateView.as_view(),
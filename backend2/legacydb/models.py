@@ -36,6 +36,17 @@ class Product(models.Model):
         db_table: str = "products"
 
 
+class CatalogVersion(models.Model):
+    # Single row bumped on every product write, read by the FastAPI caches
+    id: models.IntegerField = models.IntegerField(primary_key=True)
+    version: models.IntegerField = models.IntegerField(default=0)
+    updated_at: models.DateTimeField = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "catalog_version"
+
+
 class Order(models.Model):
     id: models.AutoField = models.AutoField(primary_key=True)
     order_code: models.CharField = models.CharField(max_length=20, unique=True)
@@ -122,3 +133,88 @@ class ActivityLog(models.Model):
     class Meta:
         managed: bool = False
         db_table: str = "activity_logs"
+
+
+class ActivityPartition(models.Model):
+    # Closed months moved out of activity_logs by the FastAPI backend:
+    # python -m app.activity_retention
+    month: models.CharField = models.CharField(max_length=7, primary_key=True)
+    table_name: models.CharField = models.CharField(max_length=64)
+    row_count: models.IntegerField = models.IntegerField(default=0)
+    archived_at: models.DateTimeField = models.DateTimeField(null=True, blank=True)
+    archive_path: models.CharField = models.CharField(
+        max_length=500, null=True, blank=True
+    )
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "activity_partitions"
+
+
+class RelatedProduct(models.Model):
+    # Built by the FastAPI backend: python -m app.related_products
+    pk: models.CompositePrimaryKey = models.CompositePrimaryKey("product", "rank")
+    product: models.ForeignKey = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_column="product_id",
+        related_name="+",
+    )
+    rank: models.IntegerField = models.IntegerField()
+    related: models.ForeignKey = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_column="related_id",
+        related_name="+",
+    )
+    customers: models.IntegerField = models.IntegerField()
+    score: models.FloatField = models.FloatField()
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "related_products"
+
+
+# Daily sales rollups, kept in step with ``orders`` by api/sales_rollup.py
+# here and app/utils/sales_rollup.py in the FastAPI backend.
+class SalesDaily(models.Model):
+    pk: models.CompositePrimaryKey = models.CompositePrimaryKey("day", "status")
+    day: models.DateField = models.DateField()
+    status: models.CharField = models.CharField(max_length=20)
+    orders: models.IntegerField = models.IntegerField(default=0)
+    revenue_idr: models.IntegerField = models.IntegerField(default=0)
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "sales_daily"
+
+
+class SalesDailyCategory(models.Model):
+    pk: models.CompositePrimaryKey = models.CompositePrimaryKey(
+        "day", "status", "category"
+    )
+    day: models.DateField = models.DateField()
+    status: models.CharField = models.CharField(max_length=20)
+    category: models.CharField = models.CharField(max_length=50)
+    orders: models.IntegerField = models.IntegerField(default=0)
+    revenue_idr: models.IntegerField = models.IntegerField(default=0)
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "sales_daily_category"
+
+
+class SalesDailyProduct(models.Model):
+    pk: models.CompositePrimaryKey = models.CompositePrimaryKey(
+        "day", "status", "product_id"
+    )
+    day: models.DateField = models.DateField()
+    status: models.CharField = models.CharField(max_length=20)
+    product_id: models.IntegerField = models.IntegerField()
+    category: models.CharField = models.CharField(max_length=50)
+    orders: models.IntegerField = models.IntegerField(default=0)
+    revenue_idr: models.IntegerField = models.IntegerField(default=0)
+
+    class Meta:
+        managed: bool = False
+        db_table: str = "sales_daily_product"
@@ -0,0 +1 @@
+"""Benchmark tooling for the fxsociety backends."""
@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks.endpoints import main
+
+sys.exit(main())
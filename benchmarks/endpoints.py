@@ -0,0 +1,453 @@
+"""In-process endpoint benchmarks for the FastAPI backend and the DRF port.
+
+Run from the repository root:
+
+    python -m benchmarks run --backend fastapi --snapshot snapshots/small.db
+    python -m benchmarks run --backend drf --snapshot snapshots/small.db
+    python -m benchmarks compare baseline.json current.json
+
+The snapshot is produced by ``python -m app.datagen --snapshot ...`` and is
+copied to a scratch file first, so write scenarios never touch the original.
+Requests go through in-process ASGI/WSGI transports: no server, no network.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+from benchmarks.scenarios import SCENARIOS, Fixtures, Scenario, load_fixtures
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+ADMIN_CREDENTIALS = {"username": "dev_admin", "password": "dev_password_123"}
+USER_PASSWORD = "password123"
+PROBE_REQUESTS = 3
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+
+class BackendAdapter:
+    """Common surface for driving one backend in-process."""
+
+    name = ""
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        pass
+
+    def request(self, method: str, path: str, **kwargs):
+        raise NotImplementedError
+
+    def routes(self) -> set[tuple[str, str]]:
+        raise NotImplementedError
+
+    def count_queries(self):
+        """Context manager yielding a QueryCounter for the enclosed requests."""
+        raise NotImplementedError
+
+
+class FastAPIAdapter(BackendAdapter):
+    name = "fastapi"
+
+    def start(self) -> None:
+        sys.path.insert(0, str(REPO_ROOT / "backend"))
+        from app.database import engine
+        from app.main import app
+        from fastapi.testclient import TestClient
+
+        self._app = app
+        self._engine = engine
+        # TestClient runs the lifespan and is safe to share across threads.
+        self._client = TestClient(app, base_url="http://bench")
+        self._client.__enter__()
+
+    def stop(self) -> None:
+        self._client.__exit__(None, None, None)
+
+    def request(self, method: str, path: str, **kwargs):
+        return self._client.request(method, path, **kwargs)
+
+    def routes(self) -> set[tuple[str, str]]:
+        from fastapi.routing import APIRoute
+
+        found = set()
+
+        def collect(routes, prefix: str) -> None:
+            for route in routes:
+                if isinstance(route, APIRoute):
+                    for method in route.methods:
+                        found.add((method, prefix + route.path))
+                elif hasattr(route, "original_router"):
+                    # Recent FastAPI releases nest included routers instead of
+                    # copying their routes onto the app.
+                    context = getattr(route, "include_context", None)
+                    collect(
+                        route.original_router.routes,
+                        prefix + getattr(context, "prefix", ""),
+                    )
+
+        collect(self._app.routes, "")
+        return found
+
+    @contextmanager
+    def count_queries(self) -> Iterator[QueryCounter]:
+        from sqlalchemy import event
+
+        counter = QueryCounter()
+
+        def _count(*_args, **_kwargs):
+            counter.count += 1
+
+        event.listen(self._engine, "before_cursor_execute", _count)
+        try:
+            yield counter
+        finally:
+            event.remove(self._engine, "before_cursor_execute", _count)
+
+
+class DRFAdapter(BackendAdapter):
+    name = "drf"
+
+    def start(self) -> None:
+        sys.path.insert(0, str(REPO_ROOT / "backend2"))
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fxsociety_drf.settings")
+        import django
+        import httpx
+
+        django.setup()
+        from fxsociety_drf.wsgi import application
+
+        # Expected 4xx (e.g. throttled logins) would otherwise flood stderr.
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+
+        self._local = threading.local()
+        self._transport = httpx.WSGITransport(app=application)
+
+    def stop(self) -> None:
+        # Flush spooled activity now, not at interpreter exit.
+        from api.activity import activity_writer
+
+        activity_writer.close()
+
+    def _client(self):
+        import httpx
+
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = httpx.Client(
+                transport=self._transport, base_url="http://testserver"
+            )
+            self._local.client = client
+        return client
+
+    def request(self, method: str, path: str, **kwargs):
+        return self._client().request(method, path, **kwargs)
+
+    def routes(self) -> set[tuple[str, str]]:
+        from django.urls import get_resolver
+
+        found = set()
+        for pattern in get_resolver().url_patterns:
+            route = "/" + re.sub(r"<(?:\w+:)?(\w+)>", r"{\1}", str(pattern.pattern))
+            view_class = getattr(pattern.callback, "view_class", None)
+            for method in ("GET", "POST", "PATCH", "PUT", "DELETE"):
+                if view_class is not None and hasattr(view_class, method.lower()):
+                    found.add((method, route))
+        return found
+
+    @contextmanager
+    def count_queries(self) -> Iterator[QueryCounter]:
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        counter = QueryCounter()
+        # WSGITransport runs the view in this thread, so the connection matches.
+        with CaptureQueriesContext(connection) as captured:
+            yield counter
+        counter.count = len(captured.captured_queries)
+
+
+ADAPTERS: dict[str, type[BackendAdapter]] = {
+    FastAPIAdapter.name: FastAPIAdapter,
+    DRFAdapter.name: DRFAdapter,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _login(adapter: BackendAdapter, username: str, password: str) -> str:
+    response = adapter.request(
+        "POST", "/api/auth/login", data={"username": username, "password": password}
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Login failed for {username}: {response.status_code}")
+    return response.json()["access_token"]
+
+
+def _request_kwargs(
+    scenario: Scenario, fixtures: Fixtures, tokens: dict[str, str]
+) -> dict:
+    kwargs: dict = {}
+    if scenario.auth:
+        kwargs["headers"] = {"Authorization": f"Bearer {tokens[scenario.auth]}"}
+    if scenario.json is not None:
+        kwargs["json"] = scenario.json(fixtures)
+    if scenario.form is not None:
+        kwargs["data"] = scenario.form(fixtures)
+    if scenario.files is not None:
+        kwargs["files"] = scenario.files(fixtures)
+    return kwargs
+
+
+def run_scenario(
+    adapter: BackendAdapter,
+    scenario: Scenario,
+    fixtures: Fixtures,
+    tokens: dict[str, str],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    path = scenario.path(fixtures)
+
+    # Sequential probes: exact per-request query counts without interleaving.
+    query_counts = []
+    for _ in range(PROBE_REQUESTS):
+        kwargs = _request_kwargs(scenario, fixtures, tokens)
+        with adapter.count_queries() as counter:
+            adapter.request(scenario.method, path, **kwargs)
+        query_counts.append(counter.count)
+
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def _one(_: int) -> None:
+        nonlocal errors
+        kwargs = _request_kwargs(scenario, fixtures, tokens)
+        started = time.perf_counter()
+        response = adapter.request(scenario.method, path, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            if response.status_code not in scenario.expected_status:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(_one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "method": scenario.method,
+        "route": scenario.route,
+        "path": path,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "throughput_rps": round(requests / wall, 1) if wall else 0.0,
+        "queries": sorted(query_counts)[len(query_counts) // 2],
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict:
+    snapshot = Path(args.snapshot).resolve()
+    scratch_dir = Path(tempfile.mkdtemp(prefix="fxs-bench-"))
+    database_path = scratch_dir / "bench.db"
+    shutil.copyfile(snapshot, database_path)
+
+    manifest_path = snapshot.with_name(snapshot.name + ".json")
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    # Both backends read these at import time.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    # Spooled activity belongs to the scratch database, not the default one.
+    os.environ["ACTIVITY_SPOOL_DIR"] = str(scratch_dir / "activity-spool")
+    os.environ.setdefault("ENVIRONMENT", "development")
+
+    fixtures = load_fixtures(str(database_path))
+    adapter = ADAPTERS[args.backend]()
+    adapter.start()
+    try:
+        tokens = {
+            "admin": _login(adapter, **ADMIN_CREDENTIALS),
+            "user": _login(adapter, fixtures.customer_email, USER_PASSWORD),
+        }
+
+        routes = adapter.routes()
+        selected = []
+        for scenario in SCENARIOS:
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+            if (scenario.method, scenario.route) not in routes:
+                print(
+                    f"Skipping {scenario.name}: no {scenario.method} {scenario.route}"
+                )
+                continue
+            selected.append(scenario)
+        # Reads first so they measure the pristine dataset.
+        selected.sort(key=lambda s: s.method != "GET")
+
+        results = {}
+        for scenario in selected:
+            result = run_scenario(
+                adapter,
+                scenario,
+                fixtures,
+                tokens,
+                requests=args.requests,
+                concurrency=args.concurrency,
+            )
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<28} p50 {result['p50_ms']:>8.2f}ms  "
+                f"p95 {result['p95_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                f"{result['throughput_rps']:>8.1f} req/s  "
+                f"{result['queries']:>3} queries  {result['errors']} errors"
+            )
+
+        covered = {(s.method, s.route) for s in SCENARIOS}
+        uncovered = sorted(routes - covered)
+        for method, route in uncovered:
+            print(f"WARNING: no scenario covers {method} {route}")
+    finally:
+        adapter.stop()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    return {
+        "backend": args.backend,
+        "created_at": datetime.now(UTC).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {"requests": args.requests, "concurrency": args.concurrency},
+        "dataset": manifest,
+        "scenarios": results,
+        "uncovered_routes": [f"{method} {route}" for method, route in uncovered],
+    }
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.25,
+    min_delta_ms: float = 1.0,
+) -> list[str]:
+    """Return a human-readable line for every regression found."""
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        now = current.get("scenarios", {}).get(name)
+        if now is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            delta = now[metric] - base[metric]
+            if delta > min_delta_ms and now[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {base[metric]:.2f} -> {now[metric]:.2f}"
+                )
+        if now["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']:.1f} -> "
+                f"{now['throughput_rps']:.1f} req/s"
+            )
+        if now["queries"] > base["queries"]:
+            regressions.append(f"{name}: queries {base['queries']} -> {now['queries']}")
+        if now["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {now['errors']}")
+    return regressions
+
+
+def _report_regressions(regressions: list[str]) -> int:
+    if not regressions:
+        print("No regressions against baseline.")
+        return 0
+    print(f"{len(regressions)} regression(s) against baseline:")
+    for line in regressions:
+        print(f"  - {line}")
+    return 1
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Benchmark every endpoint of one backend")
+    run.add_argument("--backend", choices=sorted(ADAPTERS), required=True)
+    run.add_argument(
+        "--snapshot", required=True, help="SQLite snapshot from app.datagen"
+    )
+    run.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--scenario", action="append", help="Only run these scenarios")
+    run.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Where to save results (default: baselines/<backend>.json)",
+    )
+    run.add_argument("--baseline", type=Path, help="Compare against this baseline")
+    run.add_argument("--threshold", type=float, default=0.25)
+
+    compare = sub.add_parser("compare", help="Compare two saved result files")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.25)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        return _report_regressions(compare_results(baseline, current, args.threshold))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    results = run_benchmarks(args)
+    output = args.output or BASELINE_DIR / f"{args.backend}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    print(f"Results saved to {output}")
+
+    if baseline is not None:
+        return _report_regressions(compare_results(baseline, results, args.threshold))
+    return 0
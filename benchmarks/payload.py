@@ -0,0 +1,74 @@
+"""Bytes per product listing page: full items vs list cards.
+
+Run from the repository root against a datagen snapshot:
+
+    python -m benchmarks.payload --snapshot snapshots/small.db
+    python -m benchmarks.payload --backend drf --snapshot snapshots/small.db
+
+"before" is ``view=full``, which is what every listing returned before cards
+(every column, every image); "after" is the default ``view=card``. Sizes are
+the response bodies as sent, plus their gzip size for comparison.
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.endpoints import ADAPTERS
+
+PAGE_SIZES = (12, 100)
+PAGES = 5
+
+
+def _page_bytes(adapter, view: str, page_size: int) -> tuple[float, float]:
+    """Mean raw and gzipped body size over the first ``PAGES`` pages."""
+    raw = compressed = 0
+    for page in range(1, PAGES + 1):
+        response = adapter.request(
+            "GET",
+            f"/api/products?view={view}&page={page}&page_size={page_size}",
+        )
+        assert response.status_code == 200, response.text
+        raw += len(response.content)
+        compressed += len(gzip.compress(response.content))
+    return raw / PAGES, compressed / PAGES
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.payload")
+    parser.add_argument("--snapshot", required=True, help="SQLite snapshot")
+    parser.add_argument("--backend", choices=sorted(ADAPTERS), default="fastapi")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="fxs-payload-"))
+    database_path = workdir / "bench.db"
+    shutil.copyfile(args.snapshot, database_path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("ENVIRONMENT", "development")
+
+    adapter = ADAPTERS[args.backend]()
+    adapter.start()
+    try:
+        print(
+            f"{'page_size':<10} {'before':>10} {'after':>10} {'saved':>6}"
+            f" {'before gz':>10} {'after gz':>10}"
+        )
+        for page_size in PAGE_SIZES:
+            full, full_gz = _page_bytes(adapter, "full", page_size)
+            card, card_gz = _page_bytes(adapter, "card", page_size)
+            print(
+                f"{page_size:<10} {full:>8.0f} B {card:>8.0f} B"
+                f" {1 - card / full:>6.0%} {full_gz:>8.0f} B {card_gz:>8.0f} B"
+            )
+    finally:
+        adapter.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""Endpoint scenarios shared by the FastAPI and DRF benchmark runs.
+
+Both backends expose the same URL surface, so one scenario list drives both.
+Each scenario names the route template it exercises; the runner uses those
+templates to report routes that no scenario covers.
+"""
+
+import itertools
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+_unique = itertools.count(1)
+
+BULK_ORDERS = 50
+IMPORT_ROWS = 50
+
+
+@dataclass(frozen=True)
+class Fixtures:
+    """Real ids/codes picked from the benchmark database."""
+
+    product_id: int
+    product_slug: str
+    order_id: int
+    order_code: str
+    order_ids: tuple[int, ...]  # the first BULK_ORDERS orders
+    customer_id: int
+    customer_email: str
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    route: str  # Route template, e.g. /api/products/{id_or_slug}
+    path: Callable[[Fixtures], str]
+    auth: str | None = None  # None, "admin" or "user"
+    json: Callable[[Fixtures], dict] | None = None
+    form: Callable[[Fixtures], dict] | None = None
+    files: Callable[[Fixtures], dict] | None = None
+    expected_status: frozenset[int] = field(default_factory=lambda: frozenset({200}))
+
+
+def load_fixtures(database_path: str) -> Fixtures:
+    conn = sqlite3.connect(database_path)
+    try:
+        product_id, product_slug = conn.execute(
+            "SELECT id, slug FROM products WHERE is_active = 1 ORDER BY id LIMIT 1"
+        ).fetchone()
+        orders = conn.execute(
+            "SELECT id, order_code FROM orders ORDER BY id LIMIT ?", (BULK_ORDERS,)
+        ).fetchall()
+        # The busiest active customer makes the per-customer routes realistic.
+        customer_id, customer_email = conn.execute(
+            "SELECT u.id, u.email FROM users u JOIN orders o ON o.user_id = u.id "
+            "WHERE u.is_active = 1 GROUP BY u.id ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()
+    finally:
+        conn.close()
+    return Fixtures(
+        product_id=product_id,
+        product_slug=product_slug,
+        order_id=orders[0][0],
+        order_code=orders[0][1],
+        order_ids=tuple(order_id for order_id, _ in orders),
+        customer_id=customer_id,
+        customer_email=customer_email,
+    )
+
+
+def _static(path: str) -> Callable[[Fixtures], str]:
+    return lambda _fx: path
+
+
+def _new_product(_fx: Fixtures) -> dict:
+    n = next(_unique)
+    return {
+        "title": f"Bench Product {n}",
+        "slug": f"bench-product-{n}",
+        "description_short": "Created by the benchmark harness",
+        "price_idr": 199000,
+        "category": "indikator",
+    }
+
+
+def _new_user(_fx: Fixtures) -> dict:
+    return {
+        "email": f"bench-user-{next(_unique)}@example.com",
+        "full_name": "Bench User",
+        "password": "password123",
+    }
+
+
+def _new_order(fx: Fixtures) -> dict:
+    return {
+        "product_id": fx.product_id,
+        "name": "Bench Customer",
+        "email": fx.customer_email,
+        "whatsapp": "081234567890",
+    }
+
+
+def _bulk_status(fx: Fixtures) -> dict:
+    # Alternate, so every request moves the orders instead of skipping them.
+    status = ("confirmed", "pending")[next(_unique) % 2]
+    return {"status": status, "order_ids": list(fx.order_ids)}
+
+
+def _import_file(_fx: Fixtures) -> dict:
+    n = next(_unique)
+    lines = ["slug,title,description_short,price_idr,category"]
+    lines += [
+        f"bench-import-{n}-{row},Bench Import {n}-{row},Imported by the benchmark,"
+        f"149000,indikator"
+        for row in range(IMPORT_ROWS)
+    ]
+    return {"file": ("products.csv", "\n".join(lines).encode(), "text/csv")}
+
+
+SCENARIOS: list[Scenario] = [
+    # Health
+    Scenario("root", "GET", "/", _static("/")),
+    Scenario("health", "GET", "/api/health", _static("/api/health")),
+    # Auth
+    Scenario(
+        "auth_register",
+        "POST",
+        "/api/auth/register",
+        _static("/api/auth/register"),
+        json=_new_user,
+    ),
+    Scenario(
+        "auth_login",
+        "POST",
+        "/api/auth/login",
+        _static("/api/auth/login"),
+        form=lambda fx: {"username": fx.customer_email, "password": "password123"},
+        # The login limiter allows 5 attempts per minute per client.
+        expected_status=frozenset({200, 429}),
+    ),
+    Scenario("auth_me", "GET", "/api/auth/me", _static("/api/auth/me"), auth="user"),
+    # Products
+    Scenario("products_list", "GET", "/api/products", _static("/api/products")),
+    Scenario(
+        "products_list_filtered",
+        "GET",
+        "/api/products",
+        _static("/api/products?category=robot&sort=price_asc&page=2"),
+    ),
+    Scenario(
+        "products_search",
+        "GET",
+        "/api/products",
+        _static("/api/products?search=pro"),
+    ),
+    Scenario(
+        "products_suggest",
+        "GET",
+        "/api/products/suggest",
+        _static("/api/products/suggest?q=pro"),
+    ),
+    Scenario(
+        "product_by_id",
+        "GET",
+        "/api/products/{id_or_slug}",
+        lambda fx: f"/api/products/{fx.product_id}",
+    ),
+    Scenario(
+        "product_by_slug",
+        "GET",
+        "/api/products/{id_or_slug}",
+        lambda fx: f"/api/products/{fx.product_slug}",
+    ),
+    Scenario(
+        "products_admin_list",
+        "GET",
+        "/api/products/admin/all",
+        _static("/api/products/admin/all"),
+        auth="admin",
+    ),
+    Scenario(
+        "products_admin_create",
+        "POST",
+        "/api/products/admin",
+        _static("/api/products/admin"),
+        auth="admin",
+        json=_new_product,
+        expected_status=frozenset({201}),
+    ),
+    Scenario(
+        "products_admin_import",
+        "POST",
+        "/api/products/admin/import",
+        _static("/api/products/admin/import"),
+        auth="admin",
+        files=_import_file,
+    ),
+    Scenario(
+        "products_admin_update",
+        "PATCH",
+        "/api/products/admin/{product_id}",
+        lambda fx: f"/api/products/admin/{fx.product_id}",
+        auth="admin",
+        json=lambda _fx: {"price_idr": 299000},
+    ),
+    Scenario(
+        "products_admin_toggle",
+        "PATCH",
+        "/api/products/admin/{product_id}/toggle-active",
+        lambda fx: f"/api/products/admin/{fx.product_id}/toggle-active",
+        auth="admin",
+    ),
+    # Orders
+    Scenario(
+        "orders_create",
+        "POST",
+        "/api/orders",
+        _static("/api/orders"),
+        json=_new_order,
+        # The product may be toggled inactive by the toggle scenario.
+        expected_status=frozenset({201, 404}),
+    ),
+    Scenario(
+        "orders_me", "GET", "/api/orders/me", _static("/api/orders/me"), auth="user"
+    ),
+    Scenario(
+        "order_status_public",
+        "GET",
+        "/api/orders/{order_code}",
+        lambda fx: f"/api/orders/{fx.order_code}",
+    ),
+    Scenario(
+        "orders_admin_list",
+        "GET",
+        "/api/orders/admin/all",
+        _static("/api/orders/admin/all"),
+        auth="admin",
+    ),
+    Scenario(
+        "orders_admin_list_pending",
+        "GET",
+        "/api/orders/admin/all",
+        _static("/api/orders/admin/all?status=pending&page=3"),
+        auth="admin",
+    ),
+    Scenario(
+        "orders_admin_status",
+        "PATCH",
+        "/api/orders/admin/{order_id}/status",
+        lambda fx: f"/api/orders/admin/{fx.order_id}/status",
+        auth="admin",
+        json=lambda _fx: {"status": "confirmed"},
+    ),
+    Scenario(
+        "orders_admin_bulk_status",
+        "POST",
+        "/api/orders/admin/bulk-status",
+        _static("/api/orders/admin/bulk-status"),
+        auth="admin",
+        json=_bulk_status,
+    ),
+    Scenario(
+        "orders_admin_export",
+        "GET",
+        "/api/orders/admin/export",
+        _static("/api/orders/admin/export"),
+        auth="admin",
+    ),
+    Scenario(
+        "orders_admin_export_ndjson",
+        "GET",
+        "/api/orders/admin/export",
+        _static("/api/orders/admin/export?format=ndjson&status=pending"),
+        auth="admin",
+    ),
+    # Tickets
+    Scenario("tickets_me", "GET", "/api/tickets", _static("/api/tickets"), auth="user"),
+    Scenario(
+        "tickets_create",
+        "POST",
+        "/api/tickets",
+        _static("/api/tickets"),
+        auth="user",
+        json=lambda _fx: {"title": "Bench ticket", "message": "Load test"},
+        expected_status=frozenset({201}),
+    ),
+    Scenario(
+        "tickets_admin_list",
+        "GET",
+        "/api/tickets/admin/all",
+        _static("/api/tickets/admin/all"),
+        auth="admin",
+    ),
+    # CRM
+    Scenario(
+        "crm_stats",
+        "GET",
+        "/api/admin/stats",
+        _static("/api/admin/stats"),
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customers",
+        "GET",
+        "/api/admin/customers",
+        _static("/api/admin/customers"),
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_detail",
+        "GET",
+        "/api/admin/customers/{customer_id}",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_orders",
+        "GET",
+        "/api/admin/customers/{customer_id}/orders",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/orders",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_tickets",
+        "GET",
+        "/api/admin/customers/{customer_id}/tickets",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/tickets",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_tags",
+        "GET",
+        "/api/admin/customers/{customer_id}/tags",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/tags",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_tag_add",
+        "POST",
+        "/api/admin/customers/{customer_id}/tags",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/tags",
+        auth="admin",
+        json=lambda _fx: {"tag": "Bench"},
+    ),
+    Scenario(
+        "crm_customer_tag_remove",
+        "DELETE",
+        "/api/admin/customers/{customer_id}/tags/{tag_name}",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/tags/Bench",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_notes",
+        "GET",
+        "/api/admin/customers/{customer_id}/notes",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/notes",
+        auth="admin",
+    ),
+    Scenario(
+        "crm_customer_note_add",
+        "POST",
+        "/api/admin/customers/{customer_id}/notes",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/notes",
+        auth="admin",
+        json=lambda _fx: {"note": "Benchmark note"},
+    ),
+    Scenario(
+        "crm_customer_activity",
+        "GET",
+        "/api/admin/customers/{customer_id}/activity",
+        lambda fx: f"/api/admin/customers/{fx.customer_id}/activity",
+        auth="admin",
+    ),
+    # Analytics
+    Scenario(
+        "analytics_sales",
+        "GET",
+        "/api/admin/analytics/sales",
+        _static("/api/admin/analytics/sales"),
+        auth="admin",
+    ),
+    Scenario(
+        "analytics_sales_by_product",
+        "GET",
+        "/api/admin/analytics/sales",
+        _static("/api/admin/analytics/sales?group_by=product&date_from=2020-01-01"),
+        auth="admin",
+    ),
+]
@@ -0,0 +1,156 @@
+"""CPU cost per 100-item page: Pydantic response models vs the fast path.
+
+Run from the repository root against a datagen snapshot:
+
+    python -m benchmarks.serialization --snapshot snapshots/small.db
+
+The "before" routes rebuild the old implementation (ORM rows ->
+``model_validate`` per row -> ``response_model`` validation and encoding) on a
+side app; the "after" numbers come from the real routes. Both are served
+in-process and measured with ``time.process_time``.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PAGE_SIZE = 100
+
+
+def _legacy_app():
+    from typing import Annotated
+
+    from app.database import get_db
+    from app.models import Order, Product, Ticket
+    from app.schemas import (
+        OrderListResponse,
+        OrderWithProductResponse,
+        ProductListResponse,
+        ProductResponse,
+    )
+    from app.schemas.ticket import TicketListResponse, TicketResponse
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.orm import Session, joinedload
+
+    legacy = FastAPI()
+
+    @legacy.get("/products", response_model=ProductListResponse)
+    def products(db: Annotated[Session, Depends(get_db)]):
+        query = db.query(Product).filter(Product.is_active)
+        total = query.count()
+        rows = query.order_by(Product.created_at.desc()).limit(PAGE_SIZE).all()
+        return ProductListResponse(
+            items=[ProductResponse.model_validate(p) for p in rows],
+            total=total,
+            page=1,
+            page_size=PAGE_SIZE,
+            pages=-(-total // PAGE_SIZE),
+        )
+
+    @legacy.get("/orders", response_model=OrderListResponse)
+    def orders(db: Annotated[Session, Depends(get_db)]):
+        total = db.query(Order).count()
+        rows = (
+            db.query(Order)
+            .options(joinedload(Order.product))
+            .order_by(Order.created_at.desc())
+            .limit(PAGE_SIZE)
+            .all()
+        )
+        items = [
+            OrderWithProductResponse(
+                id=o.id,
+                order_code=o.order_code,
+                product_id=o.product_id,
+                name=o.name,
+                email=o.email,
+                whatsapp=o.whatsapp,
+                notes=o.notes,
+                status=o.status,
+                created_at=o.created_at,
+                updated_at=o.updated_at,
+                product_title=o.product.title,
+                product_price=o.product.price_idr,
+                product_category=o.product.category,
+                product_slug=o.product.slug,
+                product_image=o.product.images[0] if o.product.images else None,
+            )
+            for o in rows
+        ]
+        return OrderListResponse(items=items, total=total)
+
+    @legacy.get("/tickets", response_model=TicketListResponse)
+    def tickets(db: Annotated[Session, Depends(get_db)]):
+        query = db.query(Ticket).order_by(Ticket.updated_at.desc())
+        total = query.count()
+        rows = query.limit(PAGE_SIZE).all()
+        return TicketListResponse(
+            items=[TicketResponse.model_validate(t) for t in rows], total=total
+        )
+
+    return legacy
+
+
+async def _cpu_ms_per_request(app, path: str, headers: dict, repeat: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for _ in range(3):
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200, response.text
+        start = time.process_time()
+        for _ in range(repeat):
+            await client.get(path, headers=headers)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--snapshot", required=True, help="SQLite snapshot")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="fxs-serialization-"))
+    database_path = workdir / "bench.db"
+    shutil.copyfile(args.snapshot, database_path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("ENVIRONMENT", "development")
+    sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+    from app.auth import create_access_token
+    from app.main import app
+
+    admin = {
+        "Authorization": "Bearer "
+        + create_access_token({"sub": "dev_admin", "role": "admin"})
+    }
+    pages = [
+        ("products", "/products", f"/api/products?page_size={PAGE_SIZE}"),
+        ("orders", "/orders", f"/api/orders/admin/all?page_size={PAGE_SIZE}"),
+        ("tickets", "/tickets", f"/api/tickets/admin/all?page_size={PAGE_SIZE}"),
+    ]
+    try:
+        legacy = _legacy_app()
+        print(f"{'page':<10} {'before':>12} {'after':>12} {'speedup':>8}")
+        for name, legacy_path, path in pages:
+            old = asyncio.run(
+                _cpu_ms_per_request(legacy, legacy_path, admin, args.repeat)
+            )
+            new = asyncio.run(_cpu_ms_per_request(app, path, admin, args.repeat))
+            print(f"{name:<10} {old:>9.2f} ms {new:>9.2f} ms {old / new:>7.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,7 @@ export interface ApiProduct {
   slug: string;
   title: string;
   description_short: string;
-  description_full: string | null;
+  description_full?: string | null; // omitted from list cards (view=card)
   price_idr: number;
   category: ProductCategory;
   badges: BadgeStatus[] | null;